@@ -70,13 +70,16 @@ class Orchestrator:
 
         # 数据层 - 支持真实数据或模拟数据
         self._real_collector = real_collector  # 真实数据采集器（可选）
+        # 订单簿与模拟行情使用交易品种的实际 tick
+        tick_size = config["market"].get("tick_size", 0.01)
         self._collector = PaperMarketCollector(
             base_price=2000.0,
             volatility=0.002,  # Increased volatility for demo
             spread_bps=5.0,
             depth_levels=20,
+            tick_size=tick_size,
         )
-        self._orderbook = OrderBook()
+        self._orderbook = OrderBook(tick_size=tick_size)
         self._tape = TradeTape(window_sec=300)
 
         # 特征引擎
@@ -163,15 +166,21 @@ class Orchestrator:
 
                 # 获取最近的交易数据
                 recent_trades = self._real_collector.get_recent_trades(max_count=100)
-                for trade in recent_trades:
-                    self._tape.add(trade)
+                self._tape.add_batch(recent_trades, now=ts)
             else:
                 # 使用模拟数据
                 book_state = self._collector.get_orderbook_snapshot()
                 trade = self._collector.generate_single_trade()
-                self._tape.add(trade)
-
-            self._orderbook.apply_snapshot(book_state.bids, book_state.asks, book_state.seq)
+                self._tape.add(trade, now=ts)
+
+            self._orderbook.apply_snapshot_raw(
+                book_state.bid_px,
+                book_state.bid_sz,
+                book_state.ask_px,
+                book_state.ask_sz,
+                book_state.seq,
+                ts=ts,
+            )
             self._risk_guardian.update_book_timestamp(ts)
 
             # ========== 2. 计算特征 ==========
@@ -7,6 +7,7 @@ TOXICTIDE 事件总线
 - 同步 pub/sub（适合主循环单线程架构）
 - 异常隔离（一个 handler 失败不影响其他）
 - 类型安全（支持泛型 payload）
+- 通配订阅（一个 handler 接收所有主题，附带 topic 参数）
 """
 
 import structlog
@@ -69,6 +70,7 @@ class EventBus:
     def __init__(self) -> None:
         """初始化事件总线"""
         self._subscribers: dict[str, list[Callable[[Any], None]]] = defaultdict(list)
+        self._wildcard_subscribers: list[Callable[[str, Any], None]] = []
         self._event_count: int = 0
 
     def subscribe(
@@ -114,6 +116,37 @@ class EventBus:
             return True
         return False
 
+    def subscribe_all(self, handler: Callable[[str, Any], None]) -> None:
+        """订阅所有主题
+
+        适合转发类消费者（如 Web UI）：只注册一个 handler，而不是为每个
+        主题各包一层闭包。
+
+        Args:
+            handler: 事件处理函数，接收 (topic, payload) 两个参数
+        """
+        self._wildcard_subscribers.append(handler)
+        logger.debug(
+            "wildcard_handler_subscribed",
+            handler=handler.__name__,
+            total_handlers=len(self._wildcard_subscribers),
+        )
+
+    def unsubscribe_all(self, handler: Callable[[str, Any], None]) -> bool:
+        """取消通配订阅
+
+        Args:
+            handler: 要取消的处理函数
+
+        Returns:
+            是否成功取消（False 表示 handler 不存在）
+        """
+        if handler in self._wildcard_subscribers:
+            self._wildcard_subscribers.remove(handler)
+            logger.debug("wildcard_handler_unsubscribed", handler=handler.__name__)
+            return True
+        return False
+
     def publish(self, topic: str, payload: Any) -> int:
         """发布事件
 
@@ -125,8 +158,9 @@ class EventBus:
             成功调用的 handler 数量
         """
         handlers = self._subscribers.get(topic, [])
+        wildcard = self._wildcard_subscribers
 
-        if not handlers:
+        if not handlers and not wildcard:
             logger.debug("no_handlers", topic=topic)
             return 0
 
@@ -139,23 +173,37 @@ class EventBus:
                 success_count += 1
             except Exception as e:
                 # 一个 handler 失败不影响其他 handler
-                logger.error(
-                    "handler_failed",
-                    topic=topic,
-                    handler=handler.__name__,
-                    error=str(e),
-                    exc_info=True,
-                )
+                self._log_handler_failed(topic, handler, e)
+
+        for wildcard_handler in wildcard:
+            try:
+                wildcard_handler(topic, payload)
+                success_count += 1
+            except Exception as e:
+                self._log_handler_failed(topic, wildcard_handler, e)
 
         logger.debug(
             "event_published",
             topic=topic,
             handlers_called=success_count,
-            handlers_total=len(handlers),
+            handlers_total=len(handlers) + len(wildcard),
         )
 
         return success_count
 
+    @staticmethod
+    def _log_handler_failed(
+        topic: str, handler: Callable[..., None], error: Exception
+    ) -> None:
+        """记录 handler 执行失败"""
+        logger.error(
+            "handler_failed",
+            topic=topic,
+            handler=handler.__name__,
+            error=str(error),
+            exc_info=True,
+        )
+
     def clear(self, topic: str | None = None) -> None:
         """清空订阅
 
@@ -164,13 +212,14 @@ class EventBus:
         """
         if topic is None:
             self._subscribers.clear()
+            self._wildcard_subscribers.clear()
             logger.debug("all_subscriptions_cleared")
         elif topic in self._subscribers:
             del self._subscribers[topic]
             logger.debug("topic_subscriptions_cleared", topic=topic)
 
     def get_subscriber_count(self, topic: str) -> int:
-        """获取主题的订阅者数量
+        """获取主题的订阅者数量（不含通配订阅）
 
         Args:
             topic: 主题名称
@@ -36,11 +36,13 @@ class MarketConfig(BaseModel):
     symbols: list[str] = Field(default=["ETH-PERP"])
     orderbook_depth: int = Field(default=20, ge=5, le=100)
     tape_window_sec: int = Field(default=300, ge=60, le=3600)
+    tick_size: float = Field(default=0.01, gt=0)  # 须与交易所的最小价格变动一致
 
 
 class FeaturesConfig(BaseModel):
     """特征配置"""
     impact_size_quote_usd: float = Field(default=1000.0, gt=0)
+    depth_k: int = Field(default=20, ge=1, le=100)
     rolling_window_short_sec: int = Field(default=300, ge=60)
     rolling_window_long_sec: int = Field(default=3600, ge=300)
 
@@ -71,21 +71,31 @@ class OrderbookAnomalyDetector:
         # ========== 更新滚动统计 ==========
         
         # 短窗口（用于计算 z-score）
-        self._rolling_short.update("spread_bps", fv.spread_bps, ts)
-        self._rolling_short.update("impact_buy", fv.impact_buy_bps, ts)
-        self._rolling_short.update("impact_sell", fv.impact_sell_bps, ts)
-        self._rolling_short.update("msg_rate", fv.msg_rate, ts)
+        self._rolling_short.update_many(
+            {
+                "spread_bps": fv.spread_bps,
+                "impact_buy": fv.impact_buy_bps,
+                "impact_sell": fv.impact_sell_bps,
+                "msg_rate": fv.msg_rate,
+            },
+            ts,
+        )
         
         # 长窗口（用于检测 gap）
-        self._rolling_long.update("depth_bid", fv.depth_bid_k, ts)
-        self._rolling_long.update("depth_ask", fv.depth_ask_k, ts)
+        self._rolling_long.update_many(
+            {"depth_bid": fv.depth_bid_k, "depth_ask": fv.depth_ask_k},
+            ts,
+        )
         
         # ========== 计算 z-scores ==========
         
-        spread_z = self._rolling_short.zscore("spread_bps")
-        impact_buy_z = self._rolling_short.zscore("impact_buy")
-        impact_sell_z = self._rolling_short.zscore("impact_sell")
-        msg_rate_z = self._rolling_short.zscore("msg_rate")
+        zscores = self._rolling_short.zscore_batch(
+            ("spread_bps", "impact_buy", "impact_sell", "msg_rate")
+        )
+        spread_z = zscores["spread_bps"]
+        impact_buy_z = zscores["impact_buy"]
+        impact_sell_z = zscores["impact_sell"]
+        msg_rate_z = zscores["msg_rate"]
         
         # ========== 检测流动性断层（Gap） ==========
         
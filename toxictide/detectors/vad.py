@@ -76,16 +76,22 @@ class VolumeAnomalyDetector:
         # 对成交量使用 log 变换（处理重尾分布）
         log_vol = np.log1p(fv.vol)  # log(1 + vol)
         
-        self._rolling.update("log_vol", log_vol, ts)
-        self._rolling.update("trades", float(fv.trades), ts)
-        self._rolling.update("max_trade", fv.max_trade, ts)
-        self._rolling.update("toxic", fv.toxic, ts)
+        self._rolling.update_many(
+            {
+                "log_vol": log_vol,
+                "trades": float(fv.trades),
+                "max_trade": fv.max_trade,
+                "toxic": fv.toxic,
+            },
+            ts,
+        )
         
         # ========== 计算 z-scores ==========
         
-        vol_z = self._rolling.zscore("log_vol")
-        trades_z = self._rolling.zscore("trades")
-        max_trade_z = self._rolling.zscore("max_trade")
+        zscores = self._rolling.zscore_batch(("log_vol", "trades", "max_trade"))
+        vol_z = zscores["log_vol"]
+        trades_z = zscores["trades"]
+        max_trade_z = zscores["max_trade"]
         
         # ========== 检测事件 ==========
         
@@ -4,6 +4,9 @@ TOXICTIDE Explainability
 可解释性模块 - 生成人类可读的决策解释
 """
 
+from functools import lru_cache
+from typing import Any
+
 import structlog
 
 from toxictide.models import RiskDecision
@@ -12,6 +15,33 @@ from toxictide.risk.reason_codes import format_reason
 logger = structlog.get_logger(__name__)
 
 
+# 决策动作 -> (标题行, 是否列出原因, (仓位模板, 仓位回退模板))
+# 仓位模板对为 None 表示不展示仓位信息
+_ACTION_TEMPLATES: dict[str, tuple[str, bool, tuple[str, str] | None]] = {
+    "DENY": (
+        "❌ 交易被拒绝，原因：",
+        True,
+        None,
+    ),
+    "ALLOW_WITH_REDUCTIONS": (
+        "⚠️  交易允许，但已调整仓位：",
+        True,
+        (
+            "\n最终仓位: ${size:.2f}\n最大滑点: {slippage:.2f} bps",
+            "\n最终仓位: ${size}\n最大滑点: {slippage} bps",
+        ),
+    ),
+    "ALLOW": (
+        "✅ 交易允许",
+        False,
+        (
+            "仓位: ${size:.2f}\n最大滑点: {slippage:.2f} bps",
+            "仓位: ${size}\n最大滑点: {slippage} bps",
+        ),
+    ),
+}
+
+
 def build_explanation(risk: RiskDecision) -> str:
     """构建人类可读的决策解释
 
@@ -33,82 +63,72 @@ def build_explanation(risk: RiskDecision) -> str:
           - 日亏超限（当前 -1.50% < 阈值 -1.00%）
           - 冷却期激活（剩余 120 秒）
     """
-    if risk.action == "DENY":
-        return _build_deny_explanation(risk)
-    elif risk.action == "ALLOW_WITH_REDUCTIONS":
-        return _build_reduction_explanation(risk)
-    else:  # ALLOW
-        return _build_allow_explanation(risk)
-
-
-def _build_deny_explanation(risk: RiskDecision) -> str:
-    """构建拒绝解释
-
-    Args:
-        risk: RiskDecision 对象
-
-    Returns:
-        解释文本
-    """
-    lines = ["❌ 交易被拒绝，原因："]
-
-    for code in risk.reasons:
-        reason_text = format_reason(code, risk.facts)
-        lines.append(f"  - {reason_text}")
-
-    return "\n".join(lines)
-
-
-def _build_reduction_explanation(risk: RiskDecision) -> str:
-    """构建减仓解释
-
-    Args:
-        risk: RiskDecision 对象
-
-    Returns:
-        解释文本
-    """
-    lines = ["⚠️  交易允许，但已调整仓位："]
-
-    for code in risk.reasons:
-        reason_text = format_reason(code, risk.facts)
-        lines.append(f"  - {reason_text}")
-
-    lines.append("")
-
-    # 安全格式化数字字段
     try:
-        size = float(risk.size_usd)
-        slippage = float(risk.max_slippage_bps)
-        lines.append(f"最终仓位: ${size:.2f}")
-        lines.append(f"最大滑点: {slippage:.2f} bps")
-    except (ValueError, TypeError):
-        lines.append(f"最终仓位: ${risk.size_usd}")
-        lines.append(f"最大滑点: {risk.max_slippage_bps} bps")
-
-    return "\n".join(lines)
-
+        facts_items = tuple(sorted(risk.facts.items()))
+        # 触发哈希检查：facts 中含不可哈希的值时不走缓存
+        hash(facts_items)
+    except TypeError:
+        return _render_explanation.__wrapped__(
+            risk.action,
+            tuple(risk.reasons),
+            tuple(risk.facts.items()),
+            risk.size_usd,
+            risk.max_slippage_bps,
+        )
+
+    return _render_explanation(
+        risk.action,
+        tuple(risk.reasons),
+        facts_items,
+        risk.size_usd,
+        risk.max_slippage_bps,
+    )
+
+
+@lru_cache(maxsize=256)
+def _render_explanation(
+    action: str,
+    reasons: tuple[str, ...],
+    facts_items: tuple[tuple[str, Any], ...],
+    size_usd: Any,
+    max_slippage_bps: Any,
+) -> str:
+    """渲染解释文本（按决策内容缓存）
 
-def _build_allow_explanation(risk: RiskDecision) -> str:
-    """构建允许解释
+    无信号等平静时段会反复产生相同的决策，命中缓存时直接复用文本。
 
     Args:
-        risk: RiskDecision 对象
+        action: 决策动作
+        reasons: 原因编码
+        facts_items: 事实数据（键值对元组）
+        size_usd: 仓位大小
+        max_slippage_bps: 最大滑点
 
     Returns:
         解释文本
     """
-    lines = ["✅ 交易允许"]
-
-    # 安全格式化数字字段
-    try:
-        size = float(risk.size_usd)
-        slippage = float(risk.max_slippage_bps)
-        lines.append(f"仓位: ${size:.2f}")
-        lines.append(f"最大滑点: {slippage:.2f} bps")
-    except (ValueError, TypeError):
-        lines.append(f"仓位: ${risk.size_usd}")
-        lines.append(f"最大滑点: {risk.max_slippage_bps} bps")
+    header, with_reasons, size_tpls = _ACTION_TEMPLATES.get(
+        action, _ACTION_TEMPLATES["ALLOW"]
+    )
+
+    lines = [header]
+
+    if with_reasons:
+        facts = dict(facts_items)
+        for code in reasons:
+            lines.append(f"  - {format_reason(code, facts)}")
+
+    if size_tpls is not None:
+        size_tpl, size_fallback_tpl = size_tpls
+        # 安全格式化数字字段
+        try:
+            size = float(size_usd)
+            slippage = float(max_slippage_bps)
+            lines.append(size_tpl.format(size=size, slippage=slippage))
+        except (ValueError, TypeError):
+            lines.append(size_fallback_tpl.format(
+                size=size_usd, slippage=max_slippage_bps
+            ))
 
     return "\n".join(lines)
 
@@ -5,17 +5,135 @@ TOXICTIDE Feature Engine
 """
 
 import time
+from functools import lru_cache
+from typing import Callable, cast
 
+import numpy as np
 import structlog
 
-from toxictide.features.impact import estimate_impact_bps
+from toxictide.features.impact import _impact_bps_nb
 from toxictide.market.orderbook import OrderBook
 from toxictide.market.tape import TradeTape
 from toxictide.models import FeatureVector
+from toxictide.utils.jit import njit
 
 logger = structlog.get_logger(__name__)
 
 
+# Orderbook 特征内核签名（见 _make_book_features）
+_BookFeaturesFn = Callable[..., tuple[float, ...]]
+
+
+@lru_cache(maxsize=None)
+def _make_book_features(levels_k: int) -> _BookFeaturesFn:
+    """生成深度档数 K 固定的 Orderbook 特征内核
+
+    K 作为闭包常量编译进内核，深度求和等循环的上界在编译期已知，
+    便于 LLVM 展开与常量折叠。同一 K 只编译一次。
+
+    Args:
+        levels_k: 深度计算使用的档数
+
+    Returns:
+        数值内核函数
+    """
+
+    @njit(fastmath=True)
+    def _book_features_nb(
+        bid_px: np.ndarray,
+        bid_sz: np.ndarray,
+        ask_px: np.ndarray,
+        ask_sz: np.ndarray,
+        impact_usd: float,
+        last_depth_bid: float,
+        last_depth_ask: float,
+    ) -> tuple:
+        """Orderbook 特征的数值内核（要求双边非空）
+
+        Returns:
+            (mid, spread, spread_bps, depth_bid_k, depth_ask_k, imb_k,
+             micro_minus_mid, impact_buy_bps, impact_sell_bps, churn,
+             buy_remaining_usd, sell_remaining_usd)
+        """
+        # njit 装饰后的函数对 mypy 为 Any；内核中不能调用 typing.cast
+        return _book_features_body(  # type: ignore[no-any-return]
+            bid_px, bid_sz, ask_px, ask_sz, levels_k,
+            impact_usd, last_depth_bid, last_depth_ask,
+        )
+
+    return cast(_BookFeaturesFn, _book_features_nb)
+
+
+@njit(cache=True, fastmath=True, inline="always")
+def _book_features_body(
+    bid_px: np.ndarray,
+    bid_sz: np.ndarray,
+    ask_px: np.ndarray,
+    ask_sz: np.ndarray,
+    levels_k: int,
+    impact_usd: float,
+    last_depth_bid: float,
+    last_depth_ask: float,
+) -> tuple:
+    """Orderbook 特征计算（在调用方内核中内联展开）"""
+    best_bid = bid_px[0]
+    best_ask = ask_px[0]
+
+    mid = (best_bid + best_ask) / 2.0
+    spread = best_ask - best_bid
+    spread_bps = spread / mid * 10000.0 if mid > 0.0 else 0.0
+
+    k = min(levels_k, bid_px.shape[0], ask_px.shape[0])
+
+    # USD 深度（价格 * 数量）
+    depth_bid = 0.0
+    depth_ask = 0.0
+    for i in range(k):
+        depth_bid += bid_px[i] * bid_sz[i]
+        depth_ask += ask_px[i] * ask_sz[i]
+
+    # 盘口不平衡 imbalance（-1 到 1）
+    imb = (depth_bid - depth_ask) / (depth_bid + depth_ask + 1e-9)
+
+    # Microprice（基于 top of book 的加权价格）
+    top_bid_sz = bid_sz[0]
+    top_ask_sz = ask_sz[0]
+    micro = (
+        (best_ask * top_bid_sz + best_bid * top_ask_sz)
+        / (top_bid_sz + top_ask_sz + 1e-9)
+    )
+
+    # Price Impact 估计
+    if impact_usd > 0.0:
+        impact_buy, buy_remaining = _impact_bps_nb(
+            ask_px[:k], ask_sz[:k], 1.0, impact_usd, mid
+        )
+        impact_sell, sell_remaining = _impact_bps_nb(
+            bid_px[:k], bid_sz[:k], -1.0, impact_usd, mid
+        )
+    else:
+        impact_buy, buy_remaining = 0.0, 0.0
+        impact_sell, sell_remaining = 0.0, 0.0
+
+    # Churn（盘口深度变动）
+    churn = abs(depth_bid - last_depth_bid) + abs(depth_ask - last_depth_ask)
+
+    return (
+        mid,
+        spread,
+        spread_bps,
+        depth_bid,
+        depth_ask,
+        imb,
+        micro - mid,
+        impact_buy,
+        impact_sell,
+        churn,
+        buy_remaining,
+        sell_remaining,
+    )
+
+
 class FeatureEngine:
     """特征计算引擎
     
@@ -36,10 +154,21 @@ class FeatureEngine:
         """初始化特征引擎
         
         Args:
-            config: 配置字典，需包含 features.impact_size_quote_usd
+            config: 配置字典，需包含 features.impact_size_quote_usd，
+                可选 features.depth_k（深度档数，默认 20）
         """
         self._config = config
         self._impact_size_usd = config["features"]["impact_size_quote_usd"]
+        self._depth_k = int(config["features"].get("depth_k", 20))
+        
+        # 按固定深度档数特化的数值内核
+        self._book_features = _make_book_features(self._depth_k)
+        
+        # 前 K 档盘口的预分配缓冲区（每 tick 原地覆写）
+        self._bid_px = np.zeros(self._depth_k, dtype=np.float64)
+        self._bid_sz = np.zeros(self._depth_k, dtype=np.float64)
+        self._ask_px = np.zeros(self._depth_k, dtype=np.float64)
+        self._ask_sz = np.zeros(self._depth_k, dtype=np.float64)
         
         # 状态跟踪（用于计算变化率）
         self._last_depth_bid = 0.0
@@ -50,6 +179,7 @@ class FeatureEngine:
         logger.info(
             "feature_engine_initialized",
             impact_size_usd=self._impact_size_usd,
+            depth_k=self._depth_k,
         )
     
     def compute(
@@ -68,60 +198,51 @@ class FeatureEngine:
         Returns:
             FeatureVector 对象
         """
-        book_state = book.get_state()
+        # 前 K 档写入预分配缓冲区，不构建 OrderBookState
+        n_bids, n_asks = book.copy_top_levels(
+            self._bid_px, self._bid_sz, self._ask_px, self._ask_sz
+        )
         
-        if not book_state.bids or not book_state.asks:
+        if n_bids == 0 or n_asks == 0:
             logger.warning("empty_orderbook", ts=ts)
             # 返回空特征（所有值为 0）
             return self._empty_features(ts)
         
         # ========== Orderbook 特征 ==========
         
-        # 基础价格和价差
-        mid = book_state.mid
-        spread = book_state.spread
-        spread_bps = (spread / mid) * 10000 if mid > 0 else 0.0
-        
-        # Top of book
-        top_bid = book_state.bids[0]
-        top_ask = book_state.asks[0]
-        
-        # 深度计算（取前 K 档，K 通常为 20）
-        levels_to_use = min(20, len(book_state.bids), len(book_state.asks))
-        bids_k = book_state.bids[:levels_to_use]
-        asks_k = book_state.asks[:levels_to_use]
-        
-        # USD 深度（价格 * 数量）
-        depth_bid_k = sum(b.price * b.size for b in bids_k)
-        depth_ask_k = sum(a.price * a.size for a in asks_k)
-        
-        # 盘口不平衡 imbalance（-1 到 1）
-        # > 0 表示买盘深度更厚，< 0 表示卖盘深度更厚
-        imb_k = (depth_bid_k - depth_ask_k) / (depth_bid_k + depth_ask_k + 1e-9)
-        
-        # Microprice（基于 top of book 的加权价格）
-        bid_sz = top_bid.size
-        ask_sz = top_ask.size
-        micro = (
-            (top_ask.price * bid_sz + top_bid.price * ask_sz) 
-            / (bid_sz + ask_sz + 1e-9)
-        )
-        micro_minus_mid = micro - mid
-        
-        # Price Impact 估计
-        impact_buy_bps = estimate_impact_bps(
-            levels=asks_k,
-            side="buy",
-            qty_usd=self._impact_size_usd,
-            mid=mid,
+        # 数值部分由按 depth_k 特化的内核完成（安装 numba 时 JIT 编译）
+        (
+            mid,
+            spread,
+            spread_bps,
+            depth_bid_k,
+            depth_ask_k,
+            imb_k,
+            micro_minus_mid,
+            impact_buy_bps,
+            impact_sell_bps,
+            churn,
+            buy_remaining,
+            sell_remaining,
+        ) = self._book_features(
+            self._bid_px[:n_bids],
+            self._bid_sz[:n_bids],
+            self._ask_px[:n_asks],
+            self._ask_sz[:n_asks],
+            float(self._impact_size_usd),
+            self._last_depth_bid,
+            self._last_depth_ask,
         )
         
-        impact_sell_bps = estimate_impact_bps(
-            levels=bids_k,
-            side="sell",
-            qty_usd=self._impact_size_usd,
-            mid=mid,
-        )
+        # 流动性不足
+        for side, remaining_usd in (("buy", buy_remaining), ("sell", sell_remaining)):
+            if remaining_usd > 0:
+                logger.warning(
+                    "insufficient_liquidity",
+                    side=side,
+                    qty_usd=self._impact_size_usd,
+                    remaining_usd=remaining_usd,
+                )
         
         # Message rate（订单簿更新速率）
         self._msg_count += 1
@@ -131,20 +252,14 @@ class FeatureEngine:
         else:
             msg_rate = 0.0
         
-        # Churn（盘口深度变动）
-        churn = (
-            abs(depth_bid_k - self._last_depth_bid) 
-            + abs(depth_ask_k - self._last_depth_ask)
-        )
-        
         # 更新状态
         self._last_depth_bid = depth_bid_k
         self._last_depth_ask = depth_ask_k
         
         # ========== Trade 特征 ==========
         
-        # 最近 1 分钟的交易聚合
-        agg = tape.aggregate(sec=60)
+        # 最近 1 分钟的交易聚合（以本 tick 的 ts 为准，不再单独读时钟）
+        agg = tape.aggregate(sec=60, now=ts)
         
         vol = agg.vol
         trades = agg.trades
@@ -165,29 +280,31 @@ class FeatureEngine:
         
         # ========== 构建特征向量 ==========
         
-        return FeatureVector(
-            ts=ts,
+        # 各字段由上面的计算保证落在 FeatureVector 约束范围内，
+        # 每 tick 构建时跳过字段校验
+        return FeatureVector.model_construct(
+            ts=float(ts),
             # Orderbook features
-            mid=mid,
-            spread=spread,
-            spread_bps=spread_bps,
-            top_bid_sz=top_bid.size,
-            top_ask_sz=top_ask.size,
-            depth_bid_k=depth_bid_k,
-            depth_ask_k=depth_ask_k,
-            imb_k=imb_k,
-            micro_minus_mid=micro_minus_mid,
-            impact_buy_bps=impact_buy_bps,
-            impact_sell_bps=impact_sell_bps,
-            msg_rate=msg_rate,
-            churn=churn,
+            mid=float(mid),
+            spread=float(spread),
+            spread_bps=float(spread_bps),
+            top_bid_sz=float(self._bid_sz[0]),
+            top_ask_sz=float(self._ask_sz[0]),
+            depth_bid_k=float(depth_bid_k),
+            depth_ask_k=float(depth_ask_k),
+            imb_k=float(imb_k),
+            micro_minus_mid=float(micro_minus_mid),
+            impact_buy_bps=float(impact_buy_bps),
+            impact_sell_bps=float(impact_sell_bps),
+            msg_rate=float(msg_rate),
+            churn=float(churn),
             # Trade features
-            vol=vol,
-            trades=trades,
-            avg_trade=avg_trade,
-            max_trade=max_trade,
-            signed_imb=signed_imb,
-            toxic=toxic,
+            vol=float(vol),
+            trades=int(trades),
+            avg_trade=float(avg_trade),
+            max_trade=float(max_trade),
+            signed_imb=float(signed_imb),
+            toxic=float(toxic),
         )
     
     def _empty_features(self, ts: float) -> FeatureVector:
@@ -197,29 +314,12 @@ class FeatureEngine:
             ts: 时间戳
         
         Returns:
-            全 0 的 FeatureVector
+            全 0 的 FeatureVector（冲击为 9999.9，表示无流动性）
         """
-        return FeatureVector(
+        return FeatureVector.default_template().replace(
             ts=ts,
-            mid=0.0,
-            spread=0.0,
-            spread_bps=0.0,
-            top_bid_sz=0.0,
-            top_ask_sz=0.0,
-            depth_bid_k=0.0,
-            depth_ask_k=0.0,
-            imb_k=0.0,
-            micro_minus_mid=0.0,
-            impact_buy_bps=9999.9,  # 无流动性
+            impact_buy_bps=9999.9,
             impact_sell_bps=9999.9,
-            msg_rate=0.0,
-            churn=0.0,
-            vol=0.0,
-            trades=0,
-            avg_trade=0.0,
-            max_trade=0.0,
-            signed_imb=0.0,
-            toxic=0.0,
         )
     
     def reset(self) -> None:
@@ -229,4 +329,7 @@ class FeatureEngine:
         self._msg_count = 0
         self._last_msg_ts = time.time()
         
+        for buf in (self._bid_px, self._bid_sz, self._ask_px, self._ask_sz):
+            buf.fill(0.0)
+        
         logger.info("feature_engine_reset")
@@ -4,14 +4,94 @@ TOXICTIDE Price Impact Estimation
 价格冲击估计 - 评估大单对市场价格的影响
 """
 
+import threading
 from typing import Literal
 
+import numpy as np
 import structlog
 
 from toxictide.models import OrderBookLevel
+from toxictide.utils.jit import njit
 
 logger = structlog.get_logger(__name__)
 
+# 线程本地的价位缓冲区（见 _levels_to_arrays）
+_scratch = threading.local()
+
+# 交易方向 -> 符号（买入价格上行、卖出价格下行为不利方向）
+_SIDE_SIGN = {"buy": 1.0, "sell": -1.0}
+
+# 成交金额的相对容差（见 _impact_bps_nb）
+_FILL_RTOL = 1e-9
+
+
+def _levels_to_arrays(
+    levels: list[OrderBookLevel],
+) -> tuple[np.ndarray, np.ndarray]:
+    """将价位列表拆成 (prices, sizes) 两个 float64 数组
+
+    使用线程本地的缓冲区，避免每次调用分配新数组。返回的是缓冲区视图，
+    仅在当前调用内有效。
+    """
+    n = len(levels)
+    prices = getattr(_scratch, "prices", None)
+
+    if prices is None or prices.shape[0] < n:
+        capacity = max(n, 64)
+        _scratch.prices = np.empty(capacity, dtype=np.float64)
+        _scratch.sizes = np.empty(capacity, dtype=np.float64)
+
+    prices = _scratch.prices[:n]
+    sizes = _scratch.sizes[:n]
+
+    for i, level in enumerate(levels):
+        prices[i] = level.price
+        sizes[i] = level.size
+
+    return prices, sizes
+
+
+@njit(cache=True, fastmath=True)
+def _impact_bps_nb(
+    prices: np.ndarray,
+    sizes: np.ndarray,
+    side_sign: float,
+    qty_usd: float,
+    ref_price: float,
+) -> tuple[float, float]:
+    """逐档消耗订单簿的数值内核
+
+    剩余金额不超过 qty_usd 的 _FILL_RTOL 视为已成交：逐档相减的舍入残差
+    不应把恰好等于总深度的金额判为流动性不足。
+
+    Returns:
+        (impact_bps, remaining_usd)；流动性不足时 impact_bps 为 9999.9
+    """
+    remaining = qty_usd
+    tol = qty_usd * _FILL_RTOL
+    cost = 0.0
+    filled = 0.0
+
+    for i in range(prices.shape[0]):
+        if remaining <= tol:
+            break
+
+        level_usd = prices[i] * sizes[i]
+        take = min(remaining, level_usd)
+
+        cost += take
+        filled += take / prices[i]
+        remaining -= take
+
+    if remaining > tol:
+        return 9999.9, remaining
+
+    # 平均成交价（VWAP）相对参考价的偏离，side_sign 统一买卖方向
+    avg_price = cost / filled
+    impact = (avg_price - ref_price) / ref_price * 10000.0 * side_sign
+
+    return max(0.0, impact), 0.0
+
 
 def estimate_impact_bps(
     levels: list[OrderBookLevel],
@@ -45,34 +125,52 @@ def estimate_impact_bps(
         >>> print(f"Impact: {impact:.2f} bps")
     
     算法：
-        1. 逐档消耗订单簿，累计 total_cost 和 consumed_usd
+        1. 逐档消耗订单簿，累计成交金额 cost 与成交数量 filled
         2. 若流动性不足（remaining > 0），返回 9999.9
-        3. 计算平均成交价：avg_price = total_cost / qty_usd
+        3. 计算平均成交价：avg_price = cost / filled
         4. 计算相对 mid 的偏离（bps）
+    
+    逐档循环由 `_impact_bps_nb` 内核完成（安装 numba 时 JIT 编译）。
+    已有数组时可直接调用 `estimate_impact_bps_from_arrays`。
+    """
+    prices, sizes = _levels_to_arrays(levels)
+    return estimate_impact_bps_from_arrays(prices, sizes, side, qty_usd, mid)
+
+
+def estimate_impact_bps_from_arrays(
+    prices: np.ndarray,
+    sizes: np.ndarray,
+    side: Literal["buy", "sell"],
+    qty_usd: float,
+    mid: float,
+) -> float:
+    """估计价格冲击（以 bps 计），按列数组版本
+    
+    与 `estimate_impact_bps` 相同，但直接接收价格/数量数组
+    （如 `OrderBookState.ask_px` / `ask_sz`），无需拆解价位对象。
+    
+    Args:
+        prices: 价格数组（按成交顺序排列）
+        sizes: 数量数组
+        side: 交易方向
+        qty_usd: 目标成交金额（USD）
+        mid: 中间价
+    
+    Returns:
+        价格冲击（bps），范围 [0, 9999.9]
     """
     if qty_usd <= 0:
         return 0.0
     
-    if not levels:
+    if prices.shape[0] == 0:
         logger.warning("impact_empty_levels", side=side, qty_usd=qty_usd)
         return 9999.9
     
-    remaining_usd = qty_usd
-    total_cost = 0.0  # 总消耗（包含价格变动）
+    side_sign = _SIDE_SIGN[side]
     
-    for level in levels:
-        if remaining_usd <= 0:
-            break
-        
-        # 本档可提供的 USD 深度
-        level_usd = level.price * level.size
-        
-        # 本档消耗的 USD
-        consumed_usd = min(remaining_usd, level_usd)
-        
-        # 累计成本
-        total_cost += consumed_usd
-        remaining_usd -= consumed_usd
+    impact_bps, remaining_usd = _impact_bps_nb(
+        prices, sizes, side_sign, float(qty_usd), float(mid)
+    )
     
     # 流动性不足
     if remaining_usd > 0:
@@ -82,23 +180,8 @@ def estimate_impact_bps(
             qty_usd=qty_usd,
             remaining_usd=remaining_usd,
         )
-        return 9999.9
-    
-    # 计算平均成交价
-    avg_price = total_cost / qty_usd if qty_usd > 0 else mid
-    
-    # 计算相对 mid 的偏离（bps）
-    if side == "buy":
-        # 买入：avg_price 应该 > mid（支付更高价格）
-        impact_bps = ((avg_price - mid) / mid) * 10000
-    else:  # sell
-        # 卖出：avg_price 应该 < mid（获得更低价格）
-        impact_bps = ((mid - avg_price) / mid) * 10000
     
-    # 确保非负
-    impact_bps = max(0.0, impact_bps)
-    
-    return impact_bps
+    return float(impact_bps)
 
 
 def estimate_market_depth_usd(
@@ -123,6 +206,8 @@ def estimate_market_depth_usd(
     Example:
         >>> asks = [OrderBookLevel(price=100.0, size=10.0)]
         >>> depth = estimate_market_depth_usd(asks, 50.0, 99.5, "buy")
+    
+    由累计数组解析求解，详见 `estimate_market_depth_usd_from_arrays`。
     """
     if max_impact_bps <= 0:
         return 0.0
@@ -130,20 +215,75 @@ def estimate_market_depth_usd(
     if not levels:
         return 0.0
     
-    # 二分搜索找到最大可用 USD
-    low, high = 0.0, sum(l.price * l.size for l in levels)
-    tolerance = 1.0  # USD
+    prices, sizes = _levels_to_arrays(levels)
+    return estimate_market_depth_usd_from_arrays(
+        prices, sizes, max_impact_bps, mid, side
+    )
+
+
+def estimate_market_depth_usd_from_arrays(
+    prices: np.ndarray,
+    sizes: np.ndarray,
+    max_impact_bps: float,
+    mid: float,
+    side: Literal["buy", "sell"],
+) -> float:
+    """估计在指定冲击上限下的可用深度（USD），按列数组版本
+    
+    Args:
+        prices: 价格数组（按成交顺序排列）
+        sizes: 数量数组
+        max_impact_bps: 最大可接受冲击（bps）
+        mid: 中间价
+        side: 交易方向
+    
+    Returns:
+        可用深度（USD）
+    
+    算法：
+        1. 累计成交金额 cum_notional 与成交数量 cum_qty
+        2. 吃满前 k 档的平均成交价 avg_px_k = cum_notional / cum_qty，
+           对应冲击 impact_k 随 k 单调递增
+        3. searchsorted 找到第一个超过上限的档位 k
+        4. 在第 k 档内解析求解剩余可成交金额 x：
+           (N + x) / (S + x / p_k) = target_px
+    """
+    if max_impact_bps <= 0:
+        return 0.0
+    
+    n = prices.shape[0]
+    if n == 0:
+        return 0.0
+    
+    side_sign = _SIDE_SIGN[side]
+    
+    cum_notional = np.cumsum(prices * sizes)
+    cum_qty = np.cumsum(sizes)
+    
+    avg_px_at_k = cum_notional / cum_qty
+    impact_at_k = (avg_px_at_k - mid) / mid * 10000.0 * side_sign
+    
+    # 可完整吃下的档数
+    k = int(np.searchsorted(impact_at_k, max_impact_bps, side="right"))
+    
+    if k >= n:
+        return float(cum_notional[-1])
+    
+    filled_usd = float(cum_notional[k - 1]) if k > 0 else 0.0
+    filled_qty = float(cum_qty[k - 1]) if k > 0 else 0.0
+    
+    # 平均成交价恰好触及上限时的价格
+    target_px = mid * (1.0 + side_sign * max_impact_bps / 10000.0)
+    level_px = float(prices[k])
     
-    while high - low > tolerance:
-        mid_qty = (low + high) / 2
-        impact = estimate_impact_bps(levels, side, mid_qty, mid)
-        
-        if impact <= max_impact_bps:
-            low = mid_qty  # 可以更大
-        else:
-            high = mid_qty  # 太大了
+    denom = 1.0 - target_px / level_px
+    if denom == 0.0:
+        return filled_usd
     
-    return low
+    partial_usd = (target_px * filled_qty - filled_usd) / denom
+    partial_usd = min(max(partial_usd, 0.0), level_px * float(sizes[k]))
+    
+    return filled_usd + partial_usd
 
 
 def estimate_slippage_bps(
@@ -165,11 +305,36 @@ def estimate_slippage_bps(
         >>> slippage = estimate_slippage_bps(100.5, 100.0, "buy")
         >>> print(f"Slippage: {slippage:.2f} bps")  # 50.0 bps
     """
-    if side == "buy":
-        # 买入：支付更高价格 = 正滑点
-        slippage = ((fill_price - reference_price) / reference_price) * 10000
-    else:
-        # 卖出：获得更低价格 = 正滑点
-        slippage = ((reference_price - fill_price) / reference_price) * 10000
-    
-    return slippage
+    # 买入支付更高价格、卖出获得更低价格，均为正滑点
+    return (fill_price - reference_price) / reference_price * 10000 * _SIDE_SIGN[side]
+
+
+def estimate_slippage_bps_batch(
+    fill_prices: np.ndarray,
+    reference_prices: np.ndarray,
+    sides: np.ndarray,
+) -> np.ndarray:
+    """批量计算实际滑点（事后分析）
+    
+    Args:
+        fill_prices: 实际成交价数组
+        reference_prices: 参考价数组（通常是决策时的 mid）
+        sides: 交易方向数组（"buy" / "sell"）
+    
+    Returns:
+        滑点数组（bps），正值表示不利滑点
+    
+    Example:
+        >>> slippage = estimate_slippage_bps_batch(
+        ...     np.array([100.5, 99.5]),
+        ...     np.array([100.0, 100.0]),
+        ...     np.array(["buy", "sell"]),
+        ... )
+        >>> print(slippage)  # [50. 50.]
+    """
+    fill_prices = np.asarray(fill_prices, dtype=np.float64)
+    reference_prices = np.asarray(reference_prices, dtype=np.float64)
+    side_sign = np.where(np.asarray(sides) == "buy", 1.0, -1.0)
+    
+    slippage = (fill_prices - reference_prices) / reference_prices * 10000 * side_sign
+    return np.asarray(slippage, dtype=np.float64)
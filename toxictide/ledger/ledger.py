@@ -4,17 +4,66 @@ TOXICTIDE Ledger
 审计日志系统 - JSONL 格式持久化每次决策
 """
 
-import json
+import mmap
+import queue
+import threading
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import Literal, Optional
 
+import numpy as np
 import structlog
-
-from toxictide.models import LedgerRecord
+from pydantic import BaseModel
+
+from toxictide.exceptions import ConfigValidationError
+from toxictide.models import (
+    ExecutionPlan,
+    FeatureVector,
+    LedgerRecord,
+    MarketStressIndex,
+    OrderbookAnomalyReport,
+    RegimeState,
+    RiskDecision,
+    VolumeAnomalyReport,
+)
+
+try:
+    import msgpack
+
+    MSGPACK_AVAILABLE = True
+except ImportError:  # pragma: no cover - 取决于运行环境
+    msgpack = None
+    MSGPACK_AVAILABLE = False
 
 logger = structlog.get_logger(__name__)
 
+# 写线程每次唤醒最多合并写入的记录数
+_WRITE_BATCH = 256
+
+# 写线程退出信号
+_STOP = object()
+
+# 日志格式 -> 文件后缀
+_FORMAT_SUFFIX = {"jsonl": ".jsonl", "msgpack": ".msgpack"}
+
+# msgpack 帧长度前缀（4 字节小端无符号整数）
+_FRAME_HEADER_SIZE = 4
+
+# 列式读取时展开的记录分段 -> 对应的子模型（字段结构固定）
+_COLUMN_SECTIONS: dict[str, type[BaseModel]] = {
+    "features": FeatureVector,
+    "oad": OrderbookAnomalyReport,
+    "vad": VolumeAnomalyReport,
+    "stress": MarketStressIndex,
+    "regime": RegimeState,
+    "risk": RiskDecision,
+    "plan": ExecutionPlan,
+}
+
+# LedgerRecord 的编译期序列化器（字段遍历在模型构建时已生成，导入时绑定一次）
+_RECORD_TO_JSON = LedgerRecord.__pydantic_serializer__.to_json
+_RECORD_TO_PYTHON = LedgerRecord.__pydantic_serializer__.to_python
+
 
 class Ledger:
     """审计日志系统
@@ -33,7 +82,10 @@ class Ledger:
     **文件组织：**
     - 按日期分文件：logs/session_YYYYMMDD.jsonl
     - 每条记录一行 JSON
-    - 追加模式（append）
+    - format="msgpack" 时写入 logs/session_YYYYMMDD.msgpack，每条记录为
+      4 字节小端长度前缀 + msgpack 负载（需安装 msgpack）
+    - 追加模式（append），写入经大缓冲区合并后批量落盘
+    - 后台写线程：append 只负责序列化并入队，文件写入在独立线程中批量完成
 
     **用途：**
     - 完整审计追踪（监管合规）
@@ -47,21 +99,58 @@ class Ledger:
         >>> ledger.close()
     """
 
-    def __init__(self, log_dir: str = "logs") -> None:
+    def __init__(
+        self,
+        log_dir: str = "logs",
+        buffer_size: int = 1 << 20,
+        max_pending: int = 10000,
+        format: Literal["jsonl", "msgpack"] = "jsonl",
+        put_timeout: float = 1.0,
+    ) -> None:
         """初始化审计日志
 
         Args:
             log_dir: 日志目录路径
+            buffer_size: 写缓冲区大小（字节），缓冲区满、调用 flush() 或
+                close() 时落盘
+            max_pending: 待写队列上限（条），写线程跟不上时 append 阻塞等待
+            format: 磁盘格式，"jsonl"（默认，便于调试）或 "msgpack"（体积更小、
+                解析更快）
+            put_timeout: 队列满时 append 最长等待时间（秒），超时则丢弃该记录
+
+        Raises:
+            ConfigValidationError: 格式不支持或未安装 msgpack
         """
+        if format not in _FORMAT_SUFFIX:
+            raise ConfigValidationError(f"Unsupported ledger format: {format}")
+        if format == "msgpack" and not MSGPACK_AVAILABLE:
+            raise ConfigValidationError(
+                "Ledger format 'msgpack' requires the msgpack package"
+            )
+        self._format = format
+
         self._log_dir = Path(log_dir)
         self._log_dir.mkdir(exist_ok=True)
 
         # 按日期分文件
         date_str = datetime.now().strftime("%Y%m%d")
-        self._log_path = self._log_dir / f"session_{date_str}.jsonl"
-
-        # 追加模式打开文件
-        self._file = open(self._log_path, "a", encoding="utf-8")
+        suffix = _FORMAT_SUFFIX[format]
+        self._log_path = self._log_dir / f"session_{date_str}{suffix}"
+
+        # 二进制追加模式打开文件，由 BufferedWriter 合并小写入
+        self._file = open(self._log_path, "ab", buffering=buffer_size)
+
+        # 后台写线程
+        self._queue: queue.Queue = queue.Queue(maxsize=max_pending)
+        self._put_timeout = put_timeout
+        self._closed = False
+        self._dropped = 0
+        self._writer = threading.Thread(
+            target=self._writer_loop,
+            name="ledger-writer",
+            daemon=True,
+        )
+        self._writer.start()
 
         logger.info(
             "ledger_initialized",
@@ -71,19 +160,30 @@ class Ledger:
     def append(self, record: LedgerRecord) -> None:
         """追加审计记录
 
+        在调用线程中序列化，写入交给后台线程。已关闭或队列持续满载时
+        记录被丢弃并计入 `dropped_count`，不会阻塞调用方。
+
         Args:
             record: LedgerRecord 对象
         """
-        try:
-            # 序列化为 JSON（单行）
-            json_str = record.model_dump_json()
+        if self._closed:
+            self._dropped += 1
+            logger.error("ledger_append_after_close", ts=record.ts)
+            return
 
-            # 写入文件
-            self._file.write(json_str + "\n")
-            self._file.flush()
+        try:
+            self._queue.put(self._encode(record), timeout=self._put_timeout)
 
             logger.debug("ledger_record_appended", ts=record.ts)
 
+        except queue.Full:
+            self._dropped += 1
+            logger.error(
+                "ledger_queue_full",
+                ts=record.ts,
+                dropped_count=self._dropped,
+            )
+
         except Exception as e:
             logger.error(
                 "ledger_append_failed",
@@ -91,8 +191,85 @@ class Ledger:
                 exc_info=True,
             )
 
+    def _encode(self, record: LedgerRecord) -> bytes:
+        """按日志格式将记录编码为字节"""
+        if self._format == "msgpack":
+            payload = bytes(msgpack.packb(_RECORD_TO_PYTHON(record, mode="json")))
+            return len(payload).to_bytes(_FRAME_HEADER_SIZE, "little") + payload
+
+        # 直接序列化为 UTF-8 字节（单行），省去 str 中转与编码
+        return _RECORD_TO_JSON(record) + b"\n"
+
+    def _writer_loop(self) -> None:
+        """后台写线程：阻塞等待记录，每次唤醒批量写入"""
+        while True:
+            item = self._queue.get()
+            batch: list[bytes] = []
+            stop = False
+            flush_events: list[threading.Event] = []
+
+            while True:
+                if item is _STOP:
+                    stop = True
+                elif isinstance(item, threading.Event):
+                    flush_events.append(item)
+                else:
+                    batch.append(item)
+
+                if len(batch) >= _WRITE_BATCH:
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+
+            try:
+                if batch:
+                    self._file.writelines(batch)
+                if flush_events or stop:
+                    self._file.flush()
+            except Exception as e:
+                logger.error(
+                    "ledger_write_failed",
+                    error=str(e),
+                    records_count=len(batch),
+                    exc_info=True,
+                )
+            finally:
+                for event in flush_events:
+                    event.set()
+
+            if stop:
+                return
+
+    def flush(self) -> None:
+        """等待已入队的记录全部写入磁盘"""
+        if not self._writer.is_alive():
+            return
+
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait()
+
     def close(self) -> None:
-        """关闭日志文件"""
+        """停止写线程并关闭日志文件"""
+        self._closed = True
+
+        if self._writer.is_alive():
+            self._queue.put(_STOP)
+            self._writer.join()
+
+        # 与 close 并发的 append 可能在退出信号之后入队，这些记录不会再写入
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if isinstance(item, bytes):
+                self._dropped += 1
+            elif isinstance(item, threading.Event):
+                item.set()
+
         if self._file and not self._file.closed:
             self._file.close()
             logger.info("ledger_closed", log_path=str(self._log_path))
@@ -110,10 +287,17 @@ class Ledger:
         """获取当前日志文件路径"""
         return self._log_path
 
+    @property
+    def dropped_count(self) -> int:
+        """因已关闭或队列满载而丢弃的记录数"""
+        return self._dropped
+
 
 def read_ledger(log_path: str) -> list[LedgerRecord]:
     """读取审计日志文件
 
+    按文件后缀识别格式：.msgpack 为长度前缀的 msgpack 帧，其余按 JSONL 读取。
+
     Args:
         log_path: 日志文件路径
 
@@ -125,21 +309,151 @@ def read_ledger(log_path: str) -> list[LedgerRecord]:
         >>> for record in records:
         ...     print(record.risk.action)
     """
-    records = []
-
-    with open(log_path, "r", encoding="utf-8") as f:
-        for line_num, line in enumerate(f, 1):
-            try:
-                data = json.loads(line.strip())
-                record = LedgerRecord(**data)
-                records.append(record)
-            except Exception as e:
-                logger.warning(
-                    "ledger_read_line_failed",
-                    line_num=line_num,
-                    error=str(e),
-                )
+    if Path(log_path).suffix == _FORMAT_SUFFIX["msgpack"]:
+        records = _read_msgpack_frames(log_path)
+    else:
+        records = _read_jsonl(log_path)
 
     logger.info("ledger_read_completed", records_count=len(records))
 
     return records
+
+
+def read_ledger_columns(log_path: str) -> dict[str, np.ndarray]:
+    """以列式读取审计日志，便于批量分析
+
+    展开 ts 与各固定结构子模型（features / oad / vad / stress / regime /
+    risk / plan）的标量字段，列名形如 "features.spread_bps"。数值列为
+    float64 数组，其余为 object 数组；列表、字典类字段不展开。
+
+    Args:
+        log_path: 日志文件路径
+
+    Returns:
+        列名 -> 数组
+
+    Example:
+        >>> cols = read_ledger_columns("logs/session_20240101.jsonl")
+        >>> cols["features.spread_bps"].mean()
+    """
+    records = read_ledger(log_path)
+
+    columns: dict[str, np.ndarray] = {
+        "ts": np.fromiter((r.ts for r in records), dtype=np.float64, count=len(records)),
+    }
+
+    for section, model_cls in _COLUMN_SECTIONS.items():
+        models = [getattr(r, section) for r in records]
+        field_names = model_cls.model_fields
+
+        for name in field_names:
+            values = [getattr(m, name) for m in models]
+
+            if any(isinstance(v, (list, dict)) for v in values):
+                continue
+
+            if all(isinstance(v, (int, float)) for v in values):
+                column = np.asarray(values, dtype=np.float64)
+            else:
+                column = np.empty(len(values), dtype=object)
+                column[:] = values
+
+            columns[f"{section}.{name}"] = column
+
+    return columns
+
+
+def _map_file(f) -> mmap.mmap | None:
+    """只读映射整个文件，空文件返回 None"""
+    try:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except ValueError:
+        # 空文件无法映射
+        return None
+
+
+def _read_jsonl(log_path: str) -> list[LedgerRecord]:
+    """逐行读取 JSONL 日志（内存映射，按换行切分）"""
+    records: list[LedgerRecord] = []
+
+    with open(log_path, "rb") as f:
+        mm = _map_file(f)
+        if mm is None:
+            return records
+
+        with mm:
+            size = len(mm)
+            pos = 0
+            line_num = 0
+
+            while pos < size:
+                end = mm.find(b"\n", pos)
+                if end == -1:
+                    end = size
+
+                line_num += 1
+                line = mm[pos:end]
+                pos = end + 1
+
+                try:
+                    record = LedgerRecord.model_validate_json(line)
+                    records.append(record)
+                except Exception as e:
+                    logger.warning(
+                        "ledger_read_line_failed",
+                        line_num=line_num,
+                        error=str(e),
+                    )
+
+    return records
+
+
+def _read_msgpack_frames(log_path: str) -> list[LedgerRecord]:
+    """逐帧读取 msgpack 日志（内存映射）
+
+    Raises:
+        ConfigValidationError: 未安装 msgpack
+    """
+    if not MSGPACK_AVAILABLE:
+        raise ConfigValidationError(
+            "Reading a msgpack ledger requires the msgpack package"
+        )
+
+    records: list[LedgerRecord] = []
+
+    with open(log_path, "rb") as f:
+        mm = _map_file(f)
+        if mm is None:
+            return records
+
+        with mm:
+            total = len(mm)
+            pos = 0
+            frame_num = 0
+
+            while pos < total:
+                frame_num += 1
+                start = pos + _FRAME_HEADER_SIZE
+                if start > total:
+                    logger.warning("ledger_truncated_frame", frame_num=frame_num)
+                    break
+
+                size = int.from_bytes(mm[pos:start], "little")
+                end = start + size
+                if end > total:
+                    logger.warning("ledger_truncated_frame", frame_num=frame_num)
+                    break
+
+                pos = end
+
+                try:
+                    record = LedgerRecord.model_validate(msgpack.unpackb(mm[start:end]))
+                    records.append(record)
+                except Exception as e:
+                    logger.warning(
+                        "ledger_read_frame_failed",
+                        frame_num=frame_num,
+                        error=str(e),
+                    )
+
+    return records
@@ -6,15 +6,15 @@ TOXICTIDE Market Collector
 - 未来可扩展为真实数据源
 """
 
-import random
 import time
 from abc import ABC, abstractmethod
+from decimal import Decimal
 from typing import Protocol
 
 import numpy as np
 import structlog
 
-from toxictide.models import OrderBookLevel, OrderBookState, Trade
+from toxictide.models import OrderBookState, Trade
 
 logger = structlog.get_logger(__name__)
 
@@ -50,6 +50,7 @@ class PaperMarketCollector:
         spread_bps: float = 5.0,
         depth_levels: int = 20,
         tick_size: float = 0.01,
+        seed: int | None = None,
     ) -> None:
         """初始化 Paper 采集器
 
@@ -59,6 +60,7 @@ class PaperMarketCollector:
             spread_bps: 买卖价差（基点）
             depth_levels: 盘口深度档数
             tick_size: 最小价格变动
+            seed: 随机种子（None 表示不固定）
         """
         self._base_price = base_price
         self._current_price = base_price
@@ -66,9 +68,20 @@ class PaperMarketCollector:
         self._spread_bps = spread_bps
         self._depth_levels = depth_levels
         self._tick_size = tick_size
+        # tick 的小数位数，用于清理 tick 数 × tick_size 的浮点残差
+        self._price_decimals = max(
+            0, -int(Decimal(str(tick_size)).normalize().as_tuple().exponent)
+        )
         self._seq = 0
         self._trade_id = 0
 
+        # 随机数发生器（PCG64），只在初始化时播种一次
+        self._rng = np.random.default_rng(seed)
+        self._side_lut = ("sell", "buy")
+
+        # 各深度档数对应的档位表缓存：depth -> (价格偏移, 数量倍数)
+        self._level_tables: dict[int, tuple[np.ndarray, np.ndarray]] = {}
+
         # 价格历史（用于趋势模拟）
         self._price_history: list[float] = [base_price]
         self._trend_direction = 0.0  # -1 到 1
@@ -80,15 +93,36 @@ class PaperMarketCollector:
             spread_bps=spread_bps,
         )
 
+    def _level_table(self, depth_levels: int) -> tuple[np.ndarray, np.ndarray]:
+        """获取指定档数的价格偏移与数量倍数（首次使用时计算并缓存）
+
+        价格偏移为 i * (1 + 0.1i) 取整后的 tick 数（整数 tick，保证各档
+        落在 tick 网格上且严格递增），数量倍数为 1 + 0.2i。
+        """
+        table = self._level_tables.get(depth_levels)
+        if table is None:
+            i = np.arange(depth_levels, dtype=np.float64)
+            table = (np.rint(i * (1 + i * 0.1)), 1 + i * 0.2)
+            self._level_tables[depth_levels] = table
+        return table
+
+    def _ticks_to_price(self, ticks: np.ndarray) -> np.ndarray:
+        """tick 数 -> 价格"""
+        return np.round(ticks * self._tick_size, self._price_decimals)
+
+    def _snap_to_tick(self, prices: np.ndarray) -> np.ndarray:
+        """价格对齐到 tick 网格"""
+        return self._ticks_to_price(np.rint(prices / self._tick_size))
+
     def _update_price(self) -> None:
         """更新当前价格"""
         # 随机游走 + 趋势
-        random_return = np.random.normal(0, self._volatility)
+        random_return = self._rng.normal(0, self._volatility)
         trend_return = self._trend_direction * self._volatility * 0.5
 
         # 偶尔改变趋势方向
-        if random.random() < 0.05:
-            self._trend_direction = np.random.uniform(-1, 1)
+        if self._rng.random() < 0.05:
+            self._trend_direction = self._rng.uniform(-1, 1)
 
         total_return = random_return + trend_return
         self._current_price *= (1 + total_return)
@@ -101,8 +135,9 @@ class PaperMarketCollector:
 
         # 对齐到 tick size
         self._current_price = round(
-            self._current_price / self._tick_size
-        ) * self._tick_size
+            round(self._current_price / self._tick_size) * self._tick_size,
+            self._price_decimals,
+        )
 
         self._price_history.append(self._current_price)
         if len(self._price_history) > 1000:
@@ -111,6 +146,22 @@ class PaperMarketCollector:
     def get_orderbook_snapshot(self) -> OrderBookState:
         """生成订单簿快照
 
+        Returns:
+            OrderBookState 对象
+        """
+        return self._build_snapshot(self._spread_bps, self._depth_levels)
+
+    def _build_snapshot(
+        self,
+        spread_bps: float,
+        depth_levels: int,
+    ) -> OrderBookState:
+        """推进价格并按给定价差与档数生成订单簿快照
+
+        Args:
+            spread_bps: 买卖价差（基点）
+            depth_levels: 盘口深度档数
+
         Returns:
             OrderBookState 对象
         """
@@ -118,41 +169,31 @@ class PaperMarketCollector:
         self._seq += 1
 
         mid = self._current_price
-        spread = mid * (self._spread_bps / 10000)
+        spread = mid * (spread_bps / 10000)
         half_spread = spread / 2
 
-        best_bid = mid - half_spread
-        best_ask = mid + half_spread
-
-        # 生成盘口
-        bids: list[OrderBookLevel] = []
-        asks: list[OrderBookLevel] = []
+        # 最优价对齐到 tick，价差至少 1 个 tick
+        best_bid = round((mid - half_spread) / self._tick_size)
+        best_ask = max(round((mid + half_spread) / self._tick_size), best_bid + 1)
 
-        for i in range(self._depth_levels):
-            # 价格递减/递增
-            bid_price = best_bid - i * self._tick_size * (1 + i * 0.1)
-            ask_price = best_ask + i * self._tick_size * (1 + i * 0.1)
+        # 生成盘口（整列向量化生成，以 tick 数计算后换算为价格）
+        n = depth_levels
+        level_offsets, depth_multipliers = self._level_table(n)
+        bid_px = self._ticks_to_price(best_bid - level_offsets)
+        ask_px = self._ticks_to_price(best_ask + level_offsets)
 
-            # 数量：近档小，远档大（模拟真实市场）
-            base_size = random.uniform(0.5, 3.0)
-            depth_multiplier = 1 + i * 0.2
+        # 数量：近档小，远档大（模拟真实市场）
+        base_size = self._rng.uniform(0.5, 3.0, n) * depth_multipliers
+        noise = self._rng.uniform(0.8, 1.2, (2, n))
+        bid_sz = base_size * noise[0]
+        ask_sz = base_size * noise[1]
 
-            bid_size = base_size * depth_multiplier * random.uniform(0.8, 1.2)
-            ask_size = base_size * depth_multiplier * random.uniform(0.8, 1.2)
-
-            bids.append(OrderBookLevel(
-                price=round(bid_price, 2),
-                size=round(bid_size, 4),
-            ))
-            asks.append(OrderBookLevel(
-                price=round(ask_price, 2),
-                size=round(ask_size, 4),
-            ))
-
-        return OrderBookState(
+        return OrderBookState.from_arrays(
             ts=time.time(),
-            bids=bids,
-            asks=asks,
+            bid_px=bid_px,
+            bid_sz=np.round(bid_sz, 4),
+            ask_px=ask_px,
+            ask_sz=np.round(ask_sz, 4),
             seq=self._seq,
         )
 
@@ -165,42 +206,65 @@ class PaperMarketCollector:
         Returns:
             Trade 列表
         """
-        trades: list[Trade] = []
-        current_ts = time.time()
+        return self._generate_trades(count, max_age_sec=5.0)
 
-        for i in range(count):
-            self._trade_id += 1
+    def _generate_trades(
+        self,
+        count: int,
+        max_age_sec: float,
+        size_scale: float = 1.0,
+        size_range: tuple[float, float] | None = None,
+    ) -> list[Trade]:
+        """批量生成按时间排序的交易
 
-            # 随机时间（最近几秒内）
-            ts = current_ts - random.uniform(0, 5)
+        Args:
+            count: 交易数量
+            max_age_sec: 成交时间距今的最大秒数
+            size_scale: 数量放大倍数
+            size_range: 指定数量的均匀分布区间，None 表示使用默认的
+                大小单混合分布
 
-            # 随机价格（在当前价格附近）
-            price_offset = np.random.normal(0, self._current_price * 0.0001)
-            price = self._current_price + price_offset
-            price = round(price / self._tick_size) * self._tick_size
+        Returns:
+            Trade 列表
+        """
+        if count <= 0:
+            return []
 
-            # 随机数量（大部分小单，偶尔大单）
-            if random.random() < 0.05:
-                # 大单
-                size = random.uniform(5.0, 20.0)
-            else:
-                # 小单
-                size = random.uniform(0.01, 2.0)
+        current_ts = time.time()
+        self._trade_id += count
+        rng = self._rng
 
-            # 随机方向（可以有不平衡）
-            buy_probability = 0.5 + self._trend_direction * 0.1
-            side = "buy" if random.random() < buy_probability else "sell"
+        # 随机时间（最近几秒内），升序排列即按时间排序
+        ts = current_ts - np.sort(rng.uniform(0, max_age_sec, count))[::-1]
 
-            trades.append(Trade(
-                ts=ts,
-                price=round(price, 2),
-                size=round(size, 4),
-                side=side,
-            ))
+        # 随机价格（在当前价格附近），对齐到 tick size
+        prices = rng.normal(self._current_price, self._current_price * 0.0001, count)
+        prices = self._snap_to_tick(prices)
 
-        # 按时间排序
-        trades.sort(key=lambda t: t.ts)
-        return trades
+        # 随机数量（大部分小单，偶尔大单）
+        if size_range is not None:
+            sizes = rng.uniform(size_range[0], size_range[1], count)
+        else:
+            is_whale = rng.random(count) < 0.05
+            sizes = np.where(
+                is_whale,
+                rng.uniform(5.0, 20.0, count),
+                rng.uniform(0.01, 2.0, count),
+            )
+        sizes = np.round(sizes, 4) * size_scale
+
+        # 随机方向（可以有不平衡）
+        buy_probability = 0.5 + self._trend_direction * 0.1
+        side_bits = (rng.random(count) < buy_probability).tolist()
+
+        # 数值在生成时已保证合法，跳过逐笔校验
+        side_lut = self._side_lut
+        return [
+            Trade.model_construct(ts=t, price=p, size=sz, side=side_lut[b])
+            for t, p, sz, b in zip(
+                ts.tolist(), prices.tolist(), sizes.tolist(), side_bits, strict=True
+            )
+        ]
 
     def generate_single_trade(self) -> Trade:
         """生成单笔交易
@@ -209,22 +273,26 @@ class PaperMarketCollector:
             Trade 对象
         """
         self._trade_id += 1
+        rng = self._rng
 
-        price_offset = np.random.normal(0, self._current_price * 0.0001)
+        price_offset = rng.normal(0, self._current_price * 0.0001)
         price = self._current_price + price_offset
-        price = round(price / self._tick_size) * self._tick_size
+        price = round(
+            round(price / self._tick_size) * self._tick_size, self._price_decimals
+        )
 
-        if random.random() < 0.05:
-            size = random.uniform(5.0, 20.0)
+        if rng.random() < 0.05:
+            size = float(rng.uniform(5.0, 20.0))
         else:
-            size = random.uniform(0.01, 2.0)
+            size = float(rng.uniform(0.01, 2.0))
 
         buy_probability = 0.5 + self._trend_direction * 0.1
-        side = "buy" if random.random() < buy_probability else "sell"
+        side = "buy" if rng.random() < buy_probability else "sell"
 
-        return Trade(
+        # 数值在生成时已保证合法，跳过校验
+        return Trade.model_construct(
             ts=time.time(),
-            price=round(price, 2),
+            price=float(price),
             size=round(size, 4),
             side=side,
         )
@@ -246,44 +314,24 @@ class PaperMarketCollector:
             (OrderBookState, trades) 元组
         """
         if anomaly_type == "spread_spike":
-            # 临时增加价差
-            original_spread = self._spread_bps
-            self._spread_bps = original_spread * 5
-            snapshot = self.get_orderbook_snapshot()
-            self._spread_bps = original_spread
+            # 价差扩大 5 倍
+            snapshot = self._build_snapshot(self._spread_bps * 5, self._depth_levels)
             trades = self.get_recent_trades(5)
 
         elif anomaly_type == "volume_burst":
-            # 生成大量交易
+            # 同一时刻的大量放大成交
             snapshot = self.get_orderbook_snapshot()
-            trades = []
-            for _ in range(50):
-                trade = self.generate_single_trade()
-                trades.append(Trade(
-                    ts=trade.ts,
-                    price=trade.price,
-                    size=trade.size * 3,  # 放大
-                    side=trade.side,
-                ))
+            trades = self._generate_trades(50, max_age_sec=0.0, size_scale=3.0)
 
         elif anomaly_type == "liquidity_gap":
-            # 减少盘口深度
-            original_levels = self._depth_levels
-            self._depth_levels = 3
-            snapshot = self.get_orderbook_snapshot()
-            self._depth_levels = original_levels
+            # 盘口只剩 3 档
+            snapshot = self._build_snapshot(self._spread_bps, 3)
             trades = self.get_recent_trades(5)
 
         elif anomaly_type == "whale_trade":
-            # 生成鲸鱼交易
+            # 单笔鲸鱼交易
             snapshot = self.get_orderbook_snapshot()
-            whale_trade = Trade(
-                ts=time.time(),
-                price=self._current_price,
-                size=random.uniform(50.0, 200.0),
-                side=random.choice(["buy", "sell"]),
-            )
-            trades = [whale_trade]
+            trades = self._generate_trades(1, max_age_sec=0.0, size_range=(50.0, 200.0))
 
         else:
             snapshot = self.get_orderbook_snapshot()
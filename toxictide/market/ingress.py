@@ -0,0 +1,199 @@
+"""
+TOXICTIDE Market Ingress
+
+订单簿增量的单写入者入口队列（Singular Update Queue）：
+- 行情线程（唯一生产者）把解码后的增量写入定长环形缓冲区
+- 单个消费者线程批量取出并调用 `OrderBook.apply_delta_raw`
+- 每次消费后发布一份不可变的 `OrderBookState`，读者直接读取引用，无需加锁
+"""
+
+import threading
+
+import numpy as np
+import structlog
+
+from toxictide.exceptions import ConfigValidationError
+from toxictide.market.orderbook import OrderBook
+from toxictide.models import OrderBookState
+
+logger = structlog.get_logger(__name__)
+
+
+class DeltaIngressQueue:
+    """订单簿增量的 SPSC 环形队列
+
+    仅支持一个生产者线程与一个消费者线程。生产者先写数据列、再推进
+    `_tail`；消费者处理完成后才推进 `_head`。两个索引各自只有一个
+    写入者，CPython 下整数引用的赋值是原子的，因此无需加锁。
+
+    Example:
+        >>> queue = DeltaIngressQueue(capacity=1024)
+        >>> queue.put(np.array([0], dtype=np.int8), np.array([99.5]), np.array([5.0]), seq=2)
+        True
+        >>> queue.drain(book)
+        1
+        >>> queue.snapshot.seq
+        2
+    """
+
+    def __init__(self, capacity: int = 2**16) -> None:
+        """初始化入口队列
+
+        Args:
+            capacity: 可容纳的变更条数，必须为 2 的幂
+
+        Raises:
+            ConfigValidationError: capacity 不是正的 2 的幂
+        """
+        if capacity <= 0 or capacity & (capacity - 1):
+            raise ConfigValidationError(
+                f"capacity must be a positive power of two, got {capacity}"
+            )
+
+        self._capacity = capacity
+        self._mask = capacity - 1
+
+        # 按列存储的变更（与 apply_delta_raw 参数一致）
+        self._sides = np.zeros(capacity, dtype=np.int8)
+        self._prices = np.zeros(capacity, dtype=np.float64)
+        self._sizes = np.zeros(capacity, dtype=np.float64)
+        self._seqs = np.zeros(capacity, dtype=np.int64)
+
+        # 单调递增的读写位置，取模后才是数组下标
+        self._head = 0  # 仅消费者写
+        self._tail = 0  # 仅生产者写
+
+        self._dropped = 0
+        self._snapshot: OrderBookState | None = None
+
+    def put(
+        self,
+        sides: np.ndarray,
+        prices: np.ndarray,
+        sizes: np.ndarray,
+        seq: int,
+    ) -> bool:
+        """写入一条增量消息（仅限生产者线程）
+
+        Args:
+            sides: 方向编码数组（0=bid, 1=ask）
+            prices: 价格数组
+            sizes: 数量数组，0 表示删除该价位
+            seq: 序列号
+
+        Returns:
+            True 表示已入队；队列剩余空间不足时返回 False 并丢弃整条消息，
+            消费端随后会遇到序列号缺口，应重新拉取快照
+        """
+        n = len(sizes)
+        tail = self._tail
+
+        if tail + n - self._head > self._capacity:
+            self._dropped += 1
+            logger.warning("ingress_queue_full", seq=seq, changes_count=n)
+            return False
+
+        idx = np.arange(tail, tail + n) & self._mask
+        self._sides[idx] = sides
+        self._prices[idx] = prices
+        self._sizes[idx] = sizes
+        self._seqs[idx] = seq
+
+        # 数据写完后再发布写位置
+        self._tail = tail + n
+        return True
+
+    def drain(
+        self,
+        book: OrderBook,
+        ts: float | None = None,
+    ) -> int:
+        """取出全部已入队的变更并应用到订单簿（仅限消费者线程）
+
+        相同序列号的连续变更合并为一次 `apply_delta_raw` 调用。应用完成后
+        发布新的订单簿快照。
+
+        Args:
+            book: 目标订单簿
+            ts: 更新时间戳，None 表示读取系统时钟
+
+        Returns:
+            应用的变更条数
+
+        Raises:
+            SequenceError: 序列号不连续（出错的消息已出队）
+            OrderbookInconsistentError: 数据不一致
+        """
+        head = self._head
+        tail = self._tail
+        if tail == head:
+            return 0
+
+        idx = np.arange(head, tail) & self._mask
+        sides = self._sides[idx]
+        prices = self._prices[idx]
+        sizes = self._sizes[idx]
+        seqs = self._seqs[idx]
+
+        # 按序列号切分为连续的消息
+        bounds = np.flatnonzero(seqs[1:] != seqs[:-1]) + 1
+        starts = [0, *bounds.tolist()]
+        ends = [*bounds.tolist(), len(seqs)]
+
+        applied = 0
+        try:
+            for start, end in zip(starts, ends, strict=True):
+                applied = end
+                book.apply_delta_raw(
+                    sides[start:end],
+                    prices[start:end],
+                    sizes[start:end],
+                    int(seqs[start]),
+                    ts=ts,
+                )
+        finally:
+            self._head = head + applied
+            self._snapshot = book.get_state()
+
+        return applied
+
+    def run(
+        self,
+        book: OrderBook,
+        stop: threading.Event,
+        idle_sec: float = 0.001,
+    ) -> None:
+        """消费者主循环：持续取出变更直到 stop 被设置
+
+        序列号缺口或不一致会记录日志后继续消费，由上层负责重新拉取快照。
+
+        Args:
+            book: 目标订单簿
+            stop: 停止信号
+            idle_sec: 队列为空时的等待时间（秒）
+        """
+        while not stop.is_set():
+            try:
+                if self.drain(book) == 0:
+                    stop.wait(idle_sec)
+            except Exception as e:
+                logger.error("ingress_apply_failed", error=str(e))
+
+    @property
+    def snapshot(self) -> OrderBookState | None:
+        """最近一次消费后发布的订单簿快照（无锁读取）"""
+        return self._snapshot
+
+    @property
+    def capacity(self) -> int:
+        """可容纳的变更条数"""
+        return self._capacity
+
+    @property
+    def dropped(self) -> int:
+        """因队列已满被丢弃的消息数"""
+        return self._dropped
+
+    def __len__(self) -> int:
+        """待消费的变更条数"""
+        return self._tail - self._head
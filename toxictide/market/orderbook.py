@@ -9,21 +9,167 @@ L2 订单簿维护，支持：
 """
 
 import time
+from bisect import bisect_left, insort
 from collections import OrderedDict
-from typing import Literal
+from typing import Iterable, Literal, Protocol, overload
 
+import numpy as np
 import structlog
 
-from toxictide.exceptions import OrderbookInconsistentError, SequenceError
+from toxictide.exceptions import (
+    ConfigValidationError,
+    OrderbookInconsistentError,
+    SequenceError,
+)
 from toxictide.models import OrderBookLevel, OrderBookState
 
+try:
+    from sortedcontainers import SortedList
+
+    SORTEDCONTAINERS_AVAILABLE = True
+except ImportError:  # pragma: no cover - 取决于运行环境
+    SortedList = None
+    SORTEDCONTAINERS_AVAILABLE = False
+
 logger = structlog.get_logger(__name__)
 
 
+class _SortedLadder(Protocol):
+    """价格阶梯用到的 SortedList 接口"""
+
+    def __len__(self) -> int: ...
+
+    @overload
+    def __getitem__(self, index: int) -> int: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[int]: ...
+
+    def add(self, value: int) -> None: ...
+
+    def remove(self, value: int) -> None: ...
+
+    def clear(self) -> None: ...
+
+
+# 增量更新的方向编码（apply_delta_raw），其他取值的变更被忽略
+_DELTA_SIDE_CODE = {"bid": 0, "ask": 1}
+
+
+class _BookSide:
+    """单边盘口：价格 -> 数量映射 + 升序价格阶梯（均为定点整数）
+
+    价格阶梯增量维护，最优价与前 N 档直接从阶梯两端读取，无需每次排序。
+    买盘从尾部（高价）读取，卖盘从头部（低价）读取。
+
+    安装 sortedcontainers 时阶梯为 `SortedList`（插入/删除 O(log N)，
+    适合深盘口）；否则为 list + bisect（插入/删除需搬移元素，浅盘口下
+    同样很快）。两者的索引与切片接口一致。
+    """
+
+    __slots__ = ("_sizes", "_prices", "_descending")
+
+    def __init__(self, descending: bool) -> None:
+        """初始化单边盘口
+
+        Args:
+            descending: True 表示按价格降序读取（买盘）
+        """
+        self._sizes: dict[int, int] = {}  # price ticks -> size units
+        # 升序
+        self._prices: list[int] | _SortedLadder = (
+            [] if SortedList is None else SortedList()
+        )
+        self._descending = descending
+
+    def __len__(self) -> int:
+        return len(self._prices)
+
+    def __getitem__(self, price: int) -> int:
+        return self._sizes[price]
+
+    def load(self, levels: Iterable[tuple[int, int]]) -> None:
+        """整体替换为给定价位（快照）"""
+        self._sizes = dict(levels)
+        if SortedList is None:
+            self._prices = sorted(self._sizes)
+        else:
+            self._prices = SortedList(self._sizes)
+
+    def set(self, price: int, size: int) -> None:
+        """新增或更新价位"""
+        if price not in self._sizes:
+            if isinstance(self._prices, list):
+                insort(self._prices, price)
+            else:
+                self._prices.add(price)
+        self._sizes[price] = size
+
+    def remove(self, price: int) -> None:
+        """删除价位（不存在时忽略）"""
+        if self._sizes.pop(price, None) is not None:
+            if isinstance(self._prices, list):
+                del self._prices[bisect_left(self._prices, price)]
+            else:
+                self._prices.remove(price)
+
+    def apply(self, prices: list[int], sizes: list[int]) -> None:
+        """按顺序批量应用价位变更，数量为 0 表示删除
+
+        与逐条调用 `set` / `remove` 等价，但循环内只使用局部变量，
+        省去每条变更的方法调用与属性查找。
+        """
+        book = self._sizes
+        ladder = self._prices
+        for price, size in zip(prices, sizes, strict=True):
+            if size == 0:
+                if book.pop(price, None) is not None:
+                    if isinstance(ladder, list):
+                        del ladder[bisect_left(ladder, price)]
+                    else:
+                        ladder.remove(price)
+            else:
+                if price not in book:
+                    if isinstance(ladder, list):
+                        insort(ladder, price)
+                    else:
+                        ladder.add(price)
+                book[price] = size
+
+    def best(self) -> int | None:
+        """最优价，空盘口返回 None"""
+        if not self._prices:
+            return None
+        return self._prices[-1] if self._descending else self._prices[0]
+
+    def prices(self, n: int | None = None) -> list[int]:
+        """按盘口顺序（由优到劣）返回前 n 档价格，None 表示全部"""
+        prices = self._prices
+        if n is not None and n < len(prices):
+            if n <= 0:
+                return []
+            return prices[:-n - 1:-1] if self._descending else prices[:n]
+        return prices[::-1] if self._descending else prices[:]
+
+    def clear(self) -> None:
+        self._sizes.clear()
+        self._prices.clear()
+
+
 class OrderBook:
     """L2 订单簿维护
 
-    维护买卖盘口数据，支持快照和增量更新。
+    维护买卖盘口数据，支持快照和增量更新。每一侧由 `_BookSide` 维护
+    有序价格阶梯，最优价为 O(1)，增量更新为二分定位。
+
+    内部价格以 tick 数、数量以 1/size_scale 为单位的整数存储（定点数），
+    价位比较与排序均为整数运算；仅在对外接口处换算回浮点数。
+    tick_size 必须与交易品种的实际最小价格变动一致：不在 tick 网格上的
+    价格会被拒绝（抛出 OrderbookInconsistentError），而不是取整后存储。
+
+    最优价、中间价与价差在每次快照/增量更新后计算一次并缓存，
+    读取时直接返回缓存值。整侧的价格/数量数组及其累计和在首次使用时
+    构建，仅在该侧变更后失效；深度查询为累计和上的 O(1) 取值或二分查找。
 
     Example:
         >>> book = OrderBook()
@@ -35,41 +181,179 @@ class OrderBook:
         100.5
     """
 
-    def __init__(self) -> None:
-        """初始化订单簿"""
-        self._bids: dict[float, float] = {}  # price -> size
-        self._asks: dict[float, float] = {}  # price -> size
+    def __init__(
+        self,
+        tick_size: float = 0.01,
+        size_scale: int = 100_000_000,
+    ) -> None:
+        """初始化订单簿
+
+        Args:
+            tick_size: 交易品种的最小价格变动（价格必须是它的整数倍）
+            size_scale: 数量定点倍数（默认 1e8，即精确到 1e-8）
+
+        Raises:
+            ConfigValidationError: tick_size 或 size_scale 非正
+        """
+        if tick_size <= 0 or size_scale <= 0:
+            raise ConfigValidationError(
+                f"Invalid orderbook precision: tick_size={tick_size}, "
+                f"size_scale={size_scale}"
+            )
+
+        self._tick_size = tick_size
+        # 0.01、0.00001 等 tick 的倒数应为整数，消除 1 / tick_size 的舍入误差，
+        # 使 ticks / tpu 换算回的价格与原始报价逐位一致
+        tpu = 1.0 / tick_size
+        if abs(tpu - round(tpu)) < 1e-9 * tpu:
+            tpu = float(round(tpu))
+        self._ticks_per_unit = tpu
+        self._size_scale = int(size_scale)
+
+        self._bids = _BookSide(descending=True)
+        self._asks = _BookSide(descending=False)
         self._seq: int = 0
         self._last_update_ts: float = 0.0
         self._update_count: int = 0
 
+        # 盘口顶部缓存（见 _update_top）
+        self._best_bid: int | None = None  # ticks
+        self._best_ask: int | None = None  # ticks
+        self._best_bid_px: float | None = None
+        self._best_ask_px: float | None = None
+        self._mid: float = 0.0
+        self._spread: float = 0.0
+        self._spread_bps: float = 0.0
+
+        # 整侧价格/数量数组及累计和缓存（见 _side_arrays / _side_cums），
+        # 按侧失效（见 _invalidate）
+        self._arrays: dict[str, tuple[np.ndarray, np.ndarray]] = {}
+        self._cums: dict[str, tuple[np.ndarray, np.ndarray]] = {}
+
+    def _invalidate(self, *sides: str) -> None:
+        """使指定侧的数组缓存失效"""
+        for side in sides:
+            self._arrays.pop(side, None)
+            self._cums.pop(side, None)
+
+    def _update_top(self) -> None:
+        """根据价格阶梯两端刷新盘口顶部缓存（每次变更后调用一次）"""
+        tpu = self._ticks_per_unit
+        best_bid = self._best_bid = self._bids.best()
+        best_ask = self._best_ask = self._asks.best()
+
+        self._best_bid_px = None if best_bid is None else best_bid / tpu
+        self._best_ask_px = None if best_ask is None else best_ask / tpu
+
+        if best_bid is None or best_ask is None:
+            self._mid = self._spread = self._spread_bps = 0.0
+            return
+
+        self._mid = (best_bid + best_ask) / (2 * tpu)
+        self._spread = (best_ask - best_bid) / tpu
+        total = best_bid + best_ask
+        self._spread_bps = (best_ask - best_bid) * 20000 / total if total else 0.0
+
+    def _to_ticks_array(self, prices: np.ndarray) -> list[int]:
+        """价格数组 -> tick 数列表
+
+        只容忍浮点表示误差；偏离 tick 网格的价格直接拒绝，避免不同价位
+        被合并到同一 tick（深度、中间价失真，甚至误判为交叉盘口）。
+
+        Raises:
+            OrderbookInconsistentError: 存在不在 tick 网格上的价格
+        """
+        scaled = np.asarray(prices, dtype=np.float64) * self._ticks_per_unit
+        ticks = np.rint(scaled)
+        off_grid = np.abs(scaled - ticks) > 1e-6 + 1e-12 * np.abs(scaled)
+        if off_grid.any():
+            price = float(np.asarray(prices, dtype=np.float64)[off_grid][0])
+            raise OrderbookInconsistentError(
+                f"Price {price} is not a multiple of tick_size={self._tick_size}"
+            )
+        tick_list: list[int] = ticks.astype(np.int64).tolist()
+        return tick_list
+
+    def _to_units_array(self, sizes: np.ndarray) -> list[int]:
+        """数量数组 -> 定点整数列表"""
+        sizes = np.asarray(sizes, dtype=np.float64)
+        units: list[int] = np.rint(sizes * self._size_scale).astype(np.int64).tolist()
+        return units
+
     def apply_snapshot(
         self,
         bids: list[OrderBookLevel],
         asks: list[OrderBookLevel],
         seq: int,
+        ts: float | None = None,
     ) -> None:
         """应用完整快照
 
+        价位列表拆成按列数组后交给 `apply_snapshot_raw`。
+
         Args:
             bids: 买盘列表
             asks: 卖盘列表
             seq: 序列号
+            ts: 更新时间戳，None 表示读取系统时钟
 
         Raises:
             OrderbookInconsistentError: 数据不一致
         """
-        self._bids.clear()
-        self._asks.clear()
+        n_bids, n_asks = len(bids), len(asks)
+        self.apply_snapshot_raw(
+            np.fromiter(
+                (level.price for level in bids), dtype=np.float64, count=n_bids
+            ),
+            np.fromiter(
+                (level.size for level in bids), dtype=np.float64, count=n_bids
+            ),
+            np.fromiter(
+                (level.price for level in asks), dtype=np.float64, count=n_asks
+            ),
+            np.fromiter(
+                (level.size for level in asks), dtype=np.float64, count=n_asks
+            ),
+            seq,
+            ts,
+        )
 
-        for level in bids:
-            self._bids[level.price] = level.size
+    def apply_snapshot_raw(
+        self,
+        bid_prices: np.ndarray,
+        bid_sizes: np.ndarray,
+        ask_prices: np.ndarray,
+        ask_sizes: np.ndarray,
+        seq: int,
+        ts: float | None = None,
+    ) -> None:
+        """以按列数组应用完整快照（不构建 OrderBookLevel）
+
+        价格与数量整列换算为定点整数，适合直接持有数组的数据源
+        （如 `OrderBookState.bid_px` / `bid_sz`）。
+
+        Args:
+            bid_prices: 买盘价格
+            bid_sizes: 买盘数量
+            ask_prices: 卖盘价格
+            ask_sizes: 卖盘数量
+            seq: 序列号
+            ts: 更新时间戳，None 表示读取系统时钟（调用方已持有本 tick
+                的时间戳时传入，可省去重复读时钟）
 
-        for level in asks:
-            self._asks[level.price] = level.size
+        Raises:
+            OrderbookInconsistentError: 数据不一致或价格不在 tick 网格上
+        """
+        # 先整体换算（可能因价格不在网格上而报错），再替换盘口
+        bid_ticks = self._to_ticks_array(bid_prices)
+        ask_ticks = self._to_ticks_array(ask_prices)
+        self._bids.load(zip(bid_ticks, self._to_units_array(bid_sizes), strict=True))
+        self._asks.load(zip(ask_ticks, self._to_units_array(ask_sizes), strict=True))
+        self._invalidate("bid", "ask")
+        self._update_top()
 
         self._seq = seq
-        self._last_update_ts = time.time()
+        self._last_update_ts = time.time() if ts is None else ts
         self._update_count += 1
 
         if not self.is_consistent():
@@ -81,8 +365,8 @@ class OrderBook:
         logger.debug(
             "snapshot_applied",
             seq=seq,
-            bids_count=len(bids),
-            asks_count=len(asks),
+            bids_count=len(self._bids),
+            asks_count=len(self._asks),
             mid=self.mid,
         )
 
@@ -90,6 +374,7 @@ class OrderBook:
         self,
         changes: list[dict],
         seq: int,
+        ts: float | None = None,
     ) -> None:
         """应用增量更新
 
@@ -97,35 +382,77 @@ class OrderBook:
             changes: 变更列表，每个变更包含 {side, price, size}
                      size=0 表示删除该价位
             seq: 序列号
+            ts: 更新时间戳，None 表示读取系统时钟
 
         Raises:
             SequenceError: 序列号不连续
             OrderbookInconsistentError: 数据不一致
         """
+        n = len(changes)
+        self.apply_delta_raw(
+            np.fromiter(
+                (_DELTA_SIDE_CODE.get(c["side"], -1) for c in changes),
+                dtype=np.int8,
+                count=n,
+            ),
+            np.fromiter((c["price"] for c in changes), dtype=np.float64, count=n),
+            np.fromiter((c["size"] for c in changes), dtype=np.float64, count=n),
+            seq,
+            ts,
+        )
+
+    def apply_delta_raw(
+        self,
+        sides: np.ndarray,
+        prices: np.ndarray,
+        sizes: np.ndarray,
+        seq: int,
+        ts: float | None = None,
+    ) -> None:
+        """以按列数组应用增量更新
+
+        价格与数量整列换算为定点整数后按顺序应用，省去逐条变更的
+        字典取值与类型转换。
+
+        Args:
+            sides: 方向编码数组（0=bid, 1=ask，其他取值忽略）
+            prices: 价格数组
+            sizes: 数量数组，0 表示删除该价位
+            seq: 序列号
+            ts: 更新时间戳，None 表示读取系统时钟
+
+        Raises:
+            SequenceError: 序列号不连续
+            OrderbookInconsistentError: 数据不一致或价格不在 tick 网格上
+        """
         # 检查序列号连续性
         if seq != self._seq + 1:
             raise SequenceError(
                 f"Sequence gap: expected {self._seq + 1}, got {seq}"
             )
 
-        for change in changes:
-            side = change["side"]
-            price = float(change["price"])
-            size = float(change["size"])
-
-            if side == "bid":
-                if size == 0:
-                    self._bids.pop(price, None)
-                else:
-                    self._bids[price] = size
-            elif side == "ask":
-                if size == 0:
-                    self._asks.pop(price, None)
-                else:
-                    self._asks[price] = size
+        # 按方向拆分后整侧批量应用；两侧互不影响，各侧内部保持原顺序。
+        # 两侧先全部换算完成再修改盘口，价格不在网格上时盘口保持不变
+        sides = np.asarray(sides)
+        prices = np.asarray(prices, dtype=np.float64)
+        sizes = np.asarray(sizes, dtype=np.float64)
+        updates = []
+        for code, side, book in ((0, "bid", self._bids), (1, "ask", self._asks)):
+            mask = sides == code
+            if mask.any():
+                updates.append((
+                    side,
+                    book,
+                    self._to_ticks_array(prices[mask]),
+                    self._to_units_array(sizes[mask]),
+                ))
+        for side, book, side_ticks, side_units in updates:
+            book.apply(side_ticks, side_units)
+            self._invalidate(side)
+        self._update_top()
 
         self._seq = seq
-        self._last_update_ts = time.time()
+        self._last_update_ts = time.time() if ts is None else ts
         self._update_count += 1
 
         if not self.is_consistent():
@@ -136,7 +463,7 @@ class OrderBook:
         logger.debug(
             "delta_applied",
             seq=seq,
-            changes_count=len(changes),
+            changes_count=len(sizes),
         )
 
     def is_consistent(self) -> bool:
@@ -145,17 +472,17 @@ class OrderBook:
         Returns:
             True 如果数据一致（spread >= 0）
         """
-        if not self._bids or not self._asks:
-            return True  # 空盘口视为一致
+        best_bid = self._best_bid
+        best_ask = self._best_ask
 
-        best_bid = max(self._bids.keys())
-        best_ask = min(self._asks.keys())
+        if best_bid is None or best_ask is None:
+            return True  # 空盘口视为一致
 
         if best_ask <= best_bid:
             logger.warning(
                 "negative_spread_detected",
-                best_bid=best_bid,
-                best_ask=best_ask,
+                best_bid=best_bid / self._ticks_per_unit,
+                best_ask=best_ask / self._ticks_per_unit,
             )
             return False
 
@@ -167,23 +494,86 @@ class OrderBook:
         Returns:
             OrderBookState 对象
         """
-        # 按价格排序构建列表
-        bids = [
-            OrderBookLevel(price=p, size=s)
-            for p, s in sorted(self._bids.items(), reverse=True)
-        ]
-        asks = [
-            OrderBookLevel(price=p, size=s)
-            for p, s in sorted(self._asks.items())
-        ]
+        bid_px, bid_sz = self._side_arrays("bid")
+        ask_px, ask_sz = self._side_arrays("ask")
 
-        return OrderBookState(
+        return OrderBookState.from_arrays(
             ts=self._last_update_ts,
-            bids=bids,
-            asks=asks,
+            bid_px=bid_px,
+            bid_sz=bid_sz,
+            ask_px=ask_px,
+            ask_sz=ask_sz,
             seq=self._seq,
         )
 
+    def _side_arrays(self, side: Literal["bid", "ask"]) -> tuple[np.ndarray, np.ndarray]:
+        """单侧全部价位的 (价格, 数量) 浮点数组，按盘口顺序排列
+
+        首次调用时由有序价格阶梯整列换算得到并缓存，直到下一次变更；
+        返回的数组为只读。
+        """
+        arrays = self._arrays.get(side)
+        if arrays is None:
+            book = self._bids if side == "bid" else self._asks
+            prices = book.prices()
+            n = len(prices)
+
+            px = np.fromiter(prices, dtype=np.float64, count=n) / self._ticks_per_unit
+            sz = np.fromiter(
+                (book[p] for p in prices), dtype=np.float64, count=n
+            ) / self._size_scale
+            px.flags.writeable = False
+            sz.flags.writeable = False
+
+            arrays = self._arrays[side] = (px, sz)
+        return arrays
+
+    def _side_cums(self, side: Literal["bid", "ask"]) -> tuple[np.ndarray, np.ndarray]:
+        """单侧按盘口顺序的 (累计 USD, 累计数量) 数组，缓存至该侧下一次变更"""
+        cums = self._cums.get(side)
+        if cums is None:
+            px, sz = self._side_arrays(side)
+            cums = self._cums[side] = (np.cumsum(px * sz), np.cumsum(sz))
+        return cums
+
+    def copy_top_levels(
+        self,
+        bid_px: np.ndarray,
+        bid_sz: np.ndarray,
+        ask_px: np.ndarray,
+        ask_sz: np.ndarray,
+    ) -> tuple[int, int]:
+        """将前 K 档盘口写入调用方提供的数组（K 为数组长度）
+
+        不构建 OrderBookState，适合每 tick 复用同一组缓冲区的调用方。
+
+        Args:
+            bid_px: 买盘价格输出数组（降序写入）
+            bid_sz: 买盘数量输出数组
+            ask_px: 卖盘价格输出数组（升序写入）
+            ask_sz: 卖盘数量输出数组
+
+        Returns:
+            (n_bids, n_asks) 实际写入的档数
+        """
+        bid_prices = self._bids.prices(bid_px.shape[0])
+        ask_prices = self._asks.prices(ask_px.shape[0])
+        n_bids, n_asks = len(bid_prices), len(ask_prices)
+
+        tpu, scale = self._ticks_per_unit, self._size_scale
+
+        bid_px[:n_bids] = bid_prices
+        bid_px[:n_bids] /= tpu
+        bid_sz[:n_bids] = [self._bids[p] for p in bid_prices]
+        bid_sz[:n_bids] /= scale
+
+        ask_px[:n_asks] = ask_prices
+        ask_px[:n_asks] /= tpu
+        ask_sz[:n_asks] = [self._asks[p] for p in ask_prices]
+        ask_sz[:n_asks] /= scale
+
+        return n_bids, n_asks
+
     def top_n(self, n: int) -> tuple[list[OrderBookLevel], list[OrderBookLevel]]:
         """获取前 N 档盘口
 
@@ -193,8 +583,15 @@ class OrderBook:
         Returns:
             (bids, asks) 元组
         """
-        state = self.get_state()
-        return state.bids[:n], state.asks[:n]
+        return self._levels(self._bids, n), self._levels(self._asks, n)
+
+    def _levels(self, book: _BookSide, n: int | None = None) -> list[OrderBookLevel]:
+        """将单边前 n 档换算为 OrderBookLevel 列表"""
+        tpu, scale = self._ticks_per_unit, self._size_scale
+        return [
+            OrderBookLevel(price=p / tpu, size=book[p] / scale)
+            for p in book.prices(n)
+        ]
 
     def depth_usd(
         self,
@@ -210,12 +607,9 @@ class OrderBook:
         Returns:
             USD 深度总量
         """
-        if side == "bid":
-            prices = sorted(self._bids.keys(), reverse=True)[:levels]
-            return sum(p * self._bids[p] for p in prices)
-        else:
-            prices = sorted(self._asks.keys())[:levels]
-            return sum(p * self._asks[p] for p in prices)
+        cum_usd, _ = self._side_cums(side)
+        n = min(levels, cum_usd.shape[0])
+        return float(cum_usd[n - 1]) if n > 0 else 0.0
 
     def depth_to_price(
         self,
@@ -232,70 +626,70 @@ class OrderBook:
             (avg_price, remaining_usd) 元组
             如果流动性不足，remaining_usd > 0
         """
-        if side == "ask":
-            prices = sorted(self._asks.keys())
-            book = self._asks
-        else:
-            prices = sorted(self._bids.keys(), reverse=True)
-            book = self._bids
-
-        remaining_usd = target_usd
-        total_cost = 0.0
-        total_size = 0.0
-
-        for price in prices:
-            if remaining_usd <= 0:
-                break
-
-            size = book[price]
-            level_usd = price * size
-
-            if level_usd >= remaining_usd:
-                # 部分消耗这一档
-                consumed_size = remaining_usd / price
-                total_cost += remaining_usd
-                total_size += consumed_size
-                remaining_usd = 0
-            else:
-                # 完全消耗这一档
-                total_cost += level_usd
-                total_size += size
-                remaining_usd -= level_usd
+        side = "ask" if side == "ask" else "bid"
+        px, _ = self._side_arrays(side)
+
+        if target_usd <= 0 or px.shape[0] == 0:
+            return 0.0, target_usd
+
+        cum_usd, cum_size = self._side_cums(side)
+
+        # 第一个累计金额达到目标的档位：前 idx 档完全消耗，第 idx 档部分消耗
+        idx = int(np.searchsorted(cum_usd, target_usd, side="left"))
+
+        if idx == px.shape[0]:
+            # 流动性不足：全部档位消耗完仍有剩余
+            total_cost = float(cum_usd[-1])
+            return total_cost / float(cum_size[-1]), target_usd - total_cost
 
-        avg_price = total_cost / total_size if total_size > 0 else 0.0
-        return avg_price, remaining_usd
+        filled_usd = float(cum_usd[idx - 1]) if idx > 0 else 0.0
+        filled_size = float(cum_size[idx - 1]) if idx > 0 else 0.0
+        total_size = filled_size + (target_usd - filled_usd) / float(px[idx])
+
+        return target_usd / total_size, 0.0
+
+    def _best_bid_ticks(self) -> int | None:
+        """最优买价（tick 数）"""
+        return self._best_bid
+
+    def _best_ask_ticks(self) -> int | None:
+        """最优卖价（tick 数）"""
+        return self._best_ask
 
     @property
     def best_bid_price(self) -> float | None:
         """最优买价"""
-        return max(self._bids.keys()) if self._bids else None
+        return self._best_bid_px
 
     @property
     def best_ask_price(self) -> float | None:
         """最优卖价"""
-        return min(self._asks.keys()) if self._asks else None
+        return self._best_ask_px
 
     @property
     def mid(self) -> float:
         """中间价"""
-        if not self._bids or not self._asks:
-            return 0.0
-        return (self.best_bid_price + self.best_ask_price) / 2
+        return self._mid
 
     @property
     def spread(self) -> float:
         """买卖价差"""
-        if not self._bids or not self._asks:
-            return 0.0
-        return self.best_ask_price - self.best_bid_price
+        return self._spread
 
     @property
     def spread_bps(self) -> float:
         """买卖价差（基点）"""
-        mid = self.mid
-        if mid == 0:
-            return 0.0
-        return (self.spread / mid) * 10000
+        return self._spread_bps
+
+    @property
+    def tick_size(self) -> float:
+        """最小价格变动"""
+        return self._tick_size
+
+    @property
+    def size_scale(self) -> int:
+        """数量定点倍数"""
+        return self._size_scale
 
     @property
     def seq(self) -> int:
@@ -326,5 +720,7 @@ class OrderBook:
         """清空订单簿"""
         self._bids.clear()
         self._asks.clear()
+        self._invalidate("bid", "ask")
+        self._update_top()
         self._seq = 0
         self._last_update_ts = 0.0
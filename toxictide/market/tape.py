@@ -8,16 +8,25 @@ TOXICTIDE Trade Tape
 """
 
 import time
-from collections import deque
 from dataclasses import dataclass
-from typing import Iterator
+from typing import Iterator, cast
 
+import numpy as np
 import structlog
 
 from toxictide.models import Trade
 
 logger = structlog.get_logger(__name__)
 
+# 成交方向 -> 分组编码（聚合时按编码分组求和）
+_SIDE_CODE = {"sell": 0, "buy": 1, "unknown": 2}
+
+# 无法识别的方向按 unknown 处理（跳过校验构造的 Trade 可能带有其他取值）
+_UNKNOWN_CODE = _SIDE_CODE["unknown"]
+
+# 方向编码 -> 带符号成交量的符号（unknown 平分到买卖，净贡献为 0）
+_CODE_SIGN = np.array([-1.0, 1.0, 0.0])
+
 
 @dataclass
 class TradeAggregation:
@@ -38,6 +47,18 @@ class TradeTape:
 
     维护最近一段时间的交易记录，提供聚合统计。
 
+    交易按列存储在预分配的 NumPy 数组中（float64 的 ts / price / size 与
+    int8 方向编码），有效数据位于 [head, tail) 区间；过期数据只推进 head，
+    head 超过容量一半时整体前移压缩，容量不足时翻倍扩容。窗口聚合直接在
+    数组上完成。
+
+    另维护成交量与带符号成交量的前缀和列，毒性分数、成交速率等
+    只需二分定位窗口起点，再做两次前缀和相减，无需扫描窗口。
+
+    过期清理与前缀和都依赖 ts 列有序。写入早于已有最新成交的交易时
+    （如实盘每个 tick 重新拉取最近成交），会按时间戳把它们归并到正确
+    位置（相同时间戳保持写入顺序），并重算受影响区间的前缀和。
+
     Example:
         >>> tape = TradeTape(window_sec=300)
         >>> tape.add(Trade(ts=time.time(), price=100.0, size=1.0, side="buy"))
@@ -46,106 +67,276 @@ class TradeTape:
         1.0
     """
 
-    def __init__(self, window_sec: int = 300) -> None:
+    def __init__(self, window_sec: int = 300, capacity: int = 1024) -> None:
         """初始化 Trade Tape
 
         Args:
             window_sec: 窗口大小（秒）
+            capacity: 初始缓冲区容量（笔），不足时自动扩容
         """
         self._window_sec = window_sec
-        self._trades: deque[Trade] = deque()
         self._total_trades: int = 0
 
-    def add(self, trade: Trade) -> None:
+        capacity = max(int(capacity), 16)
+        self._ts = np.empty(capacity, dtype=np.float64)
+        self._px = np.empty(capacity, dtype=np.float64)
+        self._sz = np.empty(capacity, dtype=np.float64)
+        self._side = np.empty(capacity, dtype=np.int8)
+        # 前缀和：_cum_vol[i] = sum(_sz[:i + 1])，_cum_signed 同理（买正卖负）
+        self._cum_vol = np.empty(capacity, dtype=np.float64)
+        self._cum_signed = np.empty(capacity, dtype=np.float64)
+        self._objs: list[Trade | None] = [None] * capacity
+        self._head = 0
+        self._tail = 0
+
+    def _compact(self, extra: int = 0) -> None:
+        """将有效数据前移到缓冲区头部，必要时翻倍扩容
+
+        Args:
+            extra: 压缩后尾部至少需要的空位数
+        """
+        capacity = self._ts.shape[0]
+        head, tail = self._head, self._tail
+        live = tail - head
+
+        new_capacity = capacity
+        while live + extra > new_capacity:
+            new_capacity *= 2
+
+        # 前缀和以新的头部为基准重新计算起点
+        if head > 0 and live > 0:
+            self._cum_vol[head:tail] -= self._cum_vol[head - 1]
+            self._cum_signed[head:tail] -= self._cum_signed[head - 1]
+
+        for name in ("_ts", "_px", "_sz", "_side", "_cum_vol", "_cum_signed"):
+            old = getattr(self, name)
+            if new_capacity == capacity:
+                old[:live] = old[head:tail]
+            else:
+                new = np.empty(new_capacity, dtype=old.dtype)
+                new[:live] = old[head:tail]
+                setattr(self, name, new)
+
+        self._objs = self._objs[head:tail] + [None] * (new_capacity - live)
+        self._head = 0
+        self._tail = live
+
+    def add(self, trade: Trade, now: float | None = None) -> None:
         """添加交易
 
         Args:
             trade: Trade 对象
+            now: 当前时间戳，None 表示读取系统时钟
         """
-        self._trades.append(trade)
+        if self._tail == self._ts.shape[0]:
+            self._compact(1)
+
+        i = self._tail
+        code = _SIDE_CODE.get(trade.side, _UNKNOWN_CODE)
+        self._ts[i] = trade.ts
+        self._px[i] = trade.price
+        self._sz[i] = trade.size
+        self._side[i] = code
+        self._objs[i] = trade
+
+        if i > 0:
+            self._cum_vol[i] = self._cum_vol[i - 1] + trade.size
+            self._cum_signed[i] = self._cum_signed[i - 1] + trade.size * _CODE_SIGN[code]
+        else:
+            self._cum_vol[i] = trade.size
+            self._cum_signed[i] = trade.size * _CODE_SIGN[code]
+        self._tail = i + 1
+
+        if i > self._head and trade.ts < self._ts[i - 1]:
+            self._restore_order(i)
+
         self._total_trades += 1
-        self._cleanup()
+        self._cleanup(now)
 
-    def add_batch(self, trades: list[Trade]) -> None:
+    def add_batch(self, trades: list[Trade], now: float | None = None) -> None:
         """批量添加交易
 
         Args:
             trades: Trade 列表
+            now: 当前时间戳，None 表示读取系统时钟
         """
-        for trade in trades:
-            self._trades.append(trade)
-            self._total_trades += 1
-        self._cleanup()
+        n = len(trades)
+
+        if n > 0:
+            if self._tail + n > self._ts.shape[0]:
+                self._compact(n)
+
+            # 每个字段用 np.fromiter 直接生成定长列，不经过中间的元组列表
+            start, end = self._tail, self._tail + n
+            side_code = _SIDE_CODE.get
+            self._ts[start:end] = np.fromiter((t.ts for t in trades), np.float64, n)
+            self._px[start:end] = np.fromiter((t.price for t in trades), np.float64, n)
+            self._sz[start:end] = np.fromiter((t.size for t in trades), np.float64, n)
+            self._side[start:end] = np.fromiter(
+                (side_code(t.side, _UNKNOWN_CODE) for t in trades), np.int8, n
+            )
+
+            sizes = self._sz[start:end]
+            signed = sizes * _CODE_SIGN[self._side[start:end]]
+            self._cum_vol[start:end] = np.cumsum(sizes)
+            self._cum_signed[start:end] = np.cumsum(signed)
+            if start > 0:
+                self._cum_vol[start:end] += self._cum_vol[start - 1]
+                self._cum_signed[start:end] += self._cum_signed[start - 1]
+            self._objs[start:end] = trades
+            self._tail = end
+            self._total_trades += n
+
+            seg = self._ts[max(start - 1, self._head):end]
+            if seg.shape[0] > 1 and (seg[1:] < seg[:-1]).any():
+                self._restore_order(start)
+
+        self._cleanup(now)
+
+    def _restore_order(self, start: int) -> None:
+        """将 [start, tail) 新写入的交易按时间戳归并到有序位置
+
+        只重排从新交易最早时间戳开始的区间（稳定排序，相同时间戳保持
+        写入顺序），并从该区间起点重算前缀和。
+
+        Args:
+            start: 本次写入的第一个位置
+        """
+        head, tail = self._head, self._tail
+        ts = self._ts
+
+        # 早于新交易最小时间戳的已有交易位置不变
+        lo = head + int(
+            np.searchsorted(ts[head:start], ts[start:tail].min(), side="right")
+        )
+        order = np.argsort(ts[lo:tail], kind="stable")
+
+        for name in ("_ts", "_px", "_sz", "_side"):
+            col = getattr(self, name)
+            col[lo:tail] = col[lo:tail][order]
+        objs = self._objs[lo:tail]
+        self._objs[lo:tail] = [objs[i] for i in order.tolist()]
+
+        sizes = self._sz[lo:tail]
+        self._cum_vol[lo:tail] = np.cumsum(sizes)
+        self._cum_signed[lo:tail] = np.cumsum(sizes * _CODE_SIGN[self._side[lo:tail]])
+        if lo > 0:
+            self._cum_vol[lo:tail] += self._cum_vol[lo - 1]
+            self._cum_signed[lo:tail] += self._cum_signed[lo - 1]
 
     def _cleanup(self, current_ts: float | None = None) -> None:
-        """清理过期数据"""
+        """清理过期数据
+
+        ts 列有序（见 `_restore_order`），过期边界由二分查找确定，
+        只推进 head，不搬移数据。
+        """
         if current_ts is None:
             current_ts = time.time()
 
         cutoff_ts = current_ts - self._window_sec
 
-        while self._trades and self._trades[0].ts < cutoff_ts:
-            self._trades.popleft()
+        head, tail = self._head, self._tail
+        ts = self._ts
+        if head == tail or ts[head] >= cutoff_ts:
+            return
+
+        new_head = head + int(np.searchsorted(ts[head:tail], cutoff_ts, side="left"))
+        self._objs[head:new_head] = [None] * (new_head - head)
+        head = new_head
+
+        if head == tail:
+            self._head = self._tail = 0
+        else:
+            self._head = head
+            if head > ts.shape[0] // 2:
+                self._compact()
+
+    def _window(
+        self,
+        sec: int | None,
+        now: float | None = None,
+    ) -> slice | np.ndarray:
+        """最近 N 秒交易在缓冲区中的位置（切片或下标数组）
+
+        清理与窗口截断共用同一个时间戳，每次查询只读一次时钟。
+        """
+        if now is None:
+            now = time.time()
 
-    def recent(self, sec: int | None = None) -> list[Trade]:
+        self._cleanup(now)
+
+        live = slice(self._head, self._tail)
+        if sec is None:
+            return live
+
+        cutoff_ts = now - sec
+        mask = self._ts[live] >= cutoff_ts
+        if mask.all():
+            return live
+        return np.flatnonzero(mask) + self._head
+
+    def recent(
+        self,
+        sec: int | None = None,
+        now: float | None = None,
+    ) -> list[Trade]:
         """获取最近 N 秒的交易
 
         Args:
             sec: 秒数，None 表示全部窗口
+            now: 当前时间戳，None 表示读取系统时钟
 
         Returns:
             Trade 列表
         """
-        self._cleanup()
+        idx = self._window(sec, now)
 
-        if sec is None:
-            return list(self._trades)
+        # [head, tail) 内的槽位均已填充，窗口索引不会落到 None 上
+        objs = cast(list[Trade], self._objs)
 
-        cutoff_ts = time.time() - sec
-        return [t for t in self._trades if t.ts >= cutoff_ts]
+        if isinstance(idx, slice):
+            return objs[idx]
 
-    def aggregate(self, sec: int | None = None) -> TradeAggregation:
+        return [objs[i] for i in idx.tolist()]
+
+    def aggregate(
+        self,
+        sec: int | None = None,
+        now: float | None = None,
+    ) -> TradeAggregation:
         """聚合统计
 
         Args:
             sec: 统计的秒数，None 表示全部窗口
+            now: 当前时间戳，None 表示读取系统时钟（调用方已持有本 tick
+                的时间戳时传入，可省去重复读时钟）
 
         Returns:
             TradeAggregation 对象
         """
-        trades = self.recent(sec)
+        idx = self._window(sec, now)
+
+        sizes = self._sz[idx]
+        trades_count = int(sizes.shape[0])
 
-        if not trades:
+        if trades_count == 0:
             return TradeAggregation()
 
-        # 基础统计
-        buy_vol = 0.0
-        sell_vol = 0.0
-        total_notional = 0.0
-        trade_sizes = []
-
-        for t in trades:
-            size = t.size
-            notional = t.price * t.size
-            trade_sizes.append(size)
-            total_notional += notional
-
-            if t.side == "buy":
-                buy_vol += size
-            elif t.side == "sell":
-                sell_vol += size
-            else:  # unknown
-                # 平分到 buy/sell
-                buy_vol += size / 2
-                sell_vol += size / 2
+        # 基础统计：按方向分组一次求和 -> [sell, buy, unknown]
+        sell_sum, buy_sum, unknown_sum = np.bincount(
+            self._side[idx], weights=sizes, minlength=3
+        ).tolist()
 
+        # unknown 平分到 buy/sell
+        buy_vol = buy_sum + unknown_sum / 2
+        sell_vol = sell_sum + unknown_sum / 2
         total_vol = buy_vol + sell_vol
-        trades_count = len(trades)
+        total_notional = float(np.dot(self._px[idx], sizes))
 
         # 计算指标
-        avg_trade = total_vol / trades_count if trades_count > 0 else 0.0
-        max_trade = max(trade_sizes) if trade_sizes else 0.0
-        min_trade = min(trade_sizes) if trade_sizes else 0.0
+        avg_trade = total_vol / trades_count
+        max_trade = float(sizes.max())
+        min_trade = float(sizes.min())
         vwap = total_notional / total_vol if total_vol > 0 else 0.0
 
         # 带符号不平衡
@@ -163,54 +354,100 @@ class TradeTape:
             signed_imbalance=signed_imb,
         )
 
-    def get_toxic_score(self, sec: int | None = None) -> float:
+    def _window_sums(
+        self,
+        sec: int | None,
+        now: float | None = None,
+    ) -> tuple[int, float, float]:
+        """最近 N 秒的 (成交笔数, 成交量, 带符号成交量)
+
+        按 ts 有序二分定位窗口起点，成交量由前缀和相减得到，O(log N)。
+        写入时已维持 ts 有序（见 `_restore_order`），结果与 `aggregate()`
+        对同一窗口的统计一致。
+        """
+        if now is None:
+            now = time.time()
+
+        self._cleanup(now)
+
+        head, tail = self._head, self._tail
+        if sec is None:
+            start = head
+        else:
+            start = head + int(
+                np.searchsorted(self._ts[head:tail], now - sec, side="left")
+            )
+
+        count = tail - start
+        if count == 0:
+            return 0, 0.0, 0.0
+
+        last = tail - 1
+        vol = float(self._cum_vol[last])
+        signed = float(self._cum_signed[last])
+        if start > 0:
+            vol -= float(self._cum_vol[start - 1])
+            signed -= float(self._cum_signed[start - 1])
+
+        return count, vol, signed
+
+    def get_toxic_score(
+        self,
+        sec: int | None = None,
+        now: float | None = None,
+    ) -> float:
         """计算毒性流分数（简化 VPIN）
 
         基于买卖不平衡的绝对值，范围 [0, 1]
 
         Args:
             sec: 统计的秒数
+            now: 当前时间戳，None 表示读取系统时钟
 
         Returns:
             毒性分数
         """
-        agg = self.aggregate(sec)
-        return abs(agg.signed_imbalance)
+        count, vol, signed = self._window_sums(sec, now)
+        if count == 0:
+            return 0.0
+        return abs(signed / (vol + 1e-9))
 
-    def get_trade_rate(self, sec: int = 60) -> float:
+    def get_trade_rate(self, sec: int = 60, now: float | None = None) -> float:
         """获取交易速率（笔/秒）
 
         Args:
             sec: 统计的秒数
+            now: 当前时间戳，None 表示读取系统时钟
 
         Returns:
             每秒交易笔数
         """
-        trades = self.recent(sec)
-        if not trades:
+        count, _, _ = self._window_sums(sec, now)
+        if count == 0:
             return 0.0
-        return len(trades) / sec
+        return count / sec
 
-    def get_volume_rate(self, sec: int = 60) -> float:
+    def get_volume_rate(self, sec: int = 60, now: float | None = None) -> float:
         """获取成交量速率（数量/秒）
 
         Args:
             sec: 统计的秒数
+            now: 当前时间戳，None 表示读取系统时钟
 
         Returns:
             每秒成交量
         """
-        agg = self.aggregate(sec)
-        return agg.vol / sec if sec > 0 else 0.0
+        _, vol, _ = self._window_sums(sec, now)
+        return vol / sec if sec > 0 else 0.0
 
     def __iter__(self) -> Iterator[Trade]:
         """迭代所有交易"""
-        return iter(self._trades)
+        return iter(cast(list[Trade], self._objs[self._head:self._tail]))
 
     def __len__(self) -> int:
         """当前窗口内的交易数量"""
         self._cleanup()
-        return len(self._trades)
+        return self._tail - self._head
 
     @property
     def window_sec(self) -> int:
@@ -226,8 +463,10 @@ class TradeTape:
     def is_empty(self) -> bool:
         """是否为空"""
         self._cleanup()
-        return len(self._trades) == 0
+        return self._tail == self._head
 
     def clear(self) -> None:
         """清空所有交易"""
-        self._trades.clear()
+        self._objs[self._head:self._tail] = [None] * (self._tail - self._head)
+        self._head = 0
+        self._tail = 0
@@ -8,15 +8,43 @@ TOXICTIDE 数据模型
 """
 
 from datetime import datetime
+from functools import lru_cache
 from typing import Any, Literal, Optional
 
-from pydantic import BaseModel, Field, field_validator, model_validator
+import numpy as np
+from pydantic import BaseModel, Field, PrivateAttr, field_validator, model_validator
 
 
 # ============================================================================
 # 市场数据模型
 # ============================================================================
 
+class _LevelArrays:
+    """单侧价位的数组视图缓存
+
+    记录生成数组时所用的价位列表，列表被替换（如 `model_copy(update=...)`）
+    后视为失效。缓存完全由字段派生，因此任意两个实例比较时都视为相等，
+    不影响模型的 `==`。
+    """
+
+    __slots__ = ("levels", "px", "sz")
+
+    def __init__(
+        self,
+        levels: Optional[list["OrderBookLevel"]] = None,
+        px: Optional[np.ndarray] = None,
+        sz: Optional[np.ndarray] = None,
+    ) -> None:
+        self.levels = levels
+        self.px: np.ndarray = px if px is not None else np.empty(0, dtype=np.float64)
+        self.sz: np.ndarray = sz if sz is not None else np.empty(0, dtype=np.float64)
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, _LevelArrays)
+
+    __hash__ = None  # type: ignore[assignment]
+
+
 class OrderBookLevel(BaseModel):
     """订单簿单个价位
 
@@ -33,6 +61,9 @@ class OrderBookLevel(BaseModel):
 class OrderBookState(BaseModel):
     """订单簿状态快照
 
+    除 `bids`/`asks` 价位列表外，还提供按列存储（SoA）的 float64 数组视图
+    `bid_px`/`bid_sz`/`ask_px`/`ask_sz`，供向量化计算使用。
+
     Attributes:
         ts: 时间戳
         bids: 买盘（必须价格降序）
@@ -44,6 +75,9 @@ class OrderBookState(BaseModel):
     asks: list[OrderBookLevel] = Field(description="卖盘列表（价格升序）")
     seq: int = Field(ge=0, description="序列号")
 
+    _bid_arrays: _LevelArrays = PrivateAttr(default_factory=_LevelArrays)
+    _ask_arrays: _LevelArrays = PrivateAttr(default_factory=_LevelArrays)
+
     @field_validator("bids")
     @classmethod
     def bids_must_be_descending(cls, v: list[OrderBookLevel]) -> list[OrderBookLevel]:
@@ -78,6 +112,117 @@ class OrderBookState(BaseModel):
                 )
         return self
 
+    @classmethod
+    def from_arrays(
+        cls,
+        ts: float,
+        bid_px: np.ndarray,
+        bid_sz: np.ndarray,
+        ask_px: np.ndarray,
+        ask_sz: np.ndarray,
+        seq: int,
+    ) -> "OrderBookState":
+        """从按列存储的数组构建快照
+
+        以向量化方式完成与字段校验器相同的检查，然后跳过逐档的 Pydantic
+        校验直接构建；传入的数组按引用保存为数组视图。
+
+        Args:
+            ts: 时间戳
+            bid_px: 买盘价格（降序）
+            bid_sz: 买盘数量
+            ask_px: 卖盘价格（升序）
+            ask_sz: 卖盘数量
+            seq: 序列号
+
+        Returns:
+            OrderBookState 对象
+
+        Raises:
+            ValueError: 数据不满足快照约束
+        """
+        bid_px = np.asarray(bid_px, dtype=np.float64)
+        bid_sz = np.asarray(bid_sz, dtype=np.float64)
+        ask_px = np.asarray(ask_px, dtype=np.float64)
+        ask_sz = np.asarray(ask_sz, dtype=np.float64)
+
+        if bid_px.shape != bid_sz.shape or ask_px.shape != ask_sz.shape:
+            raise ValueError("Price and size arrays must have the same length")
+        if seq < 0:
+            raise ValueError(f"Sequence must be >= 0, got {seq}")
+        if (bid_px <= 0).any() or (ask_px <= 0).any():
+            raise ValueError("Prices must be positive")
+        if (bid_sz <= 0).any() or (ask_sz <= 0).any():
+            raise ValueError("Sizes must be positive")
+        if (np.diff(bid_px) > 0).any():
+            raise ValueError("Bids must be in descending price order")
+        if (np.diff(ask_px) < 0).any():
+            raise ValueError("Asks must be in ascending price order")
+        if bid_px.size and ask_px.size and ask_px[0] <= bid_px[0]:
+            raise ValueError(
+                f"Negative spread: best_ask ({ask_px[0]}) <= best_bid ({bid_px[0]})"
+            )
+
+        bids = [
+            OrderBookLevel.model_construct(price=p, size=s)
+            for p, s in zip(bid_px.tolist(), bid_sz.tolist(), strict=True)
+        ]
+        asks = [
+            OrderBookLevel.model_construct(price=p, size=s)
+            for p, s in zip(ask_px.tolist(), ask_sz.tolist(), strict=True)
+        ]
+
+        state = cls.model_construct(ts=ts, bids=bids, asks=asks, seq=seq)
+
+        # 预置数组视图缓存
+        state._bid_arrays = _LevelArrays(bids, bid_px, bid_sz)
+        state._ask_arrays = _LevelArrays(asks, ask_px, ask_sz)
+
+        return state
+
+    @staticmethod
+    def _side_arrays(cache: _LevelArrays, levels: list[OrderBookLevel]) -> _LevelArrays:
+        """返回与 `levels` 对应的数组缓存，失效时重新生成"""
+        if cache.levels is levels:
+            return cache
+        n = len(levels)
+        return _LevelArrays(
+            levels,
+            np.fromiter((level.price for level in levels), dtype=np.float64, count=n),
+            np.fromiter((level.size for level in levels), dtype=np.float64, count=n),
+        )
+
+    def _bids_view(self) -> _LevelArrays:
+        cache = self._side_arrays(self._bid_arrays, self.bids)
+        # 整体替换而非原地修改：浅拷贝出的实例共享同一缓存对象
+        self._bid_arrays = cache
+        return cache
+
+    def _asks_view(self) -> _LevelArrays:
+        cache = self._side_arrays(self._ask_arrays, self.asks)
+        self._ask_arrays = cache
+        return cache
+
+    @property
+    def bid_px(self) -> np.ndarray:
+        """买盘价格数组（降序）"""
+        return self._bids_view().px
+
+    @property
+    def bid_sz(self) -> np.ndarray:
+        """买盘数量数组"""
+        return self._bids_view().sz
+
+    @property
+    def ask_px(self) -> np.ndarray:
+        """卖盘价格数组（升序）"""
+        return self._asks_view().px
+
+    @property
+    def ask_sz(self) -> np.ndarray:
+        """卖盘数量数组"""
+        return self._asks_view().sz
+
     @property
     def mid(self) -> float:
         """中间价"""
@@ -154,6 +299,65 @@ class FeatureVector(BaseModel):
 
     model_config = {"frozen": True}
 
+    def replace(self, **changes: Any) -> "FeatureVector":
+        """返回替换部分字段后的新特征向量
+
+        基于 `model_copy(update=...)`，只复制字段字典，不经过
+        model_dump + 重新校验的往返；新值不做校验，调用方需保证其合法。
+
+        Args:
+            **changes: 需要替换的字段
+
+        Returns:
+            新的 FeatureVector
+
+        Example:
+            >>> fv2 = fv.replace(impact_buy_bps=25.0)
+        """
+        return self.model_copy(update=changes)
+
+    @classmethod
+    def default_template(cls) -> "FeatureVector":
+        """全 0 的特征向量模板（进程内只构建一次）
+
+        需要大部分字段为默认值的调用方可在模板上 `replace` 少数字段，
+        省去逐字段构建与校验。
+
+        Returns:
+            共享的 FeatureVector 实例（不可变）
+
+        Example:
+            >>> fv = FeatureVector.default_template().replace(ts=ts, mid=2000.0)
+        """
+        return _feature_template()
+
+
+@lru_cache(maxsize=1)
+def _feature_template() -> FeatureVector:
+    """构建 FeatureVector.default_template 的共享实例"""
+    return FeatureVector(
+        ts=0.0,
+        mid=0.0,
+        spread=0.0,
+        spread_bps=0.0,
+        top_bid_sz=0.0,
+        top_ask_sz=0.0,
+        depth_bid_k=0.0,
+        depth_ask_k=0.0,
+        imb_k=0.0,
+        micro_minus_mid=0.0,
+        impact_buy_bps=0.0,
+        impact_sell_bps=0.0,
+        msg_rate=0.0,
+        churn=0.0,
+        vol=0.0,
+        trades=0,
+        avg_trade=0.0,
+        max_trade=0.0,
+        signed_imb=0.0,
+        toxic=0.0,
+    )
+
 
 # ============================================================================
 # 异常检测模型
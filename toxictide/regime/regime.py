@@ -4,7 +4,6 @@ TOXICTIDE Regime Classifier
 市场状态分类器 - 三维状态识别
 """
 
-from collections import deque
 from typing import Literal
 
 import numpy as np
@@ -16,9 +15,70 @@ from toxictide.models import (
     RegimeState,
     VolumeAnomalyReport,
 )
+from toxictide.utils.jit import njit
+from toxictide.utils.rolling import RingBuffer
 
 logger = structlog.get_logger(__name__)
 
+# 价格趋势编码 -> 名称（与 _price_stats_nb 的返回编码一致）
+_PRICE_REGIMES: tuple[Literal["TREND_UP", "TREND_DOWN", "RANGE"], ...] = (
+    "RANGE",
+    "TREND_UP",
+    "TREND_DOWN",
+)
+
+# 年化系数（假设每个点是 1 秒）
+_ANNUALIZE = float(np.sqrt(252 * 24 * 3600))
+
+
+@njit(cache=True)
+def _price_stats_nb(prices: np.ndarray) -> tuple[int, float]:
+    """价格趋势与收益率波动的数值内核
+
+    Args:
+        prices: 按时间排序的价格序列（至少 2 个点）
+
+    Returns:
+        (趋势编码, 收益率标准差)；编码 0=RANGE, 1=TREND_UP, 2=TREND_DOWN
+    """
+    n = prices.shape[0]
+
+    # 短期均线（最近 10 个点）与长期均线（最近 30 个点）
+    n_short = min(10, n)
+    n_long = min(30, n)
+
+    sum_short = 0.0
+    sum_long = 0.0
+    for i in range(n - n_long, n):
+        sum_long += prices[i]
+        if i >= n - n_short:
+            sum_short += prices[i]
+
+    ma_short = sum_short / n_short
+    ma_long = sum_long / n_long
+
+    # 趋势判定（0.2% 阈值）
+    if ma_short > ma_long * 1.002:
+        code = 1
+    elif ma_short < ma_long * 0.998:
+        code = 2
+    else:
+        code = 0
+
+    # 收益率标准差（两遍法，ddof=0）
+    m = n - 1
+    mean = 0.0
+    for i in range(1, n):
+        mean += (prices[i] - prices[i - 1]) / prices[i - 1]
+    mean /= m
+
+    var = 0.0
+    for i in range(1, n):
+        d = (prices[i] - prices[i - 1]) / prices[i - 1] - mean
+        var += d * d
+
+    return code, np.sqrt(var / m)
+
 
 class RegimeClassifier:
     """市场状态分类器
@@ -56,8 +116,8 @@ class RegimeClassifier:
         """
         self._config = config
         
-        # 价格历史（用于趋势判断）
-        self._price_history: deque[tuple[float, float]] = deque(maxlen=100)  # (ts, price)
+        # 价格历史（用于趋势判断），定长环形缓冲区
+        self._price_history = RingBuffer(100)
         
         logger.info("regime_classifier_initialized")
     
@@ -80,15 +140,11 @@ class RegimeClassifier:
         ts = fv.ts
         
         # 记录价格历史
-        self._price_history.append((ts, fv.mid))
+        self._price_history.append(fv.mid)
         
-        # ========== Price Regime ==========
+        # ========== Price / Vol Regime ==========
         
-        price_regime = self._classify_price_regime()
-        
-        # ========== Vol Regime ==========
-        
-        vol_regime = self._classify_vol_regime()
+        price_regime, vol_regime = self._classify_price_vol_regime()
         
         # ========== Flow Regime ==========
         
@@ -112,55 +168,38 @@ class RegimeClassifier:
             confidence=confidence,
         )
     
-    def _classify_price_regime(self) -> Literal["TREND_UP", "TREND_DOWN", "RANGE"]:
-        """分类价格趋势
-        
-        Returns:
-            价格状态
-        """
-        if len(self._price_history) < 20:
-            return "RANGE"
-        
-        prices = np.array([p for _, p in self._price_history])
-        
-        # 短期均线（最近 10 个点）
-        ma_short = np.mean(prices[-10:])
+    def _classify_price_vol_regime(
+        self,
+    ) -> tuple[
+        Literal["TREND_UP", "TREND_DOWN", "RANGE"],
+        Literal["HIGHVOL", "NORMALVOL", "LOWVOL"],
+    ]:
+        """分类价格趋势与波动率状态
         
-        # 长期均线（最近 30 个点）
-        ma_long = np.mean(prices[-30:]) if len(prices) >= 30 else np.mean(prices)
-        
-        # 趋势判定（0.2% 阈值）
-        if ma_short > ma_long * 1.002:
-            return "TREND_UP"
-        elif ma_short < ma_long * 0.998:
-            return "TREND_DOWN"
-        else:
-            return "RANGE"
-    
-    def _classify_vol_regime(self) -> Literal["HIGHVOL", "NORMALVOL", "LOWVOL"]:
-        """分类波动率状态
+        价格趋势：短期均线（10 点）相对长期均线（30 点）偏离超过 0.2%。
+        波动率：收益率标准差年化后与 20% / 50% 比较。
+        两者由同一个数值内核一次遍历价格历史得到。
         
         Returns:
-            波动率状态
+            (价格状态, 波动率状态)
         """
         if len(self._price_history) < 20:
-            return "NORMALVOL"
-        
-        prices = np.array([p for _, p in self._price_history])
+            return "RANGE", "NORMALVOL"
         
-        # 计算收益率
-        returns = np.diff(prices) / prices[:-1]
+        code, returns_std = _price_stats_nb(self._price_history.values())
         
-        # 年化波动率（假设每个点是 1 秒）
-        realized_vol = np.std(returns) * np.sqrt(252 * 24 * 3600)
+        # 年化波动率
+        realized_vol = returns_std * _ANNUALIZE
         
-        # 分类
+        vol_regime: Literal["HIGHVOL", "NORMALVOL", "LOWVOL"]
         if realized_vol > 0.5:
-            return "HIGHVOL"
+            vol_regime = "HIGHVOL"
         elif realized_vol < 0.2:
-            return "LOWVOL"
+            vol_regime = "LOWVOL"
         else:
-            return "NORMALVOL"
+            vol_regime = "NORMALVOL"
+        
+        return _PRICE_REGIMES[code], vol_regime
     
     def _classify_flow_regime(
         self,
@@ -4,6 +4,8 @@ TOXICTIDE Risk Decision Reason Codes
 统一的风控拒绝原因编码系统
 """
 
+from typing import Callable
+
 # ========== 数据质量异常 ==========
 
 DATA_INCONSISTENT = "DATA_INCONSISTENT"
@@ -67,6 +69,74 @@ NO_SIGNAL = "NO_SIGNAL"
 """无交易信号"""
 
 
+def _num0(facts: dict, key: str) -> str:
+    """取数字字段并格式化为 .0f（缺失或非数字时为 "0"）"""
+    val = facts.get(key, 0)
+    return f"{val:.0f}" if isinstance(val, (int, float)) else "0"
+
+
+def _num1(facts: dict, key: str) -> str:
+    """取数字字段并格式化为 .1f（缺失或非数字时为 "0"）"""
+    val = facts.get(key, 0)
+    return f"{val:.1f}" if isinstance(val, (int, float)) else "0"
+
+
+def _num2(facts: dict, key: str) -> str:
+    """取数字字段并格式化为 .2f（缺失或非数字时为 "0"）"""
+    val = facts.get(key, 0)
+    return f"{val:.2f}" if isinstance(val, (int, float)) else "0"
+
+
+# 原因编码 -> 格式化函数（模块导入时构建，格式说明符在编译期固定）
+_REASON_FORMATTERS: dict[str, Callable[[dict], str]] = {
+    DATA_INCONSISTENT: lambda f: "市场数据不一致（spread < 0 或排序错误）",
+    DATA_STALE: lambda f: f"数据过期（超过 {_num1(f, 'stale_sec')} 秒未更新）",
+    CONNECTION_LOST: lambda f: "连接断开，暂停新开仓",
+    DAILY_LOSS_EXCEEDED: lambda f: (
+        f"日亏超限（当前 {_num2(f, 'daily_pnl_pct')}% "
+        f"< 阈值 -{_num2(f, 'max_daily_loss_pct')}%）"
+    ),
+    COOLDOWN_ACTIVE: lambda f: (
+        f"冷却期激活（剩余 {_num0(f, 'cooldown_remaining_sec')} 秒）"
+    ),
+    POSITION_LIMIT_EXCEEDED: lambda f: (
+        f"仓位超限（当前 ${_num0(f, 'position_notional')} "
+        f"> 上限 ${_num0(f, 'max_position_notional')}）"
+    ),
+    LEVERAGE_LIMIT_EXCEEDED: lambda f: (
+        f"杠杆超限（当前 {_num1(f, 'leverage')}x > 上限 {_num1(f, 'max_leverage')}x）"
+    ),
+    IMPACT_HARD_CAP_EXCEEDED: lambda f: (
+        f"冲击成本过高（{_num2(f, 'impact_bps')} bps "
+        f"> 硬上限 {_num2(f, 'hard_cap_bps')} bps）"
+    ),
+    IMPACT_ENTRY_CAP_EXCEEDED: lambda f: (
+        f"冲击成本偏高（{_num2(f, 'impact_bps')} bps "
+        f"> 入场上限 {_num2(f, 'entry_cap_bps')} bps），已减仓"
+    ),
+    TOXIC_DANGER_LEVEL: lambda f: (
+        f"毒性流过高（toxic={_num2(f, 'toxic')} >= {_num2(f, 'toxic_danger')}）"
+    ),
+    TOXIC_WARN_LEVEL: lambda f: (
+        f"毒性流偏高（toxic={_num2(f, 'toxic')} >= {_num2(f, 'toxic_warn')}），已减仓"
+    ),
+    MARKET_STRESS_DANGER: lambda f: "市场压力指数 DANGER，暂停新开仓",
+    TRADE_FREQUENCY_EXCEEDED: lambda f: (
+        f"交易频率超限（{_num0(f, 'trades_last_hour')} "
+        f"> {_num0(f, 'max_trades_per_hour')}）"
+    ),
+    RISK_POSITION_SIZE_REDUCED: lambda f: (
+        f"基于市场条件，仓位已从 ${_num2(f, 'original_size')} "
+        f"降至 ${_num2(f, 'reduced_size')}"
+    ),
+    RISK_LEVERAGE_REDUCED: lambda f: (
+        f"基于风险评估，杠杆已从 {_num1(f, 'original_leverage')}x "
+        f"降至 {_num1(f, 'reduced_leverage')}x"
+    ),
+    NO_SIGNAL: lambda f: "无交易信号",
+}
+
+
 def format_reason(code: str, facts: dict) -> str:
     """格式化原因说明
     
@@ -75,7 +145,7 @@ def format_reason(code: str, facts: dict) -> str:
         facts: 事实数据字典
     
     Returns:
-        人类可读的解释文本
+        人类可读的解释文本，未知编码原样返回
     
     Example:
         >>> facts = {"daily_pnl_pct": -1.5, "max_daily_loss_pct": 1.0}
@@ -83,81 +153,8 @@ def format_reason(code: str, facts: dict) -> str:
         >>> print(text)
         日亏超限（当前 -1.50% < 阈值 -1.00%）
     """
-    # 安全地获取数值，避免格式化错误
-    def safe_format(key, default=0, fmt='.2f'):
-        """安全格式化 - 确保总是返回数字"""
-        try:
-            val = facts.get(key, default)
-            if isinstance(val, (int, float)):
-                return format(val, fmt)
-            return str(default)
-        except:
-            return str(default)
-
-    messages = {
-        DATA_INCONSISTENT: "市场数据不一致（spread < 0 或排序错误）",
-
-        DATA_STALE: f"数据过期（超过 {safe_format('stale_sec', 0, '.1f')} 秒未更新）",
-
-        CONNECTION_LOST: "连接断开，暂停新开仓",
-
-        DAILY_LOSS_EXCEEDED: (
-            f"日亏超限（当前 {safe_format('daily_pnl_pct', 0, '.2f')}% "
-            f"< 阈值 -{safe_format('max_daily_loss_pct', 0, '.2f')}%）"
-        ),
-
-        COOLDOWN_ACTIVE: (
-            f"冷却期激活（剩余 {safe_format('cooldown_remaining_sec', 0, '.0f')} 秒）"
-        ),
-
-        POSITION_LIMIT_EXCEEDED: (
-            f"仓位超限（当前 ${safe_format('position_notional', 0, '.0f')} "
-            f"> 上限 ${safe_format('max_position_notional', 0, '.0f')}）"
-        ),
-
-        LEVERAGE_LIMIT_EXCEEDED: (
-            f"杠杆超限（当前 {safe_format('leverage', 0, '.1f')}x "
-            f"> 上限 {safe_format('max_leverage', 0, '.1f')}x）"
-        ),
-
-        IMPACT_HARD_CAP_EXCEEDED: (
-            f"冲击成本过高（{safe_format('impact_bps', 0, '.2f')} bps "
-            f"> 硬上限 {safe_format('hard_cap_bps', 0, '.2f')} bps）"
-        ),
-
-        IMPACT_ENTRY_CAP_EXCEEDED: (
-            f"冲击成本偏高（{safe_format('impact_bps', 0, '.2f')} bps "
-            f"> 入场上限 {safe_format('entry_cap_bps', 0, '.2f')} bps），已减仓"
-        ),
-
-        TOXIC_DANGER_LEVEL: (
-            f"毒性流过高（toxic={safe_format('toxic', 0, '.2f')} "
-            f">= {safe_format('toxic_danger', 0, '.2f')}）"
-        ),
-
-        TOXIC_WARN_LEVEL: (
-            f"毒性流偏高（toxic={safe_format('toxic', 0, '.2f')} "
-            f">= {safe_format('toxic_warn', 0, '.2f')}），已减仓"
-        ),
-
-        MARKET_STRESS_DANGER: "市场压力指数 DANGER，暂停新开仓",
-
-        TRADE_FREQUENCY_EXCEEDED: (
-            f"交易频率超限（{safe_format('trades_last_hour', 0, '.0f')} "
-            f"> {safe_format('max_trades_per_hour', 0, '.0f')}）"
-        ),
-
-        RISK_POSITION_SIZE_REDUCED: (
-            f"基于市场条件，仓位已从 ${safe_format('original_size', 0, '.2f')} "
-            f"降至 ${safe_format('reduced_size', 0, '.2f')}"
-        ),
-
-        RISK_LEVERAGE_REDUCED: (
-            f"基于风险评估，杠杆已从 {safe_format('original_leverage', 0, '.1f')}x "
-            f"降至 {safe_format('reduced_leverage', 0, '.1f')}x"
-        ),
-
-        NO_SIGNAL: "无交易信号",
-    }
-    
-    return messages.get(code, code)
+    formatter = _REASON_FORMATTERS.get(code)
+    if formatter is None:
+        return code
+
+    return formatter(facts)
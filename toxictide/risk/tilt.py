@@ -4,10 +4,10 @@ TOXICTIDE Tilt Tracker
 交易频率和盈亏跟踪 - 用于检测过度交易和日亏熔断
 """
 
-from collections import deque
 from datetime import datetime
 from typing import Optional
 
+import numpy as np
 import structlog
 
 logger = structlog.get_logger(__name__)
@@ -24,6 +24,9 @@ class TiltTracker:
     
     每日零点自动重置日盈亏统计。
     
+    交易历史按时间戳有序存储在两列 NumPy 数组中（容量不足时翻倍），
+    最近 1 小时笔数由二分查找得到。
+    
     Example:
         >>> tracker = TiltTracker()
         >>> tracker.record_trade(time.time(), pnl=-50.0)
@@ -31,9 +34,16 @@ class TiltTracker:
         >>> daily_pnl_pct = tracker.daily_pnl_pct(balance=10000.0)
     """
 
-    def __init__(self) -> None:
-        """初始化 Tilt Tracker"""
-        self._trades: deque[tuple[float, float]] = deque()  # (ts, pnl)
+    def __init__(self, capacity: int = 256) -> None:
+        """初始化 Tilt Tracker
+        
+        Args:
+            capacity: 交易历史初始容量（笔），不足时自动扩容
+        """
+        capacity = max(int(capacity), 16)
+        self._ts = np.empty(capacity, dtype=np.float64)  # 升序
+        self._pnl = np.empty(capacity, dtype=np.float64)
+        self._n = 0
         self._daily_pnl: float = 0.0
         self._last_reset_date: Optional[str] = None
         
@@ -54,8 +64,22 @@ class TiltTracker:
             self._last_reset_date = current_date
             logger.info("daily_pnl_reset", date=current_date)
         
-        # 记录交易
-        self._trades.append((ts, pnl))
+        # 记录交易（按时间戳有序插入，顺序到达时即为追加）
+        n = self._n
+        if n == self._ts.shape[0]:
+            self._ts = np.concatenate([self._ts, np.empty_like(self._ts)])
+            self._pnl = np.concatenate([self._pnl, np.empty_like(self._pnl)])
+        
+        if n == 0 or ts >= self._ts[n - 1]:
+            pos = n
+        else:
+            pos = int(np.searchsorted(self._ts[:n], ts, side="right"))
+            self._ts[pos + 1:n + 1] = self._ts[pos:n]
+            self._pnl[pos + 1:n + 1] = self._pnl[pos:n]
+        
+        self._ts[pos] = ts
+        self._pnl[pos] = pnl
+        self._n = n + 1
         self._daily_pnl += pnl
         
         logger.debug(
@@ -75,8 +99,8 @@ class TiltTracker:
             交易笔数
         """
         cutoff = ts - 3600  # 1 小时前
-        count = sum(1 for t, _ in self._trades if t >= cutoff)
-        return count
+        n = self._n
+        return n - int(np.searchsorted(self._ts[:n], cutoff, side="left"))
     
     def daily_pnl_pct(self, balance: float) -> float:
         """计算日盈亏百分比
@@ -100,11 +124,11 @@ class TiltTracker:
     @property
     def total_trades(self) -> int:
         """历史总交易笔数"""
-        return len(self._trades)
+        return self._n
     
     def reset(self) -> None:
         """重置所有统计"""
-        self._trades.clear()
+        self._n = 0
         self._daily_pnl = 0.0
         self._last_reset_date = None
         logger.info("tilt_tracker_reset")
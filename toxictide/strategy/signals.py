@@ -15,9 +15,37 @@ from toxictide.models import (
     RegimeState,
     TradeCandidate,
 )
+from toxictide.utils.jit import njit
+from toxictide.utils.rolling import RingBuffer
 
 logger = structlog.get_logger(__name__)
 
+# 趋势突破的高低点窗口（点数）
+_BREAKOUT_WINDOW = 20
+
+# 均值回归的均值/标准差窗口（点数）
+_REVERT_WINDOW = 30
+
+
+@njit(cache=True)
+def _mean_std_nb(prices: np.ndarray) -> tuple[float, float]:
+    """单遍计算均值与总体标准差（Welford 算法，ddof=0）
+
+    Args:
+        prices: 价格窗口（至少 1 个点）
+
+    Returns:
+        (均值, 标准差)
+    """
+    mean = 0.0
+    m2 = 0.0
+    for i in range(prices.shape[0]):
+        delta = prices[i] - mean
+        mean += delta / (i + 1)
+        m2 += delta * (prices[i] - mean)
+
+    return mean, np.sqrt(m2 / prices.shape[0])
+
 
 class SignalEngine:
     """策略信号生成引擎
@@ -61,8 +89,13 @@ class SignalEngine:
         """
         self._config = config
         
-        # 价格历史（用于策略计算）
-        self._price_history: deque[tuple[float, float]] = deque(maxlen=100)
+        # 价格历史（用于策略计算），定长环形缓冲区
+        self._price_history = RingBuffer(100)
+        
+        # 近期高低点：单调队列 (序号, 价格)，队首即窗口内最大/最小值
+        self._tick = 0
+        self._max_queue: deque[tuple[int, float]] = deque()
+        self._min_queue: deque[tuple[int, float]] = deque()
         
         logger.info("signal_engine_initialized")
     
@@ -85,7 +118,7 @@ class SignalEngine:
         ts = fv.ts
         
         # 记录价格历史
-        self._price_history.append((ts, fv.mid))
+        self._push_price(fv.mid)
         
         # ========== 风控前置检查 ==========
         
@@ -123,6 +156,31 @@ class SignalEngine:
         # 无信号
         return None
     
+    def _push_price(self, price: float) -> None:
+        """记录价格并增量维护近期高低点
+        
+        单调队列保证每个价格最多入队、出队各一次，均摊 O(1)。
+        """
+        self._price_history.append(price)
+        
+        tick = self._tick
+        self._tick = tick + 1
+        expired = tick - _BREAKOUT_WINDOW
+        
+        max_queue = self._max_queue
+        while max_queue and max_queue[-1][1] <= price:
+            max_queue.pop()
+        max_queue.append((tick, price))
+        if max_queue[0][0] <= expired:
+            max_queue.popleft()
+        
+        min_queue = self._min_queue
+        while min_queue and min_queue[-1][1] >= price:
+            min_queue.pop()
+        min_queue.append((tick, price))
+        if min_queue[0][0] <= expired:
+            min_queue.popleft()
+    
     def _trend_breakout(
         self,
         fv: FeatureVector,
@@ -144,10 +202,9 @@ class SignalEngine:
         if regime.flow_regime != "ACTIVE":
             return None
         
-        # 计算近期高低点
-        prices = np.array([p for _, p in self._price_history])
-        recent_high = np.max(prices[-20:])
-        recent_low = np.min(prices[-20:])
+        # 近期高低点（单调队列队首）
+        recent_high = self._max_queue[0][1]
+        recent_low = self._min_queue[0][1]
         
         current_price = fv.mid
         
@@ -224,10 +281,8 @@ class SignalEngine:
         if regime.flow_regime != "CALM":
             return None
         
-        # 计算均值和标准差
-        prices = np.array([p for _, p in self._price_history])
-        mean_price = np.mean(prices[-30:])
-        std_price = np.std(prices[-30:])
+        # 计算均值和标准差（环形缓冲区的连续视图上单遍完成）
+        mean_price, std_price = _mean_std_nb(self._price_history.values(_REVERT_WINDOW))
         
         current_price = fv.mid
         
@@ -288,4 +343,7 @@ class SignalEngine:
     def reset(self) -> None:
         """重置信号引擎状态"""
         self._price_history.clear()
+        self._tick = 0
+        self._max_queue.clear()
+        self._min_queue.clear()
         logger.info("signal_engine_reset")
@@ -83,6 +83,26 @@ class TestExplain:
         assert "$1000.00" in explanation
         assert "5.00 bps" in explanation
 
+    def test_build_explanation_repeated_decision(self):
+        """测试相同决策重复解释结果一致，且不可哈希的 facts 也能处理"""
+        def make(facts):
+            return RiskDecision(
+                ts=time.time(),
+                action="DENY",
+                size_usd=0.0,
+                max_slippage_bps=0.0,
+                reasons=[DAILY_LOSS_EXCEEDED],
+                facts=facts,
+            )
+
+        facts = {"daily_pnl_pct": -1.5, "max_daily_loss_pct": 1.0}
+        first = build_explanation(make(facts))
+        assert build_explanation(make(dict(facts))) == first
+
+        # 值为列表（不可哈希）时绕过缓存
+        unhashable = {**facts, "history": [1.0, 2.0]}
+        assert build_explanation(make(unhashable)) == first
+
     def test_build_summary(self):
         """测试会话摘要"""
         summary = build_summary(
@@ -10,7 +10,7 @@ from toxictide.features.feature_engine import FeatureEngine
 from toxictide.market.collector import PaperMarketCollector
 from toxictide.market.orderbook import OrderBook
 from toxictide.market.tape import TradeTape
-from toxictide.models import Trade
+from toxictide.models import FeatureVector, Trade
 
 
 class TestFeatureEngine:
@@ -149,7 +149,7 @@ class TestFeatureEngine:
         trades = self.collector.get_recent_trades(count=5)
         self.tape.add_batch(trades)
         
-        fv1 = self.engine.compute(self.book, self.tape, time.time())
+        self.engine.compute(self.book, self.tape, time.time())
         
         # 第二次计算（盘口应该有变化）
         snapshot2 = self.collector.get_orderbook_snapshot()
@@ -229,3 +229,36 @@ class TestFeatureEngine:
         
         # Toxic 应该接近 1（极端不平衡）
         assert fv.toxic > 0.8
+
+    def test_depth_k_config(self):
+        """测试 depth_k 限定深度档数"""
+        engine = FeatureEngine({
+            "features": {
+                "impact_size_quote_usd": 1000,
+                "depth_k": 5,
+            }
+        })
+
+        snapshot = self.collector.get_orderbook_snapshot()
+        self.book.apply_snapshot(snapshot.bids, snapshot.asks, snapshot.seq)
+
+        fv = engine.compute(self.book, self.tape, time.time())
+
+        expected_bid = sum(level.price * level.size for level in snapshot.bids[:5])
+        expected_ask = sum(level.price * level.size for level in snapshot.asks[:5])
+        assert fv.depth_bid_k == pytest.approx(expected_bid)
+        assert fv.depth_ask_k == pytest.approx(expected_ask)
+
+    def test_feature_vector_passes_validation(self):
+        """测试免校验构建的特征向量满足模型约束"""
+        snapshot = self.collector.get_orderbook_snapshot()
+        self.book.apply_snapshot(snapshot.bids, snapshot.asks, snapshot.seq)
+        self.tape.add_batch(self.collector.get_recent_trades(count=20))
+
+        fv = self.engine.compute(self.book, self.tape, time.time())
+
+        validated = FeatureVector.model_validate(fv.model_dump())
+        assert validated == fv
+        assert all(
+            type(v) in (float, int) for v in fv.model_dump().values()
+        )
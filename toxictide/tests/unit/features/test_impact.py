@@ -2,12 +2,14 @@
 TOXICTIDE Price Impact 测试
 """
 
+import numpy as np
 import pytest
 
 from toxictide.features.impact import (
     estimate_impact_bps,
     estimate_market_depth_usd,
     estimate_slippage_bps,
+    estimate_slippage_bps_batch,
 )
 from toxictide.models import OrderBookLevel
 
@@ -79,6 +81,20 @@ class TestEstimateImpact:
         # 平均价格应该 > 100 且 < 102
         assert impact > 50  # 至少 50 bps
 
+    def test_vwap_across_levels(self):
+        """测试跨档平均成交价（VWAP）"""
+        asks = [
+            OrderBookLevel(price=100.0, size=5.0),   # 500 USD
+            OrderBookLevel(price=101.0, size=5.0),   # 505 USD
+        ]
+
+        # 买入 1000 USD：第一档 5 个，第二档 500/101 个
+        impact = estimate_impact_bps(asks, "buy", 1000.0, 100.0)
+
+        avg_price = 1000.0 / (5.0 + 500.0 / 101.0)
+        expected = (avg_price - 100.0) / 100.0 * 10000
+        assert impact == pytest.approx(expected)
+
 
 class TestEstimateMarketDepth:
     """测试 estimate_market_depth_usd"""
@@ -91,11 +107,56 @@ class TestEstimateMarketDepth:
         ]
         
         # 最大允许 100 bps 冲击，能执行多少 USD？
-        depth = estimate_market_depth_usd(asks, 100.0, 99.0, "buy")
+        # 第一档相对 mid 约 50 bps，第二档约 251 bps
+        depth = estimate_market_depth_usd(asks, 100.0, 99.5, "buy")
         
         assert depth > 0
         assert depth <= 2020  # 总流动性上限
 
+    def test_depth_hits_impact_cap(self):
+        """测试可用深度恰好对应冲击上限"""
+        asks = [
+            OrderBookLevel(price=100.0, size=10.0),
+            OrderBookLevel(price=102.0, size=10.0),
+        ]
+
+        depth = estimate_market_depth_usd(asks, 100.0, 99.5, "buy")
+
+        # 第二档部分成交，平均价恰好为 99.5 * 1.01
+        assert 1000.0 < depth < 2020.0
+        assert estimate_impact_bps(asks, "buy", depth, 99.5) == pytest.approx(100.0)
+
+    def test_depth_sell_side(self):
+        """测试卖出方向可用深度"""
+        bids = [
+            OrderBookLevel(price=100.0, size=10.0),
+            OrderBookLevel(price=98.0, size=10.0),
+        ]
+
+        depth = estimate_market_depth_usd(bids, 100.0, 100.5, "sell")
+
+        assert 1000.0 < depth < 1980.0
+        assert estimate_impact_bps(bids, "sell", depth, 100.5) == pytest.approx(100.0)
+
+    def test_all_liquidity_within_cap(self):
+        """测试全部流动性都在上限内"""
+        asks = [OrderBookLevel(price=100.0, size=10.0)]
+        depth = estimate_market_depth_usd(asks, 100.0, 99.5, "buy")
+        assert depth == pytest.approx(1000.0)
+
+    def test_full_depth_round_trip(self):
+        """测试以全部深度回算冲击时不因舍入残差判为流动性不足"""
+        asks = [
+            OrderBookLevel(price=100.01, size=0.1),
+            OrderBookLevel(price=100.02, size=0.2),
+            OrderBookLevel(price=100.03, size=0.2),
+        ]
+
+        depth = estimate_market_depth_usd(asks, 1000.0, 100.0, "buy")
+        impact = estimate_impact_bps(asks, "buy", depth, 100.0)
+
+        assert impact == pytest.approx(2.2, abs=0.1)
+
     def test_zero_max_impact(self):
         """测试零冲击上限"""
         asks = [OrderBookLevel(price=100.0, size=10.0)]
@@ -138,3 +199,17 @@ class TestEstimateSlippage:
         """测试无滑点"""
         slippage = estimate_slippage_bps(100.0, 100.0, "buy")
         assert slippage == 0.0
+
+    def test_batch_matches_scalar(self):
+        """测试批量版本与单笔版本一致"""
+        fills = np.array([100.5, 99.5, 99.5, 100.5, 100.0])
+        refs = np.array([100.0, 100.0, 100.0, 100.0, 100.0])
+        sides = np.array(["buy", "buy", "sell", "sell", "buy"])
+
+        batch = estimate_slippage_bps_batch(fills, refs, sides)
+
+        expected = [
+            estimate_slippage_bps(f, r, s)
+            for f, r, s in zip(fills, refs, sides, strict=True)
+        ]
+        assert batch == pytest.approx(expected)
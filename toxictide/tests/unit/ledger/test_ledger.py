@@ -7,9 +7,11 @@ import tempfile
 import time
 from pathlib import Path
 
+import numpy as np
 import pytest
 
-from toxictide.ledger.ledger import Ledger, read_ledger
+from toxictide.exceptions import ConfigValidationError
+from toxictide.ledger.ledger import _STOP, Ledger, read_ledger, read_ledger_columns
 from toxictide.models import (
     ExecutionPlan,
     FeatureVector,
@@ -146,6 +148,62 @@ class TestLedger:
 
         assert len(lines) == 5
 
+    def test_flush_writes_buffered_records(self):
+        """测试 flush 将缓冲记录落盘"""
+        ledger = Ledger(log_dir=self.temp_dir)
+        ledger.append(self._create_minimal_record())
+        ledger.flush()
+
+        with open(ledger.log_path, "r", encoding="utf-8") as f:
+            lines = f.readlines()
+
+        assert len(lines) == 1
+
+        ledger.close()
+
+    def test_background_writer_batches(self):
+        """测试后台写线程跨批次写入全部记录"""
+        ledger = Ledger(log_dir=self.temp_dir)
+        record = self._create_minimal_record()
+
+        for _ in range(600):
+            ledger.append(record)
+
+        ledger.close()
+
+        assert not ledger._writer.is_alive()
+        with open(ledger.log_path, "r", encoding="utf-8") as f:
+            assert len(f.readlines()) == 600
+
+    def test_append_after_close_is_dropped(self):
+        """测试关闭后追加的记录被丢弃且不阻塞"""
+        ledger = Ledger(log_dir=self.temp_dir, max_pending=1)
+        ledger.append(self._create_minimal_record())
+        ledger.close()
+
+        for _ in range(3):
+            ledger.append(self._create_minimal_record())
+
+        assert ledger.dropped_count == 3
+        with open(ledger.log_path, "r", encoding="utf-8") as f:
+            assert len(f.readlines()) == 1
+
+    def test_append_drops_when_queue_full(self):
+        """测试写线程停滞、队列满载时 append 超时丢弃"""
+        ledger = Ledger(log_dir=self.temp_dir, max_pending=1, put_timeout=0.01)
+        record = self._create_minimal_record()
+
+        # 写线程停止后队列不再被消费
+        ledger._queue.put(_STOP)
+        ledger._writer.join()
+
+        ledger.append(record)
+        ledger.append(record)
+
+        assert ledger.dropped_count == 1
+        ledger.close()
+        assert ledger.dropped_count == 2
+
     def test_context_manager(self):
         """测试上下文管理器"""
         with Ledger(log_dir=self.temp_dir) as ledger:
@@ -173,6 +231,50 @@ class TestLedger:
         assert len(records_read) == 3
         assert all(isinstance(r, LedgerRecord) for r in records_read)
 
+    def test_read_ledger_columns(self):
+        """测试列式读取"""
+        ledger = Ledger(log_dir=self.temp_dir)
+        for _ in range(4):
+            ledger.append(self._create_minimal_record())
+        ledger.close()
+
+        cols = read_ledger_columns(str(ledger.log_path))
+
+        assert cols["ts"].shape == (4,)
+        assert cols["features.spread_bps"].dtype == np.float64
+        assert cols["features.spread_bps"].tolist() == [5.0] * 4
+        assert "risk.action" in cols
+        # 列表字段不展开
+        assert "risk.reasons" not in cols
+
+    def test_read_empty_ledger(self):
+        """测试读取空日志文件"""
+        ledger = Ledger(log_dir=self.temp_dir)
+        ledger.close()
+
+        assert read_ledger(str(ledger.log_path)) == []
+
+    def test_msgpack_format_roundtrip(self):
+        """测试 msgpack 帧格式写入与读取"""
+        pytest.importorskip("msgpack")
+
+        ledger = Ledger(log_dir=self.temp_dir, format="msgpack")
+        records_written = [self._create_minimal_record() for _ in range(3)]
+        for record in records_written:
+            ledger.append(record)
+        ledger.close()
+
+        assert ledger.log_path.suffix == ".msgpack"
+
+        records_read = read_ledger(str(ledger.log_path))
+
+        assert records_read == records_written
+
+    def test_unsupported_format(self):
+        """测试不支持的日志格式"""
+        with pytest.raises(ConfigValidationError):
+            Ledger(log_dir=self.temp_dir, format="csv")
+
     def test_log_path_property(self):
         """测试 log_path 属性"""
         ledger = Ledger(log_dir=self.temp_dir)
@@ -6,6 +6,7 @@ import pytest
 import time
 
 from toxictide.market.collector import PaperMarketCollector
+from toxictide.market.orderbook import OrderBook
 from toxictide.models import OrderBookState, Trade
 
 
@@ -148,7 +149,7 @@ class TestPaperMarketCollector:
         """测试价格有边界"""
         # 生成很多快照，价格不应该偏离太远
         for _ in range(100):
-            snapshot = self.collector.get_orderbook_snapshot()
+            self.collector.get_orderbook_snapshot()
 
         # 价格应该在基准价格的 80%-120% 范围内
         assert 1600 <= self.collector.current_price <= 2400
@@ -166,3 +167,61 @@ class TestPaperMarketCollector:
         assert len(snapshot.bids) == 5
         assert len(snapshot.asks) == 5
         assert snapshot.mid == pytest.approx(100.0, rel=0.01)
+
+    @pytest.mark.parametrize(
+        "base_price,tick_size",
+        [(2000.0, 0.1), (2000.0, 0.5), (2000.0, 0.05), (0.07, 0.00001)],
+    )
+    def test_prices_on_tick_grid(self, base_price, tick_size):
+        """测试非 0.01 tick 下生成的价格都落在 tick 网格上，可直接写入订单簿"""
+        collector = PaperMarketCollector(
+            base_price=base_price, tick_size=tick_size, depth_levels=10, seed=3
+        )
+        book = OrderBook(tick_size=tick_size)
+
+        for _ in range(20):
+            snapshot = collector.get_orderbook_snapshot()
+            book.apply_snapshot(snapshot.bids, snapshot.asks, snapshot.seq)
+
+            # 各档不因取整而合并
+            bids, asks = book.top_n(10)
+            assert len(bids) == 10
+            assert len(asks) == 10
+
+        trades = [*collector.get_recent_trades(50), collector.generate_single_trade()]
+        for price in [*snapshot.bid_px, *snapshot.ask_px, *(t.price for t in trades)]:
+            assert price / tick_size == pytest.approx(round(price / tick_size), abs=1e-6)
+
+    def test_seed_reproducible(self):
+        """测试固定种子时快照可复现"""
+        c1 = PaperMarketCollector(base_price=2000.0, seed=42)
+        c2 = PaperMarketCollector(base_price=2000.0, seed=42)
+
+        s1 = c1.get_orderbook_snapshot()
+        s2 = c2.get_orderbook_snapshot()
+
+        assert [b.price for b in s1.bids] == [b.price for b in s2.bids]
+        assert [a.size for a in s1.asks] == [a.size for a in s2.asks]
+
+    def test_get_recent_trades_batch(self):
+        """测试批量生成交易的取值范围"""
+        collector = PaperMarketCollector(base_price=2000.0, seed=7)
+        trades = collector.get_recent_trades(200)
+
+        assert len(trades) == 200
+        assert all(isinstance(t.price, float) for t in trades)
+        assert all(0.01 <= t.size <= 20.0 for t in trades)
+        assert {t.side for t in trades} <= {"buy", "sell"}
+        assert collector.get_recent_trades(0) == []
+
+    def test_generated_trades_pass_validation(self):
+        """测试免校验构建的交易满足模型约束"""
+        _, burst = self.collector.simulate_anomaly("volume_burst")
+        _, whale = self.collector.simulate_anomaly("whale_trade")
+        single = self.collector.generate_single_trade()
+
+        for trade in [*burst, *whale, single]:
+            assert Trade.model_validate(trade.model_dump()) == trade
+
+        # 成交量爆发时数量放大 3 倍
+        assert min(t.size for t in burst) >= 0.03
@@ -0,0 +1,123 @@
+"""
+TOXICTIDE Ingress 队列测试
+"""
+
+import threading
+
+import numpy as np
+import pytest
+
+from toxictide.exceptions import ConfigValidationError, SequenceError
+from toxictide.market.ingress import DeltaIngressQueue
+from toxictide.market.orderbook import OrderBook
+
+
+def _delta(side: int, price: float, size: float):
+    return (
+        np.array([side], dtype=np.int8),
+        np.array([price]),
+        np.array([size]),
+    )
+
+
+class TestDeltaIngressQueue:
+    """测试 DeltaIngressQueue"""
+
+    def setup_method(self):
+        """每个测试前初始化"""
+        self.book = OrderBook()
+        self.book.apply_snapshot_raw(
+            np.array([100.0, 99.0]),
+            np.array([10.0, 20.0]),
+            np.array([101.0, 102.0]),
+            np.array([15.0, 25.0]),
+            seq=1,
+        )
+
+    def test_invalid_capacity(self):
+        """测试容量必须为 2 的幂"""
+        with pytest.raises(ConfigValidationError):
+            DeltaIngressQueue(capacity=100)
+
+    def test_drain_applies_messages_in_order(self):
+        """测试按序列号分组应用增量并发布快照"""
+        queue = DeltaIngressQueue(capacity=8)
+
+        assert queue.put(
+            np.array([0, 1], dtype=np.int8),
+            np.array([100.5, 101.0]),
+            np.array([3.0, 0.0]),
+            seq=2,
+        )
+        assert queue.put(*_delta(1, 100.8, 4.0), seq=3)
+        assert len(queue) == 3
+        assert queue.snapshot is None
+
+        assert queue.drain(self.book) == 3
+        assert len(queue) == 0
+        assert self.book.seq == 3
+        assert self.book.best_bid_price == 100.5
+        assert self.book.best_ask_price == 100.8
+
+        snapshot = queue.snapshot
+        assert snapshot.seq == 3
+        assert snapshot.bid_px[0] == 100.5
+        assert snapshot.ask_px[0] == 100.8
+
+        assert queue.drain(self.book) == 0
+
+    def test_full_queue_drops_message(self):
+        """测试队列已满时整条消息被丢弃"""
+        queue = DeltaIngressQueue(capacity=2)
+
+        assert queue.put(*_delta(0, 99.5, 1.0), seq=2)
+        assert not queue.put(
+            np.array([0, 0], dtype=np.int8),
+            np.array([99.4, 99.3]),
+            np.array([1.0, 1.0]),
+            seq=3,
+        )
+        assert queue.dropped == 1
+        assert len(queue) == 1
+
+    def test_wrap_around(self):
+        """测试写位置回绕后仍按顺序应用"""
+        queue = DeltaIngressQueue(capacity=4)
+
+        for seq in range(2, 12):
+            assert queue.put(*_delta(0, 90.0 + seq * 0.1, 1.0), seq=seq)
+            queue.drain(self.book)
+
+        assert self.book.seq == 11
+        assert self.book.bids_count == 12
+
+    def test_sequence_gap_is_consumed(self):
+        """测试序列号缺口抛出异常且出错消息已出队"""
+        queue = DeltaIngressQueue(capacity=8)
+        queue.put(*_delta(0, 99.5, 1.0), seq=5)
+
+        with pytest.raises(SequenceError):
+            queue.drain(self.book)
+
+        assert len(queue) == 0
+        assert queue.snapshot.seq == 1
+
+    def test_threaded_producer_consumer(self):
+        """测试生产者与消费者线程并发运行"""
+        queue = DeltaIngressQueue(capacity=64)
+        stop = threading.Event()
+        consumer = threading.Thread(target=queue.run, args=(self.book, stop))
+        consumer.start()
+
+        seq = 2
+        while seq < 500:
+            if queue.put(*_delta(0, 99.5, float(seq)), seq=seq):
+                seq += 1
+
+        while len(queue):
+            stop.wait(0.001)
+        stop.set()
+        consumer.join(timeout=5)
+
+        assert self.book.seq == 499
+        assert queue.snapshot.seq == 499
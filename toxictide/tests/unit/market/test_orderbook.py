@@ -2,12 +2,17 @@
 TOXICTIDE Orderbook 测试
 """
 
+import numpy as np
 import pytest
 import time
 
 from toxictide.market.orderbook import OrderBook
 from toxictide.models import OrderBookLevel
-from toxictide.exceptions import OrderbookInconsistentError, SequenceError
+from toxictide.exceptions import (
+    ConfigValidationError,
+    OrderbookInconsistentError,
+    SequenceError,
+)
 
 
 class TestOrderBook:
@@ -42,6 +47,37 @@ class TestOrderBook:
         assert self.book.best_bid_price == 100.0
         assert self.book.best_ask_price == 101.0
 
+    def test_apply_snapshot_raw(self):
+        """测试以按列数组应用快照"""
+        self.book.apply_snapshot_raw(
+            np.array([100.0, 99.0]),
+            np.array([10.0, 20.0]),
+            np.array([101.0, 102.0]),
+            np.array([15.0, 25.0]),
+            seq=3,
+        )
+
+        assert self.book.seq == 3
+        assert self.book.mid == 100.5
+        bids, asks = self.book.top_n(2)
+        assert [(level.price, level.size) for level in bids] == [
+            (100.0, 10.0),
+            (99.0, 20.0),
+        ]
+        assert [(level.price, level.size) for level in asks] == [
+            (101.0, 15.0),
+            (102.0, 25.0),
+        ]
+
+    def test_apply_snapshot_raw_inconsistent(self):
+        """测试按列快照交叉时报错"""
+        with pytest.raises(OrderbookInconsistentError):
+            self.book.apply_snapshot_raw(
+                np.array([101.0]), np.array([1.0]),
+                np.array([100.0]), np.array([1.0]),
+                seq=1,
+            )
+
     def test_mid_price(self):
         """测试中间价计算"""
         bids, asks = self._create_valid_snapshot()
@@ -57,6 +93,60 @@ class TestOrderBook:
         assert self.book.spread == 1.0
         assert self.book.spread_bps == pytest.approx(99.5, rel=0.01)
 
+    def test_fixed_point_precision(self):
+        """测试价格按 tick 存储、数量按定点倍数存储"""
+        book = OrderBook(tick_size=0.5, size_scale=100)
+        bids = [OrderBookLevel(price=100.0, size=1.234)]
+        asks = [OrderBookLevel(price=101.0, size=2.0)]
+        book.apply_snapshot(bids, asks, seq=1)
+
+        assert book.best_bid_price == 100.0
+        assert book.best_ask_price == 101.0
+        assert book.spread_bps == pytest.approx(1 / 100.5 * 10000)
+        assert book.get_state().bids[0].size == 1.23
+
+    def test_sub_cent_tick(self):
+        """测试小 tick 品种的相邻价位不会被合并"""
+        book = OrderBook(tick_size=0.00001)
+        book.apply_snapshot(
+            [OrderBookLevel(price=0.07123, size=100.0)],
+            [OrderBookLevel(price=0.07124, size=100.0)],
+            seq=1,
+        )
+
+        assert book.best_bid_price == 0.07123
+        assert book.best_ask_price == 0.07124
+        assert book.spread == pytest.approx(0.00001)
+
+    def test_off_grid_price_rejected(self):
+        """测试不在 tick 网格上的价格被拒绝，盘口保持不变"""
+        bids, asks = self._create_valid_snapshot()
+        self.book.apply_snapshot(bids, asks, seq=1)
+
+        with pytest.raises(OrderbookInconsistentError):
+            self.book.apply_snapshot(
+                [OrderBookLevel(price=2000.005, size=1.0)],
+                [OrderBookLevel(price=2001.0, size=1.0)],
+                seq=2,
+            )
+        with pytest.raises(OrderbookInconsistentError):
+            self.book.apply_delta(
+                [
+                    {"side": "bid", "price": 99.5, "size": 5.0},
+                    {"side": "ask", "price": 101.005, "size": 8.0},
+                ],
+                seq=2,
+            )
+
+        assert self.book.seq == 1
+        assert self.book.bids_count == 3
+        assert self.book.best_bid_price == 100.0
+
+    def test_invalid_precision(self):
+        """测试非法精度配置"""
+        with pytest.raises(ConfigValidationError):
+            OrderBook(tick_size=0)
+
     def test_negative_spread_raises_error(self):
         """测试负价差抛出异常"""
         bids = [OrderBookLevel(price=101.0, size=10.0)]
@@ -94,6 +184,69 @@ class TestOrderBook:
 
         assert self.book.bids_count == 2
 
+    def test_apply_delta_keeps_levels_sorted(self):
+        """测试增量更新后盘口仍按价格有序"""
+        bids, asks = self._create_valid_snapshot()
+        self.book.apply_snapshot(bids, asks, seq=1)
+
+        changes = [
+            {"side": "bid", "price": 99.5, "size": 5.0},
+            {"side": "bid", "price": 100.0, "size": 0},
+            {"side": "ask", "price": 100.5, "size": 7.0},
+            {"side": "ask", "price": 102.0, "size": 0},
+        ]
+        self.book.apply_delta(changes, seq=2)
+
+        state = self.book.get_state()
+        assert [level.price for level in state.bids] == [99.5, 99.0, 98.0]
+        assert [level.price for level in state.asks] == [100.5, 101.0, 103.0]
+        assert self.book.best_bid_price == 99.5
+        assert self.book.best_ask_price == 100.5
+        assert self.book.mid == 100.0
+        assert self.book.spread == 1.0
+
+    def test_apply_delta_raw(self):
+        """测试以按列数组应用增量更新"""
+        bids, asks = self._create_valid_snapshot()
+        self.book.apply_snapshot(bids, asks, seq=1)
+
+        self.book.apply_delta_raw(
+            np.array([0, 1, 1, 2], dtype=np.int8),
+            np.array([99.5, 101.0, 100.5, 50.0]),
+            np.array([5.0, 0.0, 7.0, 1.0]),
+            seq=2,
+        )
+
+        assert self.book.best_bid_price == 100.0
+        assert self.book.best_ask_price == 100.5
+        assert self.book.bids_count == 4
+        assert self.book.asks_count == 3
+
+        with pytest.raises(SequenceError):
+            self.book.apply_delta_raw(
+                np.array([0], dtype=np.int8), np.array([99.0]), np.array([1.0]), seq=5
+            )
+
+    def test_apply_delta_raw_keeps_order_within_side(self):
+        """测试同一价位的多次变更按原顺序生效"""
+        bids, asks = self._create_valid_snapshot()
+        self.book.apply_snapshot(bids, asks, seq=1)
+
+        self.book.apply_delta_raw(
+            np.array([0, 1, 0, 0], dtype=np.int8),
+            np.array([100.5, 101.5, 100.5, 99.0]),
+            np.array([5.0, 3.0, 0.0, 8.0]),
+            seq=2,
+        )
+
+        assert self.book.best_bid_price == 100.0
+        assert self.book.bids_count == 3
+        assert self.book.best_ask_price == 101.0
+        assert self.book.asks_count == 4
+
+        top_bids, _ = self.book.top_n(2)
+        assert top_bids[1].size == 8.0
+
     def test_apply_delta_sequence_error(self):
         """测试序列号不连续抛出异常"""
         bids, asks = self._create_valid_snapshot()
@@ -116,6 +269,22 @@ class TestOrderBook:
         assert top_bids[0].price == 100.0
         assert top_asks[0].price == 101.0
 
+    def test_copy_top_levels(self):
+        """测试将前 K 档写入预分配数组"""
+        bids, asks = self._create_valid_snapshot()
+        self.book.apply_snapshot(bids, asks, seq=1)
+
+        bid_px, bid_sz = np.zeros(2), np.zeros(2)
+        ask_px, ask_sz = np.zeros(5), np.zeros(5)
+
+        n_bids, n_asks = self.book.copy_top_levels(bid_px, bid_sz, ask_px, ask_sz)
+
+        assert n_bids == 2
+        assert n_asks == len(asks)
+        assert bid_px.tolist() == [100.0, 99.0]
+        assert bid_sz.tolist() == [10.0, 20.0]
+        assert ask_px[0] == 101.0
+
     def test_depth_usd(self):
         """测试 USD 深度计算"""
         bids, asks = self._create_valid_snapshot()
@@ -136,6 +305,38 @@ class TestOrderBook:
         assert remaining == 0  # 流动性足够
         assert avg_price > 100  # 平均价格在 ask 侧
 
+    def test_depth_to_price_partial_level(self):
+        """测试目标金额落在某一档中间时的平均价"""
+        bids, asks = self._create_valid_snapshot()
+        self.book.apply_snapshot(bids, asks, seq=1)
+
+        # 吃满 101 档（1515 USD），再在 102 档成交 510 USD（5 个）
+        avg_price, remaining = self.book.depth_to_price("ask", 2025.0)
+
+        assert remaining == 0
+        assert avg_price == pytest.approx(2025.0 / 20.0)
+
+    def test_depth_cache_invalidated_by_delta(self):
+        """测试增量更新后深度按新盘口计算"""
+        bids, asks = self._create_valid_snapshot()
+        self.book.apply_snapshot(bids, asks, seq=1)
+        assert self.book.depth_usd("bid", levels=1) == pytest.approx(1000.0)
+
+        self.book.apply_delta([{"side": "bid", "price": 100.0, "size": 1.0}], seq=2)
+
+        assert self.book.depth_usd("bid", levels=1) == pytest.approx(100.0)
+
+    def test_depth_cache_kept_for_untouched_side(self):
+        """测试只变更一侧时另一侧的累计数组缓存保留"""
+        bids, asks = self._create_valid_snapshot()
+        self.book.apply_snapshot(bids, asks, seq=1)
+        ask_cums = self.book._side_cums("ask")
+
+        self.book.apply_delta([{"side": "bid", "price": 99.5, "size": 5.0}], seq=2)
+
+        assert self.book._side_cums("ask") is ask_cums
+        assert self.book.depth_usd("bid", levels=2) == pytest.approx(1000.0 + 99.5 * 5)
+
     def test_depth_to_price_insufficient_liquidity(self):
         """测试流动性不足"""
         bids = [OrderBookLevel(price=100.0, size=1.0)]
@@ -177,6 +378,8 @@ class TestOrderBook:
         assert self.book.bids_count == 0
         assert self.book.asks_count == 0
         assert self.book.seq == 0
+        assert self.book.mid == 0.0
+        assert self.book.best_bid_price is None
 
     def test_update_count(self):
         """测试更新计数"""
@@ -199,3 +402,13 @@ class TestOrderBook:
         after = time.time()
 
         assert before <= self.book.last_update_ts <= after
+
+    def test_explicit_update_ts(self):
+        """测试传入更新时间戳时不读取系统时钟"""
+        bids, asks = self._create_valid_snapshot()
+        self.book.apply_snapshot(bids, asks, seq=1, ts=1_000_000.0)
+        assert self.book.last_update_ts == 1_000_000.0
+
+        changes = [{"side": "bid", "price": 99.5, "size": 5.0}]
+        self.book.apply_delta(changes, seq=2, ts=1_000_001.5)
+        assert self.book.last_update_ts == 1_000_001.5
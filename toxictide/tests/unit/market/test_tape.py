@@ -201,3 +201,143 @@ class TestTradeTape:
         # unknown 平分到 buy/sell
         assert agg.buy_vol == 1.0
         assert agg.sell_vol == 1.0
+
+    def test_buffer_growth_and_compaction(self):
+        """测试缓冲区扩容与过期压缩"""
+        tape = TradeTape(window_sec=300, capacity=16)
+        now = time.time()
+
+        # 超过初始容量，触发扩容
+        tape.add_batch([self._create_trade(size=1.0, ts=now - 350) for _ in range(40)])
+        for i in range(30):
+            tape.add(self._create_trade(size=float(i + 1), ts=now))
+
+        # 过期交易被清理，新交易全部保留
+        assert len(tape) == 30
+        assert tape.total_trades == 70
+
+        agg = tape.aggregate()
+        assert agg.max_trade == 30.0
+        assert agg.min_trade == 1.0
+        assert agg.vol == pytest.approx(sum(range(1, 31)))
+        assert [t.size for t in tape] == [float(i + 1) for i in range(30)]
+
+    def test_recent_partial_window(self):
+        """测试窗口内只取最近 N 秒"""
+        now = time.time()
+        self.tape.add_batch([
+            self._create_trade(size=1.0, ts=now - 120),
+            self._create_trade(size=2.0, ts=now - 10),
+            self._create_trade(size=3.0, ts=now - 90),
+        ])
+
+        recent = self.tape.recent(sec=60)
+        assert [t.size for t in recent] == [2.0]
+        assert self.tape.aggregate(sec=100).vol == pytest.approx(5.0)
+
+    def test_explicit_now(self):
+        """测试传入当前时间戳时以其为窗口基准"""
+        base = 1_000_000.0
+        self.tape.add_batch([
+            self._create_trade(size=1.0, ts=base - 30),
+            self._create_trade(size=2.0, ts=base - 5),
+        ], now=base)
+
+        assert self.tape.aggregate(sec=10, now=base).vol == pytest.approx(2.0)
+        assert self.tape.aggregate(sec=60, now=base).vol == pytest.approx(3.0)
+        assert len(self.tape.recent(sec=60, now=base)) == 2
+
+    def test_bulk_expiry(self):
+        """测试一次清理批量过期的交易"""
+        base = 1_000_000.0
+        self.tape.add_batch(
+            [self._create_trade(ts=base + i) for i in range(1000)],
+            now=base + 999,
+        )
+
+        # 窗口 300 秒：base+699 及之后保留
+        assert len(self.tape.recent(now=base + 999)) == 301
+        assert self.tape.recent(now=base + 999)[0].ts == base + 699
+
+        self.tape.add(self._create_trade(ts=base + 1500), now=base + 1500)
+        assert len(self.tape.recent(now=base + 1500)) == 1
+
+    def test_unrecognized_side_counts_as_unknown(self):
+        """测试无法识别的方向按 unknown 平分"""
+        now = time.time()
+        trade = Trade.model_construct(ts=now, price=100.0, size=2.0, side="n/a")
+        self.tape.add(trade, now=now)
+        self.tape.add_batch([trade], now=now)
+
+        agg = self.tape.aggregate(now=now)
+        assert agg.buy_vol == pytest.approx(2.0)
+        assert agg.sell_vol == pytest.approx(2.0)
+        assert agg.signed_imbalance == pytest.approx(0.0)
+
+    def test_rates_match_aggregate_after_compaction(self):
+        """测试前缀和统计在过期压缩后与聚合结果一致"""
+        tape = TradeTape(window_sec=10, capacity=16)
+        base = 1_000_000.0
+        sides = ("buy", "sell", "unknown", "buy")
+
+        for i in range(200):
+            now = base + i * 0.5
+            tape.add(
+                self._create_trade(size=1.0 + i % 3, side=sides[i % 4], ts=now),
+                now=now,
+            )
+
+        now = base + 199 * 0.5
+        agg = tape.aggregate(sec=5, now=now)
+        assert tape.get_toxic_score(sec=5, now=now) == pytest.approx(
+            abs(agg.signed_imbalance)
+        )
+        assert tape.get_volume_rate(sec=5, now=now) == pytest.approx(agg.vol / 5)
+        assert tape.get_trade_rate(sec=5, now=now) == pytest.approx(agg.trades / 5)
+
+    def test_out_of_order_batches(self):
+        """测试乱序写入后按时间戳归并，过期清理不误删窗口内交易"""
+        tape = TradeTape(window_sec=60)
+        base = 1_000_000.0
+
+        tape.add_batch(
+            [self._create_trade(ts=base + t) for t in (0.0, 50.0, 100.0)],
+            now=base + 100,
+        )
+        # 重新拉取的最近成交：包含早于已有最新成交的交易，且批内乱序
+        tape.add_batch(
+            [self._create_trade(ts=base + t) for t in (90.0, 45.0, 110.0, 80.0)],
+            now=base + 110,
+        )
+        tape.add(self._create_trade(ts=base + 70.0), now=base + 110)
+
+        # 窗口 [base+50, base+110]：50, 70, 80, 90, 100, 110
+        recent = tape.recent(now=base + 110)
+        assert [t.ts - base for t in recent] == [50.0, 70.0, 80.0, 90.0, 100.0, 110.0]
+        assert tape.aggregate(now=base + 110).trades == 6
+
+    def test_rates_match_aggregate_out_of_order(self):
+        """测试乱序写入后前缀和统计仍与聚合结果一致"""
+        tape = TradeTape(window_sec=60)
+        base = 1_000_000.0
+        now = base + 100
+
+        tape.add_batch([
+            self._create_trade(size=1.0, side="buy", ts=base + 95),
+            self._create_trade(size=2.0, side="sell", ts=base + 30),
+            self._create_trade(size=4.0, side="buy", ts=base + 99),
+        ], now=now)
+        tape.add_batch([
+            self._create_trade(size=3.0, side="sell", ts=base + 60),
+            self._create_trade(size=1.0, side="unknown", ts=base + 97),
+        ], now=now)
+
+        for sec in (5, 10, 60):
+            agg = tape.aggregate(sec=sec, now=now)
+            assert tape.get_toxic_score(sec=sec, now=now) == pytest.approx(
+                abs(agg.signed_imbalance)
+            )
+            assert tape.get_trade_rate(sec=sec, now=now) == pytest.approx(agg.trades / sec)
+            assert tape.get_volume_rate(sec=sec, now=now) == pytest.approx(agg.vol / sec)
+
+        assert tape.aggregate(sec=10, now=now).trades == 3
@@ -4,6 +4,7 @@ TOXICTIDE Regime Classifier 测试
 
 import time
 
+import numpy as np
 import pytest
 
 from toxictide.models import (
@@ -11,7 +12,7 @@ from toxictide.models import (
     OrderbookAnomalyReport,
     VolumeAnomalyReport,
 )
-from toxictide.regime.regime import RegimeClassifier
+from toxictide.regime.regime import RegimeClassifier, _price_stats_nb
 
 
 class TestRegimeClassifier:
@@ -189,3 +190,21 @@ class TestRegimeClassifier:
         self.classifier.reset()
         
         assert len(self.classifier._price_history) == 0
+
+    def test_price_stats_kernel_matches_numpy(self):
+        """测试数值内核与 NumPy 计算一致"""
+        rng = np.random.default_rng(0)
+        prices = 2000.0 * np.cumprod(1 + rng.normal(0, 0.001, 60))
+
+        code, returns_std = _price_stats_nb(prices)
+
+        returns = np.diff(prices) / prices[:-1]
+        assert returns_std == pytest.approx(np.std(returns), rel=1e-9)
+
+        ma_short, ma_long = prices[-10:].mean(), prices[-30:].mean()
+        if ma_short > ma_long * 1.002:
+            assert code == 1
+        elif ma_short < ma_long * 0.998:
+            assert code == 2
+        else:
+            assert code == 0
@@ -74,3 +74,15 @@ class TestTiltTracker:
         
         assert self.tracker.total_trades == 0
         assert self.tracker.daily_pnl == 0.0
+
+    def test_trades_last_hour_out_of_order_and_growth(self):
+        """测试乱序记录与扩容后的笔数统计"""
+        base = 1_700_000_000.0
+        
+        # 超过初始容量，且时间戳乱序到达
+        for i in range(300):
+            self.tracker.record_trade(base - (i * 37 % 300) * 30, pnl=1.0)
+        
+        assert self.tracker.total_trades == 300
+        # 偏移 0..299 各出现一次，30 秒间隔，1 小时内为偏移 0..120
+        assert self.tracker.trades_last_hour(base) == 121
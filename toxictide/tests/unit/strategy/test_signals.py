@@ -4,10 +4,11 @@ TOXICTIDE Signal Engine 测试
 
 import time
 
+import numpy as np
 import pytest
 
 from toxictide.models import FeatureVector, RegimeState
-from toxictide.strategy.signals import SignalEngine
+from toxictide.strategy.signals import SignalEngine, _mean_std_nb
 
 
 class TestSignalEngine:
@@ -212,3 +213,23 @@ class TestSignalEngine:
         self.engine.reset()
         
         assert len(self.engine._price_history) == 0
+
+    def test_rolling_high_low_matches_window(self):
+        """测试增量维护的高低点与最近 20 点一致"""
+        rng = np.random.default_rng(0)
+        prices = 2000.0 + rng.normal(0, 5, 100)
+        
+        for i, price in enumerate(prices):
+            self.engine._push_price(float(price))
+            window = prices[max(0, i - 19):i + 1]
+            assert self.engine._max_queue[0][1] == window.max()
+            assert self.engine._min_queue[0][1] == window.min()
+
+    def test_mean_std_kernel_matches_numpy(self):
+        """测试单遍均值/标准差内核与 NumPy 一致"""
+        prices = 2000.0 + np.random.default_rng(1).normal(0, 3, 30)
+        
+        mean, std = _mean_std_nb(prices)
+        
+        assert mean == pytest.approx(np.mean(prices), rel=1e-12)
+        assert std == pytest.approx(np.std(prices), rel=1e-9)
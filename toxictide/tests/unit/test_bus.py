@@ -2,6 +2,8 @@
 TOXICTIDE 事件总线测试
 """
 
+from collections import deque
+
 import pytest
 
 from toxictide.bus import (
@@ -14,24 +16,53 @@ from toxictide.bus import (
 )
 
 
+EXPECTED_TOPICS = frozenset({
+    "market.book",
+    "market.trades",
+    "features",
+    "oad",
+    "vad",
+    "stress",
+    "regime",
+    "signal",
+    "risk",
+    "plan",
+    "fill",
+    "ledger",
+    "positions",
+    "account",
+})
+
+
+# 模块级 handler：各测试复用同一函数对象，订阅与取消订阅使用稳定的引用
+_RECEIVED: deque = deque()
+
+
+def _append_handler(data):
+    _RECEIVED.append(data)
+
+
+def _noop(data):
+    pass
+
+
 class TestEventBus:
     """测试 EventBus"""
 
-    def setup_method(self):
-        """每个测试前重置"""
+    @pytest.fixture(autouse=True)
+    def _reset(self):
+        """每个测试使用新的 EventBus，并清空已收到的事件"""
+        _RECEIVED.clear()
         self.bus = EventBus()
-        self.received_events: list = []
+        yield
 
     def test_subscribe_and_publish(self):
         """测试订阅和发布"""
-        def handler(data):
-            self.received_events.append(data)
-
-        self.bus.subscribe("test.topic", handler)
+        self.bus.subscribe("test.topic", _append_handler)
         self.bus.publish("test.topic", {"key": "value"})
 
-        assert len(self.received_events) == 1
-        assert self.received_events[0] == {"key": "value"}
+        assert len(_RECEIVED) == 1
+        assert _RECEIVED[0] == {"key": "value"}
 
     def test_multiple_subscribers(self):
         """测试多个订阅者"""
@@ -48,8 +79,7 @@ class TestEventBus:
         self.bus.publish("test.topic", "test_data")
 
         assert len(results) == 2
-        assert ("handler1", "test_data") in results
-        assert ("handler2", "test_data") in results
+        assert set(results) == {("handler1", "test_data"), ("handler2", "test_data")}
 
     def test_publish_to_nonexistent_topic(self):
         """测试发布到不存在的主题"""
@@ -80,36 +110,46 @@ class TestEventBus:
 
     def test_unsubscribe(self):
         """测试取消订阅"""
-        def handler(data):
-            self.received_events.append(data)
-
-        self.bus.subscribe("test.topic", handler)
+        self.bus.subscribe("test.topic", _append_handler)
         self.bus.publish("test.topic", "event1")
 
-        result = self.bus.unsubscribe("test.topic", handler)
+        result = self.bus.unsubscribe("test.topic", _append_handler)
         assert result is True
 
         self.bus.publish("test.topic", "event2")
 
         # 只有取消订阅前的事件
-        assert len(self.received_events) == 1
-        assert self.received_events[0] == "event1"
+        assert len(_RECEIVED) == 1
+        assert _RECEIVED[0] == "event1"
+
+    def test_subscribe_all_receives_topic(self):
+        """测试通配订阅收到所有主题的事件及其 topic"""
+        results = []
+
+        def forward(topic, data):
+            results.append((topic, data))
+
+        self.bus.subscribe("a", _append_handler)
+        self.bus.subscribe_all(forward)
+
+        assert self.bus.publish("a", 1) == 2
+        assert self.bus.publish("b", 2) == 1
+        assert results == [("a", 1), ("b", 2)]
+        assert list(_RECEIVED) == [1]
+
+        assert self.bus.unsubscribe_all(forward) is True
+        assert self.bus.unsubscribe_all(forward) is False
+        assert self.bus.publish("b", 3) == 0
 
     def test_unsubscribe_nonexistent(self):
         """测试取消不存在的订阅"""
-        def handler(data):
-            pass
-
-        result = self.bus.unsubscribe("nonexistent", handler)
+        result = self.bus.unsubscribe("nonexistent", _noop)
         assert result is False
 
     def test_clear_specific_topic(self):
         """测试清空特定主题"""
-        def handler(data):
-            self.received_events.append(data)
-
-        self.bus.subscribe("topic1", handler)
-        self.bus.subscribe("topic2", handler)
+        self.bus.subscribe("topic1", _append_handler)
+        self.bus.subscribe("topic2", _append_handler)
 
         self.bus.clear("topic1")
 
@@ -117,60 +157,43 @@ class TestEventBus:
         self.bus.publish("topic2", "data2")
 
         # 只有 topic2 的事件
-        assert len(self.received_events) == 1
-        assert self.received_events[0] == "data2"
+        assert len(_RECEIVED) == 1
+        assert _RECEIVED[0] == "data2"
 
     def test_clear_all_topics(self):
         """测试清空所有主题"""
-        def handler(data):
-            self.received_events.append(data)
-
-        self.bus.subscribe("topic1", handler)
-        self.bus.subscribe("topic2", handler)
+        self.bus.subscribe("topic1", _append_handler)
+        self.bus.subscribe("topic2", _append_handler)
 
         self.bus.clear()
 
         self.bus.publish("topic1", "data1")
         self.bus.publish("topic2", "data2")
 
-        assert len(self.received_events) == 0
+        assert len(_RECEIVED) == 0
 
     def test_get_subscriber_count(self):
         """测试获取订阅者数量"""
-        def handler1(data):
-            pass
-
-        def handler2(data):
-            pass
-
         assert self.bus.get_subscriber_count("test.topic") == 0
 
-        self.bus.subscribe("test.topic", handler1)
+        self.bus.subscribe("test.topic", _noop)
         assert self.bus.get_subscriber_count("test.topic") == 1
 
-        self.bus.subscribe("test.topic", handler2)
+        self.bus.subscribe("test.topic", _append_handler)
         assert self.bus.get_subscriber_count("test.topic") == 2
 
     def test_get_topics(self):
         """测试获取所有主题"""
-        def handler(data):
-            pass
-
-        assert self.bus.get_topics() == []
+        assert not self.bus.get_topics()
 
-        self.bus.subscribe("topic1", handler)
-        self.bus.subscribe("topic2", handler)
+        self.bus.subscribe("topic1", _noop)
+        self.bus.subscribe("topic2", _noop)
 
-        topics = self.bus.get_topics()
-        assert "topic1" in topics
-        assert "topic2" in topics
+        assert set(self.bus.get_topics()) == {"topic1", "topic2"}
 
     def test_event_count(self):
         """测试事件计数"""
-        def handler(data):
-            pass
-
-        self.bus.subscribe("test.topic", handler)
+        self.bus.subscribe("test.topic", _noop)
 
         assert self.bus.event_count == 0
 
@@ -180,23 +203,43 @@ class TestEventBus:
         self.bus.publish("test.topic", "data2")
         assert self.bus.event_count == 2
 
+    def test_event_count_bulk(self):
+        """测试大量发布后计数准确"""
+        self.bus.subscribe("test.topic", _noop)
+
+        for i in range(1000):
+            self.bus.publish("test.topic", i)
+
+        assert self.bus.event_count == 1000
+
+    def test_publish_throughput(self, request):
+        """测试 100 个订阅者下的发布耗时（需要 pytest-benchmark）"""
+        pytest.importorskip("pytest_benchmark")
+        benchmark = request.getfixturevalue("benchmark")
+
+        for _ in range(100):
+            self.bus.subscribe("test.topic", lambda data: None)
+
+        assert benchmark(self.bus.publish, "test.topic", None) == 100
+
     def test_standard_topics_defined(self):
         """测试标准主题已定义"""
         assert TOPIC_FEATURES == "features"
         assert TOPIC_RISK == "risk"
-        assert len(ALL_TOPICS) == 12
+        assert frozenset(ALL_TOPICS) == EXPECTED_TOPICS
 
 
-class TestGlobalBus:
-    """测试全局事件总线"""
+@pytest.fixture(scope="class")
+def clean_global_bus():
+    """整个测试类前后各重置一次全局 bus（各测试不依赖彼此留下的状态）"""
+    reset_bus()
+    yield
+    reset_bus()
 
-    def setup_method(self):
-        """每个测试前重置全局 bus"""
-        reset_bus()
 
-    def teardown_method(self):
-        """每个测试后重置全局 bus"""
-        reset_bus()
+@pytest.mark.usefixtures("clean_global_bus")
+class TestGlobalBus:
+    """测试全局事件总线"""
 
     def test_get_bus_returns_singleton(self):
         """测试 get_bus 返回单例"""
@@ -221,6 +264,7 @@ class TestGlobalBus:
         bus = get_bus()
         bus.subscribe("global.topic", handler)
         bus.publish("global.topic", "global_data")
+        bus.unsubscribe("global.topic", handler)
 
         assert len(results) == 1
         assert results[0] == "global_data"
@@ -4,6 +4,7 @@ TOXICTIDE 配置管理测试
 
 import os
 import pytest
+from functools import lru_cache
 from pathlib import Path
 from unittest.mock import patch
 
@@ -21,6 +22,18 @@ from toxictide.config_loader import (
 from toxictide.exceptions import ConfigValidationError
 
 
+@lru_cache(maxsize=8)
+def _cached_load(environment: str) -> AppConfig:
+    """按环境缓存的 load_config（仅用于不修改环境变量的测试）"""
+    return load_config(environment=environment)
+
+
+@pytest.fixture(scope="module")
+def default_config() -> AppConfig:
+    """模块内共享的默认配置（AppConfig 非 frozen，仅供只读测试使用）"""
+    return AppConfig()
+
+
 class TestConfigModels:
     """测试配置模型"""
 
@@ -31,38 +44,32 @@ class TestConfigModels:
         assert config.orderbook_depth == 20
         assert config.tape_window_sec == 300
 
-    def test_market_config_validation(self):
-        """测试市场配置验证"""
-        with pytest.raises(ValueError):
-            MarketConfig(orderbook_depth=1)  # 太小
-
-        with pytest.raises(ValueError):
-            MarketConfig(orderbook_depth=200)  # 太大
-
-    def test_oad_config_z_danger_greater_than_z_warn(self):
-        """测试 OAD 配置 z_danger > z_warn"""
-        with pytest.raises(ValueError, match="z_danger"):
-            OADConfig(z_warn=6.0, z_danger=4.0)  # danger < warn
-
-    def test_vad_config_validation(self):
-        """测试 VAD 配置验证"""
-        # z_danger > z_warn
-        with pytest.raises(ValueError):
-            VADConfig(z_warn=6.0, z_danger=4.0)
-
-        # toxic_danger > toxic_warn
-        with pytest.raises(ValueError):
-            VADConfig(toxic_warn=0.8, toxic_danger=0.6)
-
-    def test_risk_config_validation(self):
-        """测试风控配置验证"""
-        # impact_hard_cap > impact_entry_cap
-        with pytest.raises(ValueError):
-            RiskConfig(impact_entry_cap_bps=20.0, impact_hard_cap_bps=10.0)
-
-    def test_app_config_defaults(self):
+    @pytest.mark.parametrize(
+        "cls, kwargs, match",
+        [
+            # orderbook_depth 太小 / 太大
+            (MarketConfig, {"orderbook_depth": 1}, None),
+            (MarketConfig, {"orderbook_depth": 200}, None),
+            # z_danger 必须大于 z_warn
+            (OADConfig, {"z_warn": 6.0, "z_danger": 4.0}, "z_danger"),
+            (VADConfig, {"z_warn": 6.0, "z_danger": 4.0}, None),
+            # toxic_danger 必须大于 toxic_warn
+            (VADConfig, {"toxic_warn": 0.8, "toxic_danger": 0.6}, None),
+            # impact_hard_cap 必须大于 impact_entry_cap
+            (RiskConfig, {"impact_entry_cap_bps": 20.0, "impact_hard_cap_bps": 10.0}, None),
+            # 无效的执行模式 / 日志级别
+            (AppConfig, {"execution": {"mode": "invalid"}}, None),
+            (AppConfig, {"logging": {"level": "INVALID"}}, None),
+        ],
+    )
+    def test_invalid(self, cls, kwargs, match):
+        """测试无效配置被拒绝"""
+        with pytest.raises(ValueError, match=match):
+            cls(**kwargs)
+
+    def test_app_config_defaults(self, default_config):
         """测试应用配置默认值"""
-        config = AppConfig()
+        config = default_config
         assert config.environment == "dev"
         assert config.execution.mode == "paper"
         assert config.logging.level == "INFO"
@@ -99,38 +106,33 @@ class TestDeepMerge:
 class TestParseEnvValue:
     """测试环境变量值解析"""
 
-    def test_parse_bool_true(self):
-        """测试解析布尔值 True"""
-        assert _parse_env_value("true") is True
-        assert _parse_env_value("True") is True
-        assert _parse_env_value("yes") is True
-        assert _parse_env_value("1") is True
-
-    def test_parse_bool_false(self):
-        """测试解析布尔值 False"""
-        assert _parse_env_value("false") is False
-        assert _parse_env_value("False") is False
-        assert _parse_env_value("no") is False
-        assert _parse_env_value("0") is False
-
-    def test_parse_int(self):
-        """测试解析整数"""
-        assert _parse_env_value("42") == 42
-        assert _parse_env_value("-10") == -10
-
-    def test_parse_float(self):
-        """测试解析浮点数"""
-        assert _parse_env_value("3.14") == 3.14
-        assert _parse_env_value("-2.5") == -2.5
-
-    def test_parse_list(self):
-        """测试解析列表"""
-        result = _parse_env_value("a,b,c")
-        assert result == ["a", "b", "c"]
-
-    def test_parse_string(self):
-        """测试解析字符串"""
-        assert _parse_env_value("hello") == "hello"
+    @pytest.mark.parametrize(
+        "raw, expected",
+        [
+            # 布尔值
+            ("true", True),
+            ("True", True),
+            ("yes", True),
+            ("1", True),
+            ("false", False),
+            ("False", False),
+            ("no", False),
+            ("0", False),
+            # 数值
+            ("42", 42),
+            ("-10", -10),
+            ("3.14", 3.14),
+            ("-2.5", -2.5),
+            # 列表与字符串
+            ("a,b,c", ["a", "b", "c"]),
+            ("hello", "hello"),
+        ],
+    )
+    def test_parse(self, raw, expected):
+        """测试解析各类取值"""
+        result = _parse_env_value(raw)
+        assert result == expected
+        assert type(result) is type(expected)
 
 
 class TestLoadConfig:
@@ -138,42 +140,28 @@ class TestLoadConfig:
 
     def test_load_default_config(self):
         """测试加载默认配置"""
-        config = load_config(environment="dev")
+        config = _cached_load("dev")
         assert isinstance(config, AppConfig)
         assert config.environment == "dev"
 
     def test_load_test_environment(self):
         """测试加载测试环境配置"""
-        config = load_config(environment="test")
+        config = _cached_load("test")
         assert config.environment == "test"
         assert config.logging.level == "WARNING"
 
     def test_env_variable_override(self):
-        """测试环境变量覆盖"""
+        """测试环境变量覆盖（修改环境变量，不走缓存）"""
         with patch.dict(os.environ, {"TOXICTIDE_EXECUTION_MODE": "real"}):
             config = load_config(environment="dev")
             assert config.execution.mode == "real"
 
-    def test_get_config_dict(self):
+    def test_get_config_dict(self, default_config):
         """测试配置转字典"""
-        config = AppConfig()
-        config_dict = get_config_dict(config)
+        config_dict = get_config_dict(default_config)
 
         assert isinstance(config_dict, dict)
         assert "environment" in config_dict
         assert "market" in config_dict
         assert "risk" in config_dict
 
-
-class TestConfigValidation:
-    """测试配置验证错误处理"""
-
-    def test_invalid_execution_mode(self):
-        """测试无效的执行模式"""
-        with pytest.raises(ValueError):
-            AppConfig(execution={"mode": "invalid"})
-
-    def test_invalid_log_level(self):
-        """测试无效的日志级别"""
-        with pytest.raises(ValueError):
-            AppConfig(logging={"level": "INVALID"})
@@ -36,57 +36,36 @@ class TestExceptionHierarchy:
         assert str(exc) == "test error"
         assert isinstance(exc, Exception)
 
-    def test_data_exceptions_inherit_from_base(self):
-        """测试数据异常继承自基类"""
-        exceptions = [
-            DataException("data error"),
-            OrderbookInconsistentError("orderbook error"),
-            ConnectionLostError("connection error"),
-            DataStaleError("stale error"),
-            SequenceError("sequence error"),
-        ]
-
-        for exc in exceptions:
-            assert isinstance(exc, ToxicTideException)
-            assert isinstance(exc, DataException) or type(exc) == DataException
-
-    def test_risk_exceptions_inherit_from_base(self):
-        """测试风控异常继承自基类"""
-        exceptions = [
-            RiskException("risk error"),
-            DailyLossExceededError("daily loss error"),
-            PositionLimitError("position error"),
-            CooldownActiveError("cooldown error"),
-            ImpactExceededError("impact error"),
-            ToxicFlowError("toxic error"),
-        ]
-
-        for exc in exceptions:
-            assert isinstance(exc, ToxicTideException)
-
-    def test_execution_exceptions_inherit_from_base(self):
-        """测试执行异常继承自基类"""
-        exceptions = [
-            ExecutionException("execution error"),
-            OrderRejectedError("order rejected"),
-            InsufficientBalanceError("insufficient balance"),
-            OrderTimeoutError("timeout"),
-        ]
-
-        for exc in exceptions:
-            assert isinstance(exc, ToxicTideException)
-            assert isinstance(exc, ExecutionException) or type(exc) == ExecutionException
-
-    def test_config_exceptions_inherit_from_base(self):
-        """测试配置异常继承自基类"""
-        exceptions = [
-            ConfigException("config error"),
-            ConfigValidationError("validation error"),
-            ConfigNotFoundError("not found"),
-        ]
-
-        for exc in exceptions:
-            assert isinstance(exc, ToxicTideException)
+    @pytest.mark.parametrize(
+        "cls, parent",
+        [
+            # 数据异常
+            (DataException, ToxicTideException),
+            (OrderbookInconsistentError, DataException),
+            (ConnectionLostError, DataException),
+            (DataStaleError, DataException),
+            (SequenceError, DataException),
+            # 风控异常
+            (RiskException, ToxicTideException),
+            (DailyLossExceededError, RiskException),
+            (PositionLimitError, RiskException),
+            (CooldownActiveError, RiskException),
+            (ImpactExceededError, RiskException),
+            (ToxicFlowError, RiskException),
+            # 执行异常
+            (ExecutionException, ToxicTideException),
+            (OrderRejectedError, ExecutionException),
+            (InsufficientBalanceError, ExecutionException),
+            (OrderTimeoutError, ExecutionException),
+            # 配置异常
+            (ConfigException, ToxicTideException),
+            (ConfigValidationError, ConfigException),
+            (ConfigNotFoundError, ConfigException),
+        ],
+    )
+    def test_inherits_from_parent(self, cls, parent):
+        """测试异常继承自所属分类（分类再继承自基类）"""
+        assert isinstance(cls("error"), parent)
 
     def test_exception_can_be_raised_and_caught(self):
         """测试异常可以被抛出和捕获"""
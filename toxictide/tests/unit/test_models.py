@@ -2,6 +2,9 @@
 TOXICTIDE 数据模型测试
 """
 
+from typing import Any, get_args
+
+import numpy as np
 import pytest
 from pydantic import ValidationError
 
@@ -22,6 +25,39 @@ from toxictide.models import (
 )
 
 
+# 有效特征向量的字段取值，校验失败用例在此基础上覆盖单个字段
+BASE_FV: dict[str, Any] = {
+    "ts": 1.0, "mid": 100.0, "spread": 0.5, "spread_bps": 50.0,
+    "top_bid_sz": 10.0, "top_ask_sz": 15.0,
+    "depth_bid_k": 50000.0, "depth_ask_k": 60000.0,
+    "imb_k": 0.1, "micro_minus_mid": 0.01,
+    "impact_buy_bps": 5.0, "impact_sell_bps": 4.5,
+    "msg_rate": 100.0, "churn": 500.0,
+    "vol": 1000.0, "trades": 50, "avg_trade": 20.0, "max_trade": 100.0,
+    "signed_imb": 0.2, "toxic": 0.3,
+}
+
+
+# Trade.side 允许的全部取值（取自模型的 Literal 注解）
+VALID_SIDES = get_args(Trade.model_fields["side"].annotation)
+
+# 共享的有效盘口（OrderBookLevel 为 frozen，可在测试间复用）
+VALID_BIDS = (
+    OrderBookLevel(price=100, size=10),
+    OrderBookLevel(price=99, size=20),
+)
+VALID_ASKS = (
+    OrderBookLevel(price=101, size=15),
+    OrderBookLevel(price=102, size=25),
+)
+
+
+@pytest.fixture(scope="module")
+def valid_feature_vector() -> FeatureVector:
+    """模块内共享的有效特征向量（只读）"""
+    return FeatureVector(**BASE_FV)
+
+
 class TestOrderBookLevel:
     """测试 OrderBookLevel 模型"""
 
@@ -31,21 +67,19 @@ class TestOrderBookLevel:
         assert level.price == 100.5
         assert level.size == 10.0
 
-    def test_price_must_be_positive(self):
-        """测试价格必须为正"""
-        with pytest.raises(ValidationError):
-            OrderBookLevel(price=0, size=10.0)
-
-        with pytest.raises(ValidationError):
-            OrderBookLevel(price=-1, size=10.0)
-
-    def test_size_must_be_positive(self):
-        """测试数量必须为正"""
-        with pytest.raises(ValidationError):
-            OrderBookLevel(price=100, size=0)
-
+    @pytest.mark.parametrize(
+        "price, size",
+        [
+            (0, 10.0),      # 价格必须为正
+            (-1, 10.0),
+            (100.0, 0),     # 数量必须为正
+            (100.0, -1),
+        ],
+    )
+    def test_invalid_values(self, price, size):
+        """测试价格与数量必须为正"""
         with pytest.raises(ValidationError):
-            OrderBookLevel(price=100, size=-1)
+            OrderBookLevel(price=price, size=size)
 
     def test_frozen(self):
         """测试模型不可变"""
@@ -59,16 +93,9 @@ class TestOrderBookState:
 
     def test_valid_orderbook(self):
         """测试有效的订单簿"""
-        bids = [
-            OrderBookLevel(price=100, size=10),
-            OrderBookLevel(price=99, size=20),
-        ]
-        asks = [
-            OrderBookLevel(price=101, size=15),
-            OrderBookLevel(price=102, size=25),
-        ]
-
-        state = OrderBookState(ts=1234567890.0, bids=bids, asks=asks, seq=1)
+        state = OrderBookState(
+            ts=1234567890.0, bids=VALID_BIDS, asks=VALID_ASKS, seq=1
+        )
 
         assert state.mid == 100.5
         assert state.spread == 1.0
@@ -76,34 +103,23 @@ class TestOrderBookState:
 
     def test_bids_must_be_descending(self):
         """测试买盘必须降序"""
-        bids = [
-            OrderBookLevel(price=99, size=10),  # 错误：应该更高
-            OrderBookLevel(price=100, size=20),
-        ]
-        asks = [
-            OrderBookLevel(price=101, size=15),
-        ]
+        bids = VALID_BIDS[::-1]  # 错误：99 排在 100 之前
 
         with pytest.raises(ValidationError, match="descending"):
-            OrderBookState(ts=1234567890.0, bids=bids, asks=asks, seq=1)
+            OrderBookState(ts=1234567890.0, bids=bids, asks=VALID_ASKS[:1], seq=1)
 
     def test_asks_must_be_ascending(self):
         """测试卖盘必须升序"""
-        bids = [
-            OrderBookLevel(price=100, size=10),
-        ]
-        asks = [
-            OrderBookLevel(price=102, size=15),  # 错误：应该更低
-            OrderBookLevel(price=101, size=25),
-        ]
+        asks = VALID_ASKS[::-1]  # 错误：102 排在 101 之前
 
         with pytest.raises(ValidationError, match="ascending"):
-            OrderBookState(ts=1234567890.0, bids=bids, asks=asks, seq=1)
+            OrderBookState(ts=1234567890.0, bids=VALID_BIDS[:1], asks=asks, seq=1)
 
     def test_spread_must_be_positive(self):
         """测试 spread 必须为正"""
-        bids = [OrderBookLevel(price=101, size=10)]
-        asks = [OrderBookLevel(price=100, size=15)]  # 错误：ask < bid
+        # 错误：买一 101 高于卖一 100
+        bids = VALID_ASKS[:1]
+        asks = VALID_BIDS[:1]
 
         with pytest.raises(ValidationError, match="Negative spread"):
             OrderBookState(ts=1234567890.0, bids=bids, asks=asks, seq=1)
@@ -114,6 +130,75 @@ class TestOrderBookState:
         assert state.mid == 0.0
         assert state.spread == 0.0
 
+    def test_array_views(self):
+        """测试按列数组视图"""
+        state = OrderBookState(
+            ts=1234567890.0, bids=VALID_BIDS, asks=VALID_ASKS[:1], seq=1
+        )
+
+        assert state.bid_px.tolist() == [100.0, 99.0]
+        assert state.bid_sz.tolist() == [10.0, 20.0]
+        assert state.ask_px.tolist() == [101.0]
+        assert state.ask_sz.tolist() == [15.0]
+
+    def test_from_arrays(self):
+        """测试从数组构建快照"""
+        state = OrderBookState.from_arrays(
+            ts=1234567890.0,
+            bid_px=np.array([100.0, 99.0]),
+            bid_sz=np.array([10.0, 20.0]),
+            ask_px=np.array([101.0, 102.0]),
+            ask_sz=np.array([15.0, 25.0]),
+            seq=1,
+        )
+
+        assert state.mid == 100.5
+        assert state.bids[1] == OrderBookLevel(price=99, size=20)
+        assert state.asks[0] == OrderBookLevel(price=101, size=15)
+
+    def test_from_arrays_equality(self):
+        """测试数组构建的快照可与普通快照比较"""
+        args = (1234567890.0, [100.0, 99.0], [10.0, 20.0], [101.0], [15.0])
+        state = OrderBookState.from_arrays(*args, seq=1)
+        plain = OrderBookState(
+            ts=1234567890.0, bids=VALID_BIDS, asks=VALID_ASKS[:1], seq=1
+        )
+
+        assert state == OrderBookState.from_arrays(*args, seq=1)
+        assert state == plain
+        assert state != OrderBookState.from_arrays(*args, seq=2)
+
+    def test_model_copy_refreshes_array_views(self):
+        """测试 model_copy 替换价位后数组视图随之更新"""
+        state = OrderBookState.from_arrays(
+            1234567890.0, [100.0, 99.0], [10.0, 20.0], [101.0], [15.0], seq=1
+        )
+        copied = state.model_copy(
+            update={"bids": [OrderBookLevel(price=98.0, size=5.0)]}
+        )
+
+        assert copied.bid_px.tolist() == [98.0]
+        assert copied.bid_sz.tolist() == [5.0]
+        assert copied.ask_px.tolist() == [101.0]
+        assert state.bid_px.tolist() == [100.0, 99.0]
+
+    def test_from_arrays_validation(self):
+        """测试从数组构建时的校验"""
+        with pytest.raises(ValueError, match="descending"):
+            OrderBookState.from_arrays(
+                1234567890.0, [99.0, 100.0], [1.0, 1.0], [101.0], [1.0], seq=1
+            )
+
+        with pytest.raises(ValueError, match="Negative spread"):
+            OrderBookState.from_arrays(
+                1234567890.0, [101.0], [1.0], [100.0], [1.0], seq=1
+            )
+
+        with pytest.raises(ValueError, match="positive"):
+            OrderBookState.from_arrays(
+                1234567890.0, [100.0], [0.0], [101.0], [1.0], seq=1
+            )
+
 
 class TestTrade:
     """测试 Trade 模型"""
@@ -129,11 +214,11 @@ class TestTrade:
         with pytest.raises(ValidationError):
             Trade(ts=1234567890.0, price=100.0, size=5.0, side="invalid")
 
-    def test_all_valid_sides(self):
+    @pytest.mark.parametrize("side", VALID_SIDES)
+    def test_valid_side(self, side):
         """测试所有有效的 side 值"""
-        for side in ["buy", "sell", "unknown"]:
-            trade = Trade(ts=1234567890.0, price=100.0, size=5.0, side=side)
-            assert trade.side == side
+        trade = Trade(ts=1234567890.0, price=100.0, size=5.0, side=side)
+        assert trade.side == side
 
 
 class TestFeatureVector:
@@ -141,28 +226,7 @@ class TestFeatureVector:
 
     def test_valid_feature_vector(self):
         """测试有效的特征向量"""
-        fv = FeatureVector(
-            ts=1234567890.0,
-            mid=100.0,
-            spread=0.5,
-            spread_bps=50.0,
-            top_bid_sz=10.0,
-            top_ask_sz=15.0,
-            depth_bid_k=50000.0,
-            depth_ask_k=60000.0,
-            imb_k=0.1,
-            micro_minus_mid=0.01,
-            impact_buy_bps=5.0,
-            impact_sell_bps=4.5,
-            msg_rate=100.0,
-            churn=500.0,
-            vol=1000.0,
-            trades=50,
-            avg_trade=20.0,
-            max_trade=100.0,
-            signed_imb=0.2,
-            toxic=0.3,
-        )
+        fv = FeatureVector(**{**BASE_FV, "ts": 1234567890.0})
 
         assert fv.mid == 100.0
         assert fv.toxic == 0.3
@@ -170,32 +234,34 @@ class TestFeatureVector:
     def test_imb_k_range(self):
         """测试 imb_k 范围 [-1, 1]"""
         with pytest.raises(ValidationError):
-            FeatureVector(
-                ts=1.0, mid=100.0, spread=0.5, spread_bps=50.0,
-                top_bid_sz=10.0, top_ask_sz=15.0,
-                depth_bid_k=50000.0, depth_ask_k=60000.0,
-                imb_k=1.5,  # 超出范围
-                micro_minus_mid=0.01,
-                impact_buy_bps=5.0, impact_sell_bps=4.5,
-                msg_rate=100.0, churn=500.0,
-                vol=1000.0, trades=50, avg_trade=20.0, max_trade=100.0,
-                signed_imb=0.2, toxic=0.3,
-            )
+            FeatureVector(**{**BASE_FV, "imb_k": 1.5})  # 超出范围
 
     def test_toxic_range(self):
         """测试 toxic 范围 [0, 1]"""
         with pytest.raises(ValidationError):
-            FeatureVector(
-                ts=1.0, mid=100.0, spread=0.5, spread_bps=50.0,
-                top_bid_sz=10.0, top_ask_sz=15.0,
-                depth_bid_k=50000.0, depth_ask_k=60000.0,
-                imb_k=0.1, micro_minus_mid=0.01,
-                impact_buy_bps=5.0, impact_sell_bps=4.5,
-                msg_rate=100.0, churn=500.0,
-                vol=1000.0, trades=50, avg_trade=20.0, max_trade=100.0,
-                signed_imb=0.2,
-                toxic=1.5,  # 超出范围
-            )
+            FeatureVector(**{**BASE_FV, "toxic": 1.5})  # 超出范围
+
+    def test_replace(self, valid_feature_vector):
+        """测试替换部分字段"""
+        fv = valid_feature_vector
+
+        fv2 = fv.replace(impact_buy_bps=25.0)
+
+        assert fv2.impact_buy_bps == 25.0
+        assert fv.impact_buy_bps == 5.0
+        assert fv2.model_dump() == {**fv.model_dump(), "impact_buy_bps": 25.0}
+
+    def test_default_template(self):
+        """测试共享的全 0 模板"""
+        template = FeatureVector.default_template()
+
+        assert template is FeatureVector.default_template()
+        assert template.mid == 0.0
+        assert template.trades == 0
+
+        fv = template.replace(ts=5.0, mid=2000.0)
+        assert fv.mid == 2000.0
+        assert template.mid == 0.0
 
 
 class TestAnomalyReports:
@@ -298,46 +364,37 @@ class TestFill:
 class TestLedgerRecord:
     """测试审计日志模型"""
 
-    def test_valid_ledger_record(self):
+    def test_valid_ledger_record(self, valid_feature_vector):
         """测试有效的审计日志记录"""
-        # 创建所有必要的子模型
-        features = FeatureVector(
-            ts=1.0, mid=100.0, spread=0.5, spread_bps=50.0,
-            top_bid_sz=10.0, top_ask_sz=15.0,
-            depth_bid_k=50000.0, depth_ask_k=60000.0,
-            imb_k=0.1, micro_minus_mid=0.01,
-            impact_buy_bps=5.0, impact_sell_bps=4.5,
-            msg_rate=100.0, churn=500.0,
-            vol=1000.0, trades=50, avg_trade=20.0, max_trade=100.0,
-            signed_imb=0.2, toxic=0.3,
-        )
+        # 子模型取值均已知有效，跳过校验直接构造；只校验 LedgerRecord 本身
+        features = valid_feature_vector
 
-        oad = OrderbookAnomalyReport(
+        oad = OrderbookAnomalyReport.model_construct(
             ts=1.0, level="OK", score=1.0,
             triggers={}, liquidity_state="THICK",
         )
 
-        vad = VolumeAnomalyReport(
+        vad = VolumeAnomalyReport.model_construct(
             ts=1.0, level="OK", score=1.0,
             triggers={}, events={"burst": False, "drought": False, "whale": False},
         )
 
-        stress = MarketStressIndex(
+        stress = MarketStressIndex.model_construct(
             ts=1.0, level="OK", score=1.0, components={},
         )
 
-        regime = RegimeState(
+        regime = RegimeState.model_construct(
             ts=1.0, price_regime="RANGE",
             vol_regime="NORMALVOL", flow_regime="CALM",
             confidence=0.8,
         )
 
-        risk = RiskDecision(
+        risk = RiskDecision.model_construct(
             ts=1.0, action="DENY", size_usd=0.0,
             max_slippage_bps=0.0, reasons=["NO_SIGNAL"], facts={},
         )
 
-        plan = ExecutionPlan(
+        plan = ExecutionPlan.model_construct(
             ts=1.0, orders=[], mode="reduce_only", reasons=["NO_SIGNAL"],
         )
 
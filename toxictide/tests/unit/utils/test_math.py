@@ -34,40 +34,41 @@ class TestSafeDivide:
 class TestClip:
     """测试 clip"""
 
-    def test_within_range(self):
-        """测试在范围内的值"""
-        assert clip(5.0, 0.0, 10.0) == 5.0
-
-    def test_below_min(self):
-        """测试小于最小值"""
-        assert clip(-5.0, 0.0, 10.0) == 0.0
-
-    def test_above_max(self):
-        """测试大于最大值"""
-        assert clip(15.0, 0.0, 10.0) == 10.0
-
-    def test_equal_to_bounds(self):
-        """测试等于边界值"""
-        assert clip(0.0, 0.0, 10.0) == 0.0
-        assert clip(10.0, 0.0, 10.0) == 10.0
+    @pytest.mark.parametrize(
+        "x, expected",
+        [
+            (5.0, 5.0),     # 范围内
+            (-5.0, 0.0),    # 小于最小值
+            (15.0, 10.0),   # 大于最大值
+            (0.0, 0.0),     # 等于下界
+            (10.0, 10.0),   # 等于上界
+        ],
+    )
+    def test_clip(self, x, expected):
+        """测试裁剪到 [0, 10]"""
+        assert clip(x, 0.0, 10.0) == expected
 
 
 class TestBpsConversion:
     """测试基点转换"""
 
-    def test_bps_to_decimal(self):
-        """测试 bps 转小数"""
-        assert bps_to_decimal(100) == 0.01
-        assert bps_to_decimal(50) == 0.005
-        assert bps_to_decimal(10000) == 1.0
-
-    def test_decimal_to_bps(self):
-        """测试小数转 bps"""
-        assert decimal_to_bps(0.01) == 100.0
-        assert decimal_to_bps(0.005) == 50.0
-        assert decimal_to_bps(1.0) == 10000.0
-
-    def test_round_trip(self):
-        """测试往返转换"""
+    @pytest.mark.parametrize(
+        "bps, decimal",
+        [(100, 0.01), (50, 0.005), (10000, 1.0)],
+    )
+    def test_conversion(self, bps, decimal):
+        """测试 bps 与小数互相转换"""
+        assert bps_to_decimal(bps) == decimal
+        assert decimal_to_bps(decimal) == bps
+
+    @pytest.mark.parametrize("bps", [100.0, 50.0, 10000.0, 0.5])
+    def test_round_trip_exact(self, bps):
+        """测试往返转换（这些取值应精确还原）"""
+        assert decimal_to_bps(bps_to_decimal(bps)) == bps
+
+    def test_round_trip_fractional(self):
+        """测试小数基点的往返转换（允许浮点误差）"""
         original = 123.45
-        assert decimal_to_bps(bps_to_decimal(original)) == pytest.approx(original)
+        assert decimal_to_bps(bps_to_decimal(original)) == pytest.approx(
+            original, abs=1e-9
+        )
@@ -4,9 +4,10 @@ TOXICTIDE Rolling Statistics 测试
 
 import time
 
+import numpy as np
 import pytest
 
-from toxictide.utils.rolling import RollingMAD
+from toxictide.utils.rolling import RingBuffer, RollingMAD
 
 
 class TestRollingMAD:
@@ -68,6 +69,43 @@ class TestRollingMAD:
         z = self.rolling.zscore("price")
         assert z > 4.0  # 异常值应有高 z-score
 
+    def test_running_median_matches_numpy(self):
+        """测试窗口滑动（含重复值）时中位数与 np.median 一致"""
+        rolling = RollingMAD(window_sec=5)
+        values = [3.0, 1.0, 4.0, 1.0, 5.0, 9.0, 2.0, 6.0, 5.0, 3.0, 5.0, 1.0]
+
+        for i, v in enumerate(values):
+            rolling.update("x", v, float(i))
+            window = values[max(0, i - 5):i + 1]
+            assert rolling.median("x") == np.median(window)
+
+    def test_long_stream_keeps_window(self):
+        """测试长数据流下（数组搬移/扩容后）窗口内容正确"""
+        rolling = RollingMAD(window_sec=99)
+
+        for i in range(1000):
+            rolling.update("x", float(i), float(i))
+
+        assert rolling.count("x") == 100
+        assert rolling.mean("x") == pytest.approx(949.5)
+        assert rolling.median("x") == 949.5
+
+    def test_cached_stats_invalidated_on_update(self):
+        """测试 MAD/z-score 缓存在窗口变化后失效"""
+        for i, v in enumerate([100.0, 101.0, 102.0]):
+            self.rolling.update("price", v, float(i))
+
+        assert self.rolling.mad("price") == 1.0
+        assert self.rolling.mad("price") == 1.0
+
+        self.rolling.update("price", 110.0, 3.0)
+        assert self.rolling.mad("price") == 1.0
+        assert self.rolling.zscore("price") == pytest.approx(8.5 / 1.4826, rel=1e-6)
+
+        self.rolling.update("price", 120.0, 500.0)  # 之前的数据全部过期
+        assert self.rolling.count("price") == 1
+        assert self.rolling.mad("price") == 0.0
+
     def test_window_cleanup(self):
         """测试窗口清理"""
         ts = time.time()
@@ -81,6 +119,69 @@ class TestRollingMAD:
         # 过期数据应被清理
         assert self.rolling.count("price") == 1
 
+    def test_deferred_eviction_flushed_before_read(self):
+        """测试延迟清理：读取前会先移除已过期的数据"""
+        rolling = RollingMAD(window_sec=10)
+        rolling.update("x", 1000.0, 0.0)
+        for i in range(1, 4):
+            rolling.update("x", 1.0, 100.0 + i)
+
+        assert rolling.count("x") == 3
+        assert rolling.median("x") == 1.0
+        assert rolling.mean("x") == 1.0
+
+    def test_max_points_drops_oldest(self):
+        """测试数据点数达到上限后丢弃最旧的值"""
+        rolling = RollingMAD(window_sec=10_000, max_points=50)
+
+        for i in range(500):
+            rolling.update("x", float(i), float(i))
+
+        assert rolling.count("x") == 50
+        assert rolling.median("x") == np.median(np.arange(450, 500))
+        assert rolling.mean("x") == pytest.approx(474.5)
+
+    def test_invalid_max_points(self):
+        """测试 max_points 必须为正"""
+        with pytest.raises(ValueError):
+            RollingMAD(window_sec=60, max_points=0)
+
+    def test_zscore_batch_matches_zscore(self):
+        """测试批量 z-score 与逐个计算一致"""
+        rng = np.random.default_rng(7)
+        for i in range(40):
+            self.rolling.update("a", float(rng.normal()), float(i))
+            self.rolling.update("b", float(rng.normal(5.0, 2.0)), float(i))
+        self.rolling.update("single", 1.0, 0.0)
+
+        batch = self.rolling.zscore_batch()
+        assert set(batch) == {"a", "b", "single"}
+        for name in ("a", "b"):
+            assert batch[name] == self.rolling.zscore(name)
+        assert batch["single"] == 0.0
+
+        assert self.rolling.zscore_batch(["a", "missing"]) == {
+            "a": batch["a"],
+            "missing": 0.0,
+        }
+
+    def test_update_many_matches_update(self):
+        """测试 update_many 与逐个 update 结果一致"""
+        batched = RollingMAD(window_sec=20)
+        single = RollingMAD(window_sec=20)
+        rng = np.random.default_rng(3)
+
+        for i in range(100):
+            tick = {"a": float(rng.normal()), "b": float(rng.normal(10.0, 3.0))}
+            batched.update_many(tick, float(i))
+            for name, value in tick.items():
+                single.update(name, value, float(i))
+
+        for name in ("a", "b"):
+            assert batched.count(name) == single.count(name) == 21
+            assert batched.median(name) == single.median(name)
+            assert batched.zscore(name) == single.zscore(name)
+
     def test_multiple_metrics(self):
         """测试多个指标"""
         ts = time.time()
@@ -98,6 +199,23 @@ class TestRollingMAD:
         assert self.rolling.zscore("nonexistent") == 0.0
         assert self.rolling.count("nonexistent") == 0
 
+    @pytest.mark.parametrize("n", [2, 5, 31, 32, 100])
+    def test_stats_match_numpy_across_small_window_threshold(self, n):
+        """测试小窗口纯 Python 路径与 NumPy 结果一致"""
+        rolling = RollingMAD(window_sec=1000)
+        values = np.random.default_rng(n).normal(100.0, 5.0, n)
+        for i, v in enumerate(values):
+            rolling.update("x", float(v), float(i))
+
+        median_val = np.median(values)
+        mad_val = np.median(np.abs(values - median_val))
+        assert rolling.mad("x") == pytest.approx(mad_val)
+        assert rolling.zscore("x") == pytest.approx(
+            abs(values[-1] - median_val) / (1.4826 * mad_val + 1e-9)
+        )
+        assert rolling.mean("x") == pytest.approx(np.mean(values))
+        assert rolling.std("x") == pytest.approx(np.std(values))
+
     def test_mean_and_std(self):
         """测试均值和标准差（辅助函数）"""
         ts = time.time()
@@ -135,3 +253,28 @@ class TestRollingMAD:
         
         assert self.rolling.count("price") == 0
         assert self.rolling.count("volume") == 0
+
+
+class TestRingBuffer:
+    """测试 RingBuffer"""
+
+    def test_values_in_order_after_wrap(self):
+        """测试写满回绕后仍按时间顺序返回"""
+        buf = RingBuffer(3)
+        for x in (1.0, 2.0, 3.0, 4.0, 5.0):
+            buf.append(x)
+
+        assert len(buf) == 3
+        assert buf.values().tolist() == [3.0, 4.0, 5.0]
+        assert buf.values(2).tolist() == [4.0, 5.0]
+        assert buf.last() == 5.0
+
+    def test_clear(self):
+        """测试清空"""
+        buf = RingBuffer(4)
+        buf.append(1.0)
+        buf.clear()
+
+        assert len(buf) == 0
+        assert buf.values().shape == (0,)
+        assert buf.last() == 0.0
@@ -4,7 +4,10 @@ TOXICTIDE CLI
 命令行界面
 """
 
+import selectors
+import sys
 import threading
+from typing import Optional
 
 import structlog
 
@@ -13,6 +16,9 @@ from toxictide.explain.explain import build_explanation
 
 logger = structlog.get_logger(__name__)
 
+# 等待输入时检查退出标志的间隔（秒）
+_POLL_SEC = 0.2
+
 
 class CLI:
     """命令行界面
@@ -65,15 +71,73 @@ class CLI:
         print("\n输入命令并按回车...")
         print("=" * 60 + "\n")
 
+        selector = self._make_stdin_selector()
+        try:
+            while self._orch.state.running:
+                try:
+                    cmd = self._read_command(selector)
+                    if cmd:
+                        self._handle_command(cmd)
+                except EOFError:
+                    break
+                except Exception as e:
+                    logger.error("cli_input_error", error=str(e))
+        finally:
+            if selector is not None:
+                selector.close()
+
+    @staticmethod
+    def _make_stdin_selector() -> Optional[selectors.BaseSelector]:
+        """为交互式终端的 stdin 创建 selector
+
+        Windows 的 select 不支持 stdin；管道输入下一次读取可能包含多行，
+        按 fd 可读判断会漏掉已进入缓冲区的行。这两种情况返回 None，
+        退回阻塞的 input()。
+
+        Returns:
+            已注册 stdin 的 selector，不适用时返回 None
+        """
+        if sys.platform == "win32":
+            return None
+
+        try:
+            if not sys.stdin.isatty():
+                return None
+            selector = selectors.DefaultSelector()
+            selector.register(sys.stdin, selectors.EVENT_READ)
+        except (AttributeError, ValueError, OSError):
+            return None
+        return selector
+
+    def _read_command(
+        self,
+        selector: Optional[selectors.BaseSelector],
+    ) -> Optional[str]:
+        """读取一行命令
+
+        有 selector 时按 `_POLL_SEC` 轮询，系统停止后立即返回，
+        不会一直阻塞在 input() 上等待回车。
+
+        Args:
+            selector: `_make_stdin_selector` 的返回值
+
+        Returns:
+            去除首尾空白的命令；等待期间系统停止时返回 None
+
+        Raises:
+            EOFError: stdin 已关闭
+        """
+        if selector is None:
+            return input("> ").strip()
+
+        print("> ", end="", flush=True)
         while self._orch.state.running:
-            try:
-                cmd = input("> ").strip()
-                if cmd:
-                    self._handle_command(cmd)
-            except EOFError:
-                break
-            except Exception as e:
-                logger.error("cli_input_error", error=str(e))
+            if selector.select(timeout=_POLL_SEC):
+                line = sys.stdin.readline()
+                if not line:
+                    raise EOFError
+                return line.strip()
+        return None
 
     def _handle_command(self, cmd: str) -> None:
         """处理命令
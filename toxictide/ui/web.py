@@ -3,6 +3,7 @@ TOXICTIDE Web UI
 backend for the Dragon Stream dashboard
 """
 import asyncio
+import functools
 import json
 import threading
 import time
@@ -16,8 +17,46 @@ from fastapi.staticfiles import StaticFiles
 
 from toxictide.bus import get_bus, ALL_TOPICS
 
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None  # type: ignore[assignment]
+    ORJSON_AVAILABLE = False
+
 logger = structlog.get_logger(__name__)
 
+# Only the standard topics are forwarded to the dashboard
+_WS_TOPICS = frozenset(ALL_TOPICS)
+
+
+@functools.lru_cache(maxsize=1)
+def _load_dashboard() -> str:
+    """Read the dashboard page once; later requests are served from memory"""
+    # Relative path suitable for where main.py is run
+    with open("toxictide/ui/templates/dashboard.html", "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def _dumps(obj) -> str:
+    """Serialize to JSON text, stringifying anything the encoder doesn't know"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_SERIALIZE_NUMPY).decode()
+    return json.dumps(obj, default=str)
+
+
+def encode_event(topic, payload, ts) -> str:
+    """Encode one bus event as the dashboard's JSON message
+
+    Pydantic payloads are spliced in from model_dump_json() directly instead of
+    being dumped, parsed back and dumped again.
+    """
+    if hasattr(payload, "model_dump_json"):
+        return f'{{"topic": {_dumps(topic)}, "payload": {payload.model_dump_json()}, "ts": {ts!r}}}'
+    return _dumps({"topic": topic, "payload": payload, "ts": ts})
+
+
 class ConnectionManager:
     def __init__(self):
         self.active_connections: List[WebSocket] = []
@@ -37,6 +76,14 @@ class ConnectionManager:
                 # Remove dead connections on next cycle or let disconnect handler handle it
                 pass
 
+    async def broadcast_concurrent(self, message: str):
+        # Send to all clients concurrently so one slow client can't hold up the rest;
+        # failures are left to the disconnect handler
+        await asyncio.gather(
+            *[ws.send_text(message) for ws in list(self.active_connections)],
+            return_exceptions=True,
+        )
+
 class WebUI:
     def __init__(self):
         self.app = FastAPI()
@@ -51,8 +98,7 @@ class WebUI:
     def _setup_routes(self):
         @self.app.get("/")
         async def get():
-            with open("toxictide/ui/templates/dashboard.html", "r", encoding="utf-8") as f:
-                return HTMLResponse(content=f.read())
+            return HTMLResponse(content=_load_dashboard())
 
         @self.app.websocket("/ws")
         async def websocket_endpoint(websocket: WebSocket):
@@ -113,34 +159,6 @@ class WebUI:
         except Exception as e:
             logger.error("webui_event_error", error=str(e))
 
-    # We need a better way to bridge Sync Bus -> Async WS
-    # Let's use a queue.
-    
-import queue
-
-# Global queue for bridging
-# Global queue for bridging
-event_queue = queue.Queue(maxsize=1000)
-
-def bus_handler(topic, payload):
-    try:
-        # Pydantic support
-        if hasattr(payload, "model_dump_json"):
-             content = json.loads(payload.model_dump_json())
-        else:
-             content = payload
-             
-        message = {
-            "topic": topic,
-            "payload": content,
-            "ts": time.time()
-        }
-        try:
-            event_queue.put_nowait(message)
-        except queue.Full:
-            pass # Drop event if queue is full (client too slow or not connected)
-    except Exception as e:
-        logger.error("bus_bridge_error", error=str(e))
 
 class WebUIv2:
     def __init__(self, host="0.0.0.0", port=8000):
@@ -149,44 +167,35 @@ class WebUIv2:
         self.host = host
         self.port = port
         self.bus = get_bus()
+        # uvicorn's event loop, captured when the first client connects
+        self._loop: asyncio.AbstractEventLoop | None = None
         
         self._setup_routes()
         
     def _setup_routes(self):
         @self.app.get("/")
         async def get():
-            # Use relative path suitable for where main.py is run
             try:
-                with open("toxictide/ui/templates/dashboard.html", "r", encoding="utf-8") as f:
-                     return HTMLResponse(content=f.read())
+                return HTMLResponse(content=_load_dashboard())
             except FileNotFoundError:
                 return HTMLResponse(content="<h1>Dashboard HTML not found</h1>")
 
         @self.app.websocket("/ws")
         async def websocket_endpoint(websocket: WebSocket):
+            self._loop = asyncio.get_running_loop()
             await self.manager.connect(websocket)
             try:
                 while True:
-                    # Check queue for new messages
-                    # This is a bit polling-ish, but simple for threaded interop
-                    while not event_queue.empty():
-                        msg = event_queue.get()
-                        await self.manager.broadcast(json.dumps(msg, default=str))
-                    
-                    await asyncio.sleep(0.1) # 100ms refresh rate
+                    # Events are pushed by _publish; just keep the connection alive
+                    await websocket.receive_text()
             except WebSocketDisconnect:
                 self.manager.disconnect(websocket)
                 
     def start(self):
-        # Subscribe to all topics with the bridge handler
-        # effectively bridging Sync EventBus -> Queue -> Async Websocket
-        for topic in ALL_TOPICS:
-            # Use a closure or partial to capture topic if needed, 
-            # but our handler generic signature is (payload).
-            # Wait, bus.py: handler(payload). Topic is not passed.
-            # We need a wrapper.
-            self.bus.subscribe(topic, self._make_handler(topic))
-            
+        # One wildcard handler bridges Sync EventBus -> uvicorn loop -> Async Websocket;
+        # the bus passes the topic, so no per-topic closures are needed
+        self.bus.subscribe_all(self._publish)
+
         # Run uvicorn in a separate thread
         thread = threading.Thread(target=self._run_server, daemon=True)
         thread.start()
@@ -195,8 +204,21 @@ class WebUIv2:
     def _run_server(self):
         uvicorn.run(self.app, host=self.host, port=self.port, log_level="error")
 
-    def _make_handler(self, topic):
-        def handler(payload):
-            bus_handler(topic, payload)
-        return handler
+    def _publish(self, topic, payload):
+        # Runs on the bus (orchestrator) thread: hand the broadcast to the
+        # uvicorn loop instead of queueing it for a poller
+        loop = self._loop
+        if loop is None or not self.manager.active_connections:
+            return
+        if topic not in _WS_TOPICS:
+            return
+
+        try:
+            # Serialized once here, then the same text goes to every client
+            message = encode_event(topic, payload, time.time())
+            asyncio.run_coroutine_threadsafe(
+                self.manager.broadcast_concurrent(message), loop
+            )
+        except Exception as e:
+            logger.error("bus_bridge_error", error=str(e))
 
@@ -0,0 +1,44 @@
+"""
+TOXICTIDE JIT Utils
+
+Numba JIT 编译工具（可选依赖）
+
+安装 numba 时数值内核被编译为机器码；未安装时 `njit` 原样返回被装饰的函数，
+内核以纯 Python 运行，结果一致。
+"""
+
+from typing import Any, Callable, Optional
+
+_numba_njit: Optional[Callable[..., Any]]
+
+try:
+    from numba import njit as _numba_njit
+
+    NUMBA_AVAILABLE = True
+except ImportError:  # pragma: no cover - 取决于运行环境
+    _numba_njit = None
+    NUMBA_AVAILABLE = False
+
+
+def njit(*args: Any, **kwargs: Any) -> Any:
+    """`numba.njit` 的可选包装
+
+    支持 `@njit` 与 `@njit(cache=True, fastmath=True)` 两种写法。
+
+    Example:
+        >>> @njit(cache=True)
+        ... def add(a, b):
+        ...     return a + b
+        >>> add(1.0, 2.0)
+        3.0
+    """
+    if _numba_njit is not None:
+        return _numba_njit(*args, **kwargs)
+
+    if len(args) == 1 and callable(args[0]) and not kwargs:
+        return args[0]
+
+    def decorator(func: Callable) -> Callable:
+        return func
+
+    return decorator
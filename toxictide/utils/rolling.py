@@ -4,15 +4,421 @@ TOXICTIDE Rolling Statistics
 滚动统计工具，用于稳健的异常检测
 """
 
+import heapq
 import time
-from collections import deque
-from typing import Optional
+from typing import Iterable, Optional
 
 import numpy as np
 import structlog
 
+from toxictide.utils.jit import NUMBA_AVAILABLE, njit
+
 logger = structlog.get_logger(__name__)
 
+# MAD -> 标准差的换算系数（假设正态分布）
+_MAD_SCALE = 1.4826
+
+# z = |x - median| / (1.4826 * MAD + 1e-9) 改写为只含一次乘法和一次除法的形式：
+# z = |x - median| * _INV_MAD_SCALE / (MAD + _MAD_EPS)
+_INV_MAD_SCALE = 1.0 / _MAD_SCALE
+_MAD_EPS = 1e-9 * _INV_MAD_SCALE
+
+# 小窗口阈值：数据点少于此数时用纯 Python 计算，避开 NumPy 的调用开销
+_SMALL_N = 32
+
+# 每累计这么多次更新才真正执行一次过期清理；读取前总会先清理
+_EVICT_EVERY = 16
+
+# 单个指标窗口默认最多保留的数据点数
+_DEFAULT_MAX_POINTS = 10_000
+
+
+@njit(cache=True)
+def _select_nb(a: np.ndarray, n: int, k: int) -> float:
+    """原地快速选择（Wirth 算法）：返回 a[:n] 中第 k 小的值
+
+    调用后 a[:k] 均不大于 a[k]，a[k + 1:n] 均不小于 a[k]。
+
+    Args:
+        a: 工作数组（会被重排）
+        n: 参与选择的元素个数
+        k: 名次（从 0 开始）
+
+    Returns:
+        第 k 小的值
+    """
+    lo = 0
+    hi = n - 1
+    while lo < hi:
+        pivot = a[k]
+        i = lo
+        j = hi
+        while i <= j:
+            while a[i] < pivot:
+                i += 1
+            while pivot < a[j]:
+                j -= 1
+            if i <= j:
+                a[i], a[j] = a[j], a[i]
+                i += 1
+                j -= 1
+        if j < k:
+            lo = i
+        if k < i:
+            hi = j
+    return float(a[k])
+
+
+@njit(cache=True)
+def _mad_zscore_nb(
+    values: np.ndarray,
+    median_val: float,
+    current_value: float,
+    scratch: np.ndarray,
+) -> tuple[float, float]:
+    """MAD 与稳健 z-score 的数值内核
+
+    绝对偏差写入调用方提供的 scratch，中位数用原地快速选择求得，
+    整个计算不分配新数组。
+
+    Args:
+        values: 窗口内的值
+        median_val: 窗口中位数
+        current_value: 需要打分的值（通常为最新值）
+        scratch: 工作缓冲区，长度不小于 values
+
+    Returns:
+        (mad, z)；MAD 为 0 时 z 为 0.0
+    """
+    n = values.shape[0]
+    for i in range(n):
+        scratch[i] = abs(values[i] - median_val)
+
+    half = n // 2
+    mad_val = _select_nb(scratch, n, half)
+    if n % 2 == 0:
+        # 偶数个时还需要下中位数，即 scratch[:half] 中的最大值
+        lower = scratch[0]
+        for i in range(1, half):
+            if scratch[i] > lower:
+                lower = scratch[i]
+        mad_val = (lower + mad_val) / 2.0
+
+    if mad_val == 0.0:
+        return mad_val, 0.0
+    z = abs(current_value - median_val) * _INV_MAD_SCALE / (mad_val + _MAD_EPS)
+    return mad_val, z
+
+
+def _mad_zscore_np(
+    values: np.ndarray,
+    median_val: float,
+    current_value: float,
+    scratch: np.ndarray,
+) -> tuple[float, float]:
+    """`_mad_zscore_nb` 的 NumPy 版本（未安装 numba 时使用）
+
+    同样在 scratch 上原地计算：`out=` 参数写入偏差，`ndarray.partition`
+    原地选出中位数，避免 `np.median` 每次调用的临时数组。
+
+    Args:
+        values: 窗口内的值
+        median_val: 窗口中位数
+        current_value: 需要打分的值
+        scratch: 工作缓冲区，长度不小于 values
+
+    Returns:
+        (mad, z)；MAD 为 0 时 z 为 0.0
+    """
+    n = values.shape[0]
+    dev = scratch[:n]
+    np.subtract(values, median_val, out=dev)
+    np.abs(dev, out=dev)
+
+    half = n // 2
+    dev.partition(half)
+    mad_val = float(dev[half])
+    if n % 2 == 0:
+        mad_val = (float(dev[:half].max()) + mad_val) / 2.0
+
+    if mad_val == 0.0:
+        return mad_val, 0.0
+    z = abs(current_value - median_val) * _INV_MAD_SCALE / (mad_val + _MAD_EPS)
+    return mad_val, z
+
+
+# 按是否安装 numba 选择内核：纯 Python 的快速选择远慢于 ndarray.partition
+_mad_zscore = _mad_zscore_nb if NUMBA_AVAILABLE else _mad_zscore_np
+
+
+def _mad_zscore_py(
+    values: list[float],
+    median_val: float,
+    current_value: float,
+) -> tuple[float, float]:
+    """MAD 内核的纯 Python 版本，用于小窗口
+
+    Args:
+        values: 窗口内的值
+        median_val: 窗口中位数
+        current_value: 需要打分的值
+
+    Returns:
+        (mad, z)；MAD 为 0 时 z 为 0.0
+    """
+    dev = sorted([abs(v - median_val) for v in values])
+    n = len(dev)
+    half = n // 2
+    mad_val = dev[half] if n % 2 else (dev[half - 1] + dev[half]) / 2.0
+    if mad_val == 0.0:
+        return mad_val, 0.0
+    z = abs(current_value - median_val) * _INV_MAD_SCALE / (mad_val + _MAD_EPS)
+    return mad_val, z
+
+
+class _RunningMedian:
+    """滑动窗口中位数：双堆 + 延迟删除
+
+    较小的一半放在最大堆 `_low`（存负值），较大的一半放在最小堆 `_high`，
+    并保持 `len(low) - len(high) ∈ {0, 1}`，中位数直接由两个堆顶得到。
+    移出窗口的值先记入 `_delayed`，等到它出现在堆顶时再真正弹出。
+
+    插入/删除 O(log n)，查询中位数 O(1)。
+    """
+
+    __slots__ = ("_low", "_high", "_delayed", "_low_size", "_high_size")
+
+    def __init__(self) -> None:
+        self._low: list[float] = []   # 最大堆（取负）
+        self._high: list[float] = []  # 最小堆
+        self._delayed: dict[float, int] = {}  # 待删除的值 -> 次数
+        self._low_size = 0   # 有效元素个数（不含待删除的）
+        self._high_size = 0
+
+    def __len__(self) -> int:
+        return self._low_size + self._high_size
+
+    def push(self, value: float) -> None:
+        """加入一个值"""
+        if not self._low or value <= -self._low[0]:
+            heapq.heappush(self._low, -value)
+            self._low_size += 1
+        else:
+            heapq.heappush(self._high, value)
+            self._high_size += 1
+        self._rebalance()
+
+    def remove(self, value: float) -> None:
+        """移除一个值（必须是此前加入过且尚未移除的值）"""
+        self._delayed[value] = self._delayed.get(value, 0) + 1
+
+        if value <= -self._low[0]:
+            self._low_size -= 1
+            if value == -self._low[0]:
+                self._prune(self._low, -1.0)
+        else:
+            self._high_size -= 1
+            if value == self._high[0]:
+                self._prune(self._high, 1.0)
+        self._rebalance()
+
+    def median(self) -> float:
+        """当前中位数，无数据时返回 0.0"""
+        if self._low_size == 0:
+            return 0.0
+        if self._low_size > self._high_size:
+            return -self._low[0]
+        return (-self._low[0] + self._high[0]) / 2.0
+
+    def clear(self) -> None:
+        self._low.clear()
+        self._high.clear()
+        self._delayed.clear()
+        self._low_size = 0
+        self._high_size = 0
+
+    def _prune(self, heap: list[float], sign: float) -> None:
+        """弹出堆顶所有已标记删除的值"""
+        delayed = self._delayed
+        while heap:
+            value = sign * heap[0]
+            count = delayed.get(value)
+            if not count:
+                break
+            if count == 1:
+                del delayed[value]
+            else:
+                delayed[value] = count - 1
+            heapq.heappop(heap)
+
+    def _rebalance(self) -> None:
+        """保持 low 比 high 多 0 或 1 个有效元素"""
+        if self._low_size > self._high_size + 1:
+            heapq.heappush(self._high, -heapq.heappop(self._low))
+            self._low_size -= 1
+            self._high_size += 1
+            self._prune(self._low, -1.0)
+        elif self._low_size < self._high_size:
+            heapq.heappush(self._low, -heapq.heappop(self._high))
+            self._high_size -= 1
+            self._low_size += 1
+            self._prune(self._high, 1.0)
+
+
+class _MetricWindow:
+    """单个指标的时间窗口：按列存储的 (ts, value) + 滑动中位数
+
+    时间戳与值分别存放在两段 float64 数组中，有效数据为 `[head, tail)`，
+    统计时直接取连续视图，无需逐元素拆箱。写到数组末尾时，若有效数据
+    不足一半则整体搬回开头，否则扩容一倍。
+
+    窗口内容每次变化时递增 `_version`；MAD 与 z-score 按版本缓存，
+    窗口未变时重复查询直接返回缓存值。
+
+    过期清理是延迟批量的：`schedule_evict` 只记下截止时间，累计
+    `_EVICT_EVERY` 次后才执行；读取统计量前调用 `flush_evict` 补齐。
+
+    数据点数超过 `max_points` 时，写入新值前先丢弃最旧的值，
+    即使时间戳异常（如时钟回拨）内存也有上界。
+    """
+
+    __slots__ = (
+        "_ts",
+        "_val",
+        "_head",
+        "_tail",
+        "_median",
+        "_version",
+        "_stats",
+        "_evict_ts",
+        "_evict_pending",
+        "_max_points",
+        "_scratch",
+    )
+
+    _INITIAL_CAPACITY = 64
+
+    def __init__(self, max_points: int = _DEFAULT_MAX_POINTS) -> None:
+        capacity = min(self._INITIAL_CAPACITY, max_points)
+        self._ts = np.empty(capacity, dtype=np.float64)
+        self._val = np.empty(capacity, dtype=np.float64)
+        self._scratch = np.empty(capacity, dtype=np.float64)  # MAD 内核的工作区
+        self._head = 0
+        self._tail = 0
+        self._median = _RunningMedian()
+        self._version = 0
+        self._stats: tuple[int, float, float] = (-1, 0.0, 0.0)  # (version, mad, z)
+        self._evict_ts = float("-inf")  # 尚未执行的清理截止时间
+        self._evict_pending = 0
+        self._max_points = max_points
+
+    def __len__(self) -> int:
+        return self._tail - self._head
+
+    def append(self, ts: float, value: float) -> None:
+        """追加一个数据点，已满 max_points 时先丢弃最旧的值"""
+        if self._tail - self._head >= self._max_points:
+            self._median.remove(float(self._val[self._head]))
+            self._head += 1
+
+        if self._tail == self._ts.shape[0]:
+            self._make_room()
+
+        self._ts[self._tail] = ts
+        self._val[self._tail] = value
+        self._tail += 1
+        self._median.push(value)
+        self._version += 1
+
+    def evict_before(self, cutoff_ts: float) -> None:
+        """移除时间戳早于 cutoff_ts 的数据点
+
+        数据按时间顺序写入，ts 列单调递增，过期边界由二分查找确定。
+        """
+        head, tail = self._head, self._tail
+        if head == tail or self._ts[head] >= cutoff_ts:
+            return
+
+        new_head = head + int(
+            np.searchsorted(self._ts[head:tail], cutoff_ts, side="left")
+        )
+
+        remove = self._median.remove
+        for value in self._val[head:new_head].tolist():
+            remove(value)
+
+        self._head = new_head
+        self._version += 1
+
+    def schedule_evict(self, cutoff_ts: float) -> None:
+        """登记一次过期清理，累计 `_EVICT_EVERY` 次后批量执行"""
+        if cutoff_ts > self._evict_ts:
+            self._evict_ts = cutoff_ts
+        self._evict_pending += 1
+        if self._evict_pending >= _EVICT_EVERY:
+            self.flush_evict()
+
+    def flush_evict(self) -> None:
+        """执行已登记但尚未执行的过期清理"""
+        if self._evict_pending:
+            self._evict_pending = 0
+            self.evict_before(self._evict_ts)
+
+    def values(self) -> np.ndarray:
+        """窗口内的值（连续视图，下一次写入前有效）"""
+        return self._val[self._head:self._tail]
+
+    def last(self) -> float:
+        """最新的值"""
+        return float(self._val[self._tail - 1])
+
+    def median(self) -> float:
+        """当前中位数，无数据时返回 0.0"""
+        return self._median.median()
+
+    def robust_stats(self) -> tuple[float, float]:
+        """(MAD, 最新值的稳健 z-score)，窗口未变化时返回缓存结果"""
+        version, mad_val, z = self._stats
+        if version != self._version:
+            # 未安装 numba 时，小窗口用纯 Python 比 np.median 快一个数量级
+            if not NUMBA_AVAILABLE and len(self) < _SMALL_N:
+                mad_val, z = _mad_zscore_py(
+                    self.values().tolist(), self.median(), self.last()
+                )
+            else:
+                if self._scratch.shape[0] < len(self):
+                    self._scratch = np.empty(self._val.shape[0], dtype=np.float64)
+                mad_val, z = _mad_zscore(
+                    self.values(), self.median(), self.last(), self._scratch
+                )
+                mad_val, z = float(mad_val), float(z)
+            self._stats = (self._version, mad_val, z)
+        return mad_val, z
+
+    def clear(self) -> None:
+        self._head = 0
+        self._tail = 0
+        self._median.clear()
+        self._version += 1
+        self._evict_pending = 0
+
+    def _make_room(self) -> None:
+        """数组写满时：有效数据不足一半则搬回开头，否则扩容一倍"""
+        n = self._tail - self._head
+        capacity = self._ts.shape[0]
+
+        if n * 2 <= capacity:
+            ts, val = self._ts, self._val
+        else:
+            ts = np.empty(capacity * 2, dtype=np.float64)
+            val = np.empty(capacity * 2, dtype=np.float64)
+
+        ts[:n] = self._ts[self._head:self._tail]
+        val[:n] = self._val[self._head:self._tail]
+        self._ts, self._val = ts, val
+        self._head = 0
+        self._tail = n
+
 
 class RollingMAD:
     """滚动 Median + MAD 统计
@@ -25,6 +431,11 @@ class RollingMAD:
     
     其中 1.4826 是将 MAD 转换为标准差的系数（假设正态分布）。
     
+    每个指标的数据按列存放在 `_MetricWindow` 的 float64 数组中，中位数由
+    `_RunningMedian`（双堆）随数据进出增量维护，查询为 O(1)。
+    过期数据每 16 次更新批量清理一次，读取前会先补齐清理；每个指标最多
+    保留 `max_points` 个数据点，超出时丢弃最旧的值。
+    
     Example:
         >>> rolling = RollingMAD(window_sec=300)
         >>> rolling.update("price", 100.0, time.time())
@@ -33,14 +444,22 @@ class RollingMAD:
         >>> print(f"Z-score: {z:.2f}")
     """
 
-    def __init__(self, window_sec: int) -> None:
+    def __init__(self, window_sec: int, max_points: int = _DEFAULT_MAX_POINTS) -> None:
         """初始化滚动统计
         
         Args:
             window_sec: 窗口大小（秒）
+            max_points: 每个指标最多保留的数据点数
+        
+        Raises:
+            ValueError: max_points 小于 1
         """
+        if max_points < 1:
+            raise ValueError(f"max_points must be >= 1, got {max_points}")
+        
         self._window_sec = window_sec
-        self._data: dict[str, deque[tuple[float, float]]] = {}  # name -> [(ts, value), ...]
+        self._max_points = max_points
+        self._data: dict[str, _MetricWindow] = {}
         
     def update(self, name: str, value: float, ts: float) -> None:
         """更新数据点
@@ -50,14 +469,37 @@ class RollingMAD:
             value: 值
             ts: 时间戳
         """
-        if name not in self._data:
-            self._data[name] = deque()
+        window = self._data.get(name)
+        if window is None:
+            window = self._data[name] = _MetricWindow(self._max_points)
         
-        self._data[name].append((ts, value))
+        window.append(ts, value)
         self._cleanup(name, ts)
     
+    def update_many(self, values: dict[str, float], ts: float) -> None:
+        """以同一时间戳更新多个指标
+        
+        适用于每个 tick 一起更新的一组指标：过期截止时间只计算一次，
+        各窗口按同一截止时间登记清理。
+        
+        Args:
+            values: 指标名称 -> 值
+            ts: 时间戳
+        
+        Example:
+            >>> rolling.update_many({"spread_bps": 2.5, "msg_rate": 40.0}, ts)
+        """
+        cutoff_ts = ts - self._window_sec
+        data = self._data
+        for name, value in values.items():
+            window = data.get(name)
+            if window is None:
+                window = data[name] = _MetricWindow(self._max_points)
+            window.append(ts, value)
+            window.schedule_evict(cutoff_ts)
+    
     def _cleanup(self, name: str, current_ts: float) -> None:
-        """清理过期数据
+        """登记过期数据清理（批量延迟执行）
         
         Args:
             name: 指标名称
@@ -66,10 +508,21 @@ class RollingMAD:
         if name not in self._data:
             return
         
-        cutoff_ts = current_ts - self._window_sec
+        self._data[name].schedule_evict(current_ts - self._window_sec)
+    
+    def _window(self, name: str) -> Optional[_MetricWindow]:
+        """取出指标窗口，并先执行尚未完成的过期清理
+        
+        Args:
+            name: 指标名称
         
-        while self._data[name] and self._data[name][0][0] < cutoff_ts:
-            self._data[name].popleft()
+        Returns:
+            指标窗口，不存在时返回 None
+        """
+        window = self._data.get(name)
+        if window is not None:
+            window.flush_evict()
+        return window
     
     def median(self, name: str) -> float:
         """计算中位数
@@ -80,11 +533,11 @@ class RollingMAD:
         Returns:
             中位数，无数据时返回 0.0
         """
-        if name not in self._data or not self._data[name]:
+        window = self._window(name)
+        if not window:
             return 0.0
         
-        values = [v for _, v in self._data[name]]
-        return float(np.median(values))
+        return float(window.median())
     
     def mad(self, name: str) -> float:
         """计算 MAD (Median Absolute Deviation)
@@ -95,14 +548,12 @@ class RollingMAD:
         Returns:
             MAD 值，数据不足时返回 0.0
         """
-        if name not in self._data or len(self._data[name]) < 2:
+        window = self._window(name)
+        if window is None or len(window) < 2:
             return 0.0
         
-        values = np.array([v for _, v in self._data[name]])
-        median_val = np.median(values)
-        mad_val = np.median(np.abs(values - median_val))
-        
-        return float(mad_val)
+        mad_val, _ = window.robust_stats()
+        return mad_val
     
     def zscore(self, name: str) -> float:
         """计算 MAD z-score（稳健 z-score）
@@ -116,24 +567,44 @@ class RollingMAD:
         Returns:
             z-score 值，数据不足或无变化时返回 0.0
         """
-        if name not in self._data or not self._data[name]:
+        # 数据不足 2 个时 MAD 为 0
+        window = self._window(name)
+        if window is None or len(window) < 2:
             return 0.0
         
-        values = [v for _, v in self._data[name]]
-        current_value = values[-1]
+        # 中位数由双堆直接给出；MAD 与 z 由内核一次算出并按窗口版本缓存
+        # （MAD 为 0 即数据无变化时 z 为 0）
+        _, z = window.robust_stats()
         
-        median_val = self.median(name)
-        mad_val = self.mad(name)
+        return z
+    
+    def zscore_batch(self, names: Optional[Iterable[str]] = None) -> dict[str, float]:
+        """一次计算多个指标的 MAD z-score
         
-        # 若 MAD 为 0（数据无变化），返回 0
-        if mad_val == 0:
-            return 0.0
+        单次遍历完成清理与计算，省去逐个调用 `zscore` 时重复的查找；
+        窗口未变化的指标直接复用缓存结果。
         
-        # MAD to standard deviation conversion factor (assumes normality)
-        # σ ≈ 1.4826 * MAD
-        z = abs(current_value - median_val) / (1.4826 * mad_val + 1e-9)
+        Args:
+            names: 指标名称，None 表示所有已有指标
+        
+        Returns:
+            指标名称 -> z-score；数据不足或不存在的指标为 0.0
         
-        return float(z)
+        Example:
+            >>> z = rolling.zscore_batch(("spread_bps", "msg_rate"))
+            >>> z["spread_bps"]
+        """
+        if names is None:
+            names = list(self._data)
+        
+        result: dict[str, float] = {}
+        for name in names:
+            window = self._window(name)
+            if window is None or len(window) < 2:
+                result[name] = 0.0
+            else:
+                result[name] = window.robust_stats()[1]
+        return result
     
     def mean(self, name: str) -> float:
         """计算均值（辅助函数）
@@ -144,10 +615,13 @@ class RollingMAD:
         Returns:
             均值
         """
-        if name not in self._data or not self._data[name]:
+        window = self._window(name)
+        if not window:
             return 0.0
         
-        values = [v for _, v in self._data[name]]
+        values = window.values()
+        if len(values) < _SMALL_N:
+            return float(sum(values.tolist()) / len(values))
         return float(np.mean(values))
     
     def std(self, name: str) -> float:
@@ -159,10 +633,16 @@ class RollingMAD:
         Returns:
             标准差
         """
-        if name not in self._data or len(self._data[name]) < 2:
+        window = self._window(name)
+        if window is None or len(window) < 2:
             return 0.0
         
-        values = [v for _, v in self._data[name]]
+        values = window.values()
+        n = len(values)
+        if n < _SMALL_N:
+            items = values.tolist()
+            mean_val = sum(items) / n
+            return float((sum([(v - mean_val) ** 2 for v in items]) / n) ** 0.5)
         return float(np.std(values))
     
     def count(self, name: str) -> int:
@@ -174,9 +654,10 @@ class RollingMAD:
         Returns:
             数据点数量
         """
-        if name not in self._data:
+        window = self._window(name)
+        if window is None:
             return 0
-        return len(self._data[name])
+        return len(window)
     
     def clear(self, name: Optional[str] = None) -> None:
         """清空数据
@@ -193,3 +674,79 @@ class RollingMAD:
     def window_sec(self) -> int:
         """窗口大小（秒）"""
         return self._window_sec
+
+    @property
+    def max_points(self) -> int:
+        """每个指标最多保留的数据点数"""
+        return self._max_points
+
+
+class RingBuffer:
+    """定长 float64 环形缓冲区
+
+    底层数组长度为容量的两倍，每个值同时写入 i 与 i + capacity 两个位置，
+    因此最近 N 个值始终是一段连续内存，`values()` 返回视图而不拷贝。
+    写满后新值覆盖最旧的值。
+
+    Example:
+        >>> buf = RingBuffer(3)
+        >>> for x in (1.0, 2.0, 3.0, 4.0):
+        ...     buf.append(x)
+        >>> buf.values()
+        array([2., 3., 4.])
+    """
+
+    __slots__ = ("_buf", "_capacity", "_pos", "_count")
+
+    def __init__(self, capacity: int) -> None:
+        """初始化环形缓冲区
+
+        Args:
+            capacity: 容量（保留的最近值个数）
+        """
+        if capacity < 1:
+            raise ValueError(f"capacity must be >= 1, got {capacity}")
+
+        self._capacity = capacity
+        self._buf = np.zeros(2 * capacity, dtype=np.float64)
+        self._pos = 0  # 下一个写入位置，范围 [0, capacity)
+        self._count = 0
+
+    def append(self, value: float) -> None:
+        """追加一个值"""
+        pos = self._pos
+        self._buf[pos] = value
+        self._buf[pos + self._capacity] = value
+
+        pos += 1
+        self._pos = 0 if pos == self._capacity else pos
+        if self._count < self._capacity:
+            self._count += 1
+
+    def values(self, n: Optional[int] = None) -> np.ndarray:
+        """按时间顺序返回最近 n 个值（连续视图，None 表示全部）
+
+        返回的视图在下一次 append 后可能被覆盖，需要保留时请拷贝。
+        """
+        count = self._count if n is None else min(n, self._count)
+        end = self._pos + self._capacity
+        return self._buf[end - count:end]
+
+    def last(self) -> float:
+        """最新的值，无数据时返回 0.0"""
+        if self._count == 0:
+            return 0.0
+        return float(self._buf[self._pos + self._capacity - 1])
+
+    def __len__(self) -> int:
+        return self._count
+
+    def clear(self) -> None:
+        """清空缓冲区"""
+        self._pos = 0
+        self._count = 0
+
+    @property
+    def capacity(self) -> int:
+        """容量"""
+        return self._capacity